@@ -0,0 +1,119 @@
+"""
+模块导入耗时基准测试
+在全新的子进程中导入各模块，统计导入耗时（在子进程内计时，不含解释器启动时间）以及加载的重量级依赖
+
+用法:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --compare HEAD~1   # 与指定的 git 版本对比
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 默认测试的模块
+MODULES = ('camera_calculator', 'calculation_cache', 'main')
+
+# 需要关注的重量级依赖
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib', 'streamlit')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, cwd: str, repeat: int = 7) -> Optional[Dict[str, object]]:
+    """
+    在子进程中重复导入模块并取中位数
+
+    Returns:
+        Dict: 导入耗时中位数（秒）、最小值和已加载的重量级依赖；模块无法导入时返回 None
+    """
+    samples = []
+    heavy = []
+    env = dict(os.environ, PYTHONPATH=cwd, PYTHONDONTWRITEBYTECODE='1')
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=cwd, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return None
+        data = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append(data['seconds'])
+        heavy = data['heavy']
+    return {'median': statistics.median(samples), 'min': min(samples), 'heavy': heavy}
+
+
+def measure_tree(cwd: str, modules: List[str], repeat: int) -> Dict[str, Optional[Dict[str, object]]]:
+    # 预热一次，生成字节码缓存等，避免首次导入的磁盘开销影响结果
+    for module in modules:
+        measure_import(module, cwd, repeat=1)
+    return {module: measure_import(module, cwd, repeat) for module in modules}
+
+
+def export_revision(revision: str, directory: str) -> None:
+    """将指定 git 版本的代码导出到目录"""
+    archive = subprocess.run(['git', 'archive', revision], cwd=ROOT,
+                             capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', directory], input=archive.stdout, check=True)
+
+
+def format_result(result: Optional[Dict[str, object]]) -> str:
+    if result is None:
+        return f"{'无法导入':>10} {'':>10}  -"
+    heavy = ', '.join(result['heavy']) or '无'
+    return f"{result['median'] * 1000:>8.1f}ms {result['min'] * 1000:>8.1f}ms  {heavy}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="模块导入耗时基准测试")
+    parser.add_argument('modules', nargs='*', default=list(MODULES), help="要测试的模块")
+    parser.add_argument('--repeat', type=int, default=7, help="每个模块的重复次数")
+    parser.add_argument('--compare', metavar='REV', help="与指定 git 版本对比（如 HEAD~1）")
+    parser.add_argument('--json', action='store_true', help="以JSON格式输出")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = {'current': measure_tree(ROOT, args.modules, args.repeat)}
+    if args.compare:
+        with tempfile.TemporaryDirectory() as directory:
+            export_revision(args.compare, directory)
+            results[args.compare] = measure_tree(directory, args.modules, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    for label, measurements in results.items():
+        print(f"[{label}]")
+        print(f"{'模块':<20} {'中位数':>10} {'最小值':>10}  已加载的重量级依赖")
+        for module, result in measurements.items():
+            print(f"{module:<20} {format_result(result)}")
+        print()
+
+    if args.compare:
+        print("对比（当前 / 对比版本）:")
+        for module in args.modules:
+            current, baseline = results['current'][module], results[args.compare][module]
+            if current and baseline:
+                print(f"  {module:<20} {current['median'] / baseline['median']:.2f}x")
+    print(f"总耗时 {time.perf_counter() - start:.1f} 秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
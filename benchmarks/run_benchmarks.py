@@ -0,0 +1,366 @@
+"""
+计算与可视化基准测试
+覆盖标量/批量摄像头数量计算、最优安装高度、热力图栅格化、各类图表（10/100/1000个摄像头）和报告生成；
+结果可保存为JSON，并与基线结果对比，超过阈值的性能退化返回非零退出码
+
+用法:
+    python benchmarks/run_benchmarks.py --output before.json            # 升级前记录基线
+    python benchmarks/run_benchmarks.py --baseline before.json          # 升级后对比（默认阈值20%）
+    python benchmarks/run_benchmarks.py --filter chart. --repeat 3      # 只运行名称包含 chart. 的项目
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 各图表与报告测试所用的摄像头数量及对应的沙盘尺寸（安装高度3米、视场角60°×45°、重叠20%）
+CAMERA_COUNTS = (10, 100, 1000)
+SANDBOX_SIZES = {10: (13.5, 3.9), 100: (27.5, 19.5), 1000: (110.0, 49.5)}
+CAMERA_PARAMS = {'camera_height': 3.0, 'horizontal_fov': 60.0, 'vertical_fov': 45.0}
+
+# 热力图栅格化测试的分辨率
+HEATMAP_RESOLUTIONS = (100, 200, 400)
+
+# 标量与批量计算对比的场景数
+SCENARIO_COUNT = 1000
+
+# 默认的退化阈值（当前中位数超过基线的 1 + threshold 倍即视为退化）
+DEFAULT_THRESHOLD = 0.2
+
+# 对比状态的显示名称
+STATUS_LABELS = {'regression': '退化', 'improvement': '提升', 'ok': '持平', 'new': '新增'}
+
+Benchmark = Callable[[], Callable[[], Any]]
+
+
+def _scenarios(count: int = SCENARIO_COUNT, seed: int = 0) -> Dict[str, Any]:
+    """生成固定随机种子的场景参数（列式数组）"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return {
+        'sandbox_width': rng.uniform(5, 50, count),
+        'sandbox_height': rng.uniform(5, 50, count),
+        'camera_height': rng.uniform(2, 6, count),
+        'horizontal_fov': rng.uniform(40, 100, count),
+        'vertical_fov': rng.uniform(30, 80, count)
+    }
+
+
+def _layout_result(cameras: int) -> Dict[str, Any]:
+    from camera_calculator import CameraCalculator
+
+    width, height = SANDBOX_SIZES[cameras]
+    return CameraCalculator().calculate_camera_count(width, height, **CAMERA_PARAMS)
+
+
+def _visualizer():
+    from camera_visualizer import CameraVisualizer
+
+    # 不启用图片缓存，每次都完整渲染
+    return CameraVisualizer()
+
+
+def _bench_count_scalar() -> Callable[[], Any]:
+    from camera_calculator import CameraCalculator
+
+    calculator = CameraCalculator()
+    rows = list(zip(*(values.tolist() for values in _scenarios().values())))
+
+    def run():
+        for row in rows:
+            calculator.calculate_camera_count(*row, lazy_positions=True)
+    return run
+
+
+def _bench_count_batch() -> Callable[[], Any]:
+    from camera_calculator import CameraCalculator
+
+    calculator = CameraCalculator()
+    scenarios = _scenarios()
+    return lambda: calculator.calculate_camera_count_batch(**scenarios)
+
+
+def _bench_optimal_height(method: str) -> Benchmark:
+    def setup():
+        from camera_calculator import CameraCalculator
+
+        calculator = CameraCalculator()
+        width, height = SANDBOX_SIZES[100]
+        return lambda: calculator.calculate_optimal_height(
+            width, height, CAMERA_PARAMS['horizontal_fov'], CAMERA_PARAMS['vertical_fov'],
+            max_cameras=200, method=method
+        )
+    return setup
+
+
+def _bench_raster(resolution: int) -> Benchmark:
+    def setup():
+        from coverage_engine import compute_result_raster
+
+        result = _layout_result(1000)
+        return lambda: compute_result_raster(result, resolution)
+    return setup
+
+
+def _bench_chart(method: str, cameras: int) -> Benchmark:
+    def setup():
+        render = getattr(_visualizer(), method)
+        result = _layout_result(cameras)
+        return lambda: render(result, output='bytes')
+    return setup
+
+
+def _bench_comparison_chart() -> Callable[[], Any]:
+    from camera_calculator import CameraCalculator
+
+    width, height = SANDBOX_SIZES[100]
+    # 指定摄像头数量上限时才会返回备选方案
+    optimal = CameraCalculator().calculate_optimal_height(
+        width, height, CAMERA_PARAMS['horizontal_fov'], CAMERA_PARAMS['vertical_fov'], max_cameras=200
+    )
+    render = _visualizer().create_comparison_chart
+    return lambda: render(optimal['alternatives'], output='bytes')
+
+
+def _bench_report(cameras: int) -> Benchmark:
+    def setup():
+        from camera_calculator import estimate_installation_complexity
+        from report_writer import generate_report
+
+        result = _layout_result(cameras)
+        complexity = estimate_installation_complexity(
+            result['total_cameras'], result['sandbox_dimensions']['area']
+        )
+        return lambda: generate_report(result, complexity)
+    return setup
+
+
+def build_benchmarks() -> Dict[str, Benchmark]:
+    """
+    构建全部测试项目
+
+    Returns:
+        Dict: 名称 -> 准备函数（返回被计时的无参函数；只有被选中的项目才会执行准备）
+    """
+    benchmarks: Dict[str, Benchmark] = {
+        f'count.scalar_x{SCENARIO_COUNT}': _bench_count_scalar,
+        f'count.batch_x{SCENARIO_COUNT}': _bench_count_batch,
+        'optimal_height.sweep': _bench_optimal_height('sweep'),
+        'optimal_height.exact': _bench_optimal_height('exact'),
+    }
+    for resolution in HEATMAP_RESOLUTIONS:
+        benchmarks[f'raster.res{resolution}'] = _bench_raster(resolution)
+    for chart, method in (('layout', 'create_layout_plot'), ('3d', 'create_3d_visualization'),
+                          ('heatmap', 'create_coverage_heatmap')):
+        for cameras in CAMERA_COUNTS:
+            benchmarks[f'chart.{chart}.{cameras}cams'] = _bench_chart(method, cameras)
+    benchmarks['chart.comparison'] = _bench_comparison_chart
+    for cameras in CAMERA_COUNTS:
+        benchmarks[f'report.{cameras}cams'] = _bench_report(cameras)
+    return benchmarks
+
+
+def _run_once(func: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def time_callable(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    """
+    计时一个无参函数
+
+    先执行一次预热，再将每轮调用次数加倍直到单轮耗时不少于 min_time，然后重复 repeat 轮。
+
+    Returns:
+        Dict: 单次调用耗时（秒）的中位数、最小值、平均值、标准差，以及每轮次数和轮数
+    """
+    func()
+    number = 1
+    elapsed = _run_once(func, number)
+    while elapsed < min_time:
+        number *= 2
+        elapsed = _run_once(func, number)
+    samples = [elapsed / number]
+    samples.extend(_run_once(func, number) / number for _ in range(repeat - 1))
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': len(samples)
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    """记录运行环境，便于判断结果是否可比"""
+    info = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    for module in ('numpy', 'matplotlib'):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    revision = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT,
+                              capture_output=True, text=True)
+    info['revision'] = revision.stdout.strip() if revision.returncode == 0 else None
+    return info
+
+
+def run_benchmarks(names: List[str], repeat: int = 5, min_time: float = 0.2,
+                   progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    运行指定的测试项目
+
+    Args:
+        names: 测试项目名称
+        repeat: 每个项目的计时轮数
+        min_time: 每轮的最短耗时（秒）
+        progress: 每完成一个项目时的回调 (名称, 结果)
+
+    Returns:
+        Dict: environment（运行环境）和 results（名称 -> 计时结果）
+    """
+    benchmarks = build_benchmarks()
+    results = {}
+    with warnings.catch_warnings():
+        # 缺少中文字体时 matplotlib 的缺字警告与计时无关
+        warnings.filterwarnings('ignore', message='Glyph .* missing from')
+        for name in names:
+            results[name] = time_callable(benchmarks[name](), repeat, min_time)
+            if progress is not None:
+                progress(name, results[name])
+    return {'environment': environment_info(), 'results': results}
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    按中位数与基线对比
+
+    Args:
+        current: run_benchmarks 的结果
+        baseline: 基线结果（同样格式）
+        threshold: 退化阈值（0.2 表示慢20%以上视为退化）
+
+    Returns:
+        List: 每个项目的基线耗时、当前耗时、比值和状态
+        （'regression'、'improvement'、'ok'，基线中没有的项目为 'new'）
+    """
+    comparison = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            comparison.append({'name': name, 'baseline': None, 'current': result['median'],
+                               'ratio': None, 'status': 'new'})
+            continue
+        ratio = result['median'] / base['median']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparison.append({'name': name, 'baseline': base['median'], 'current': result['median'],
+                           'ratio': ratio, 'status': status})
+    return comparison
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="计算与可视化基准测试")
+    parser.add_argument('--filter', '-k', action='append', default=[],
+                        help="只运行名称包含该字符串的项目（可多次指定）")
+    parser.add_argument('--list', action='store_true', help="列出全部测试项目")
+    parser.add_argument('--repeat', type=int, default=5, help="每个项目的计时轮数（默认5）")
+    parser.add_argument('--min-time', type=float, default=0.2, help="每轮最短耗时，秒（默认0.2）")
+    parser.add_argument('--output', '-o', help="将结果保存为JSON文件（可作为之后对比的基线）")
+    parser.add_argument('--baseline', '-b', help="与基线JSON文件对比")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"退化阈值（默认{DEFAULT_THRESHOLD}，即慢{DEFAULT_THRESHOLD * 100:.0f}%%以上视为退化）")
+    parser.add_argument('--json', action='store_true', help="以JSON格式输出到标准输出")
+    args = parser.parse_args(argv)
+
+    names = [name for name in build_benchmarks()
+             if not args.filter or any(pattern in name for pattern in args.filter)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        parser.error("没有匹配的测试项目")
+    if args.repeat < 1:
+        parser.error("--repeat 必须大于等于1")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    def report(name: str, result: Dict[str, Any]) -> None:
+        print(f"{name:<28} {_format_time(result['median']):>10} "
+              f"(最小 {_format_time(result['min'])}, ±{_format_time(result['stdev'])}, "
+              f"{result['number']}次×{result['repeat']}轮)", file=sys.stderr)
+
+    start = time.perf_counter()
+    current = run_benchmarks(names, args.repeat, args.min_time, progress=report)
+    print(f"总耗时 {time.perf_counter() - start:.1f} 秒", file=sys.stderr)
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    comparison = compare_results(current, baseline, args.threshold) if baseline else None
+    if args.json:
+        if comparison is not None:
+            current = dict(current, comparison=comparison)
+        print(json.dumps(current, ensure_ascii=False, indent=2))
+    elif comparison is not None:
+        print(f"与基线对比（{baseline['environment'].get('revision')} → "
+              f"{current['environment'].get('revision')}，阈值 {args.threshold:.0%}）:")
+        print(f"{'项目':<28} {'基线':>10} {'当前':>10} {'比值':>7}  状态")
+        for item in comparison:
+            ratio = f"{item['ratio']:.2f}x" if item['ratio'] is not None else '-'
+            print(f"{item['name']:<28} {_format_time(item['baseline']):>10} "
+                  f"{_format_time(item['current']):>10} {ratio:>7}  {STATUS_LABELS[item['status']]}")
+
+    if comparison and any(item['status'] == 'regression' for item in comparison):
+        regressions = [item['name'] for item in comparison if item['status'] == 'regression']
+        print(f"性能退化: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
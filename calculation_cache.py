@@ -0,0 +1,186 @@
+"""
+计算结果缓存模块
+为摄像头计算器的纯函数提供可选的LRU缓存（容量/过期时间限制、命中统计、浮点键量化）
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from camera_calculator import CameraCalculator, LayoutResult
+from instrumentation import timed
+
+
+_MISSING = object()
+
+
+def quantize(value: Any, digits: int) -> Any:
+    """将浮点参数按小数位数量化，使 5.0 与 5.000000001 得到相同的缓存键"""
+    if isinstance(value, bool) or value is None:
+        return value
+    try:
+        return round(float(value), digits)
+    except (TypeError, ValueError):
+        return value
+
+
+class LRUCache:
+    """线程安全的LRU缓存，支持容量上限和过期时间"""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None, digits: int = 6):
+        """
+        Args:
+            maxsize: 最大条目数
+            ttl: 条目过期时间（秒，None表示不过期）
+            digits: 浮点键量化保留的小数位数
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, name: str, *args: Any) -> Hashable:
+        """根据函数名和量化后的参数生成缓存键"""
+        return (name,) + tuple(quantize(arg, self.digits) for arg in args)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """命中则返回缓存值，否则计算并写入缓存"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """清空缓存并重置统计"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_default_cache = LRUCache()
+
+
+def get_default_cache() -> LRUCache:
+    """获取进程内共享的默认缓存"""
+    return _default_cache
+
+
+def configure_default_cache(maxsize: int = 256, ttl: Optional[float] = None,
+                            digits: int = 6) -> LRUCache:
+    """重新配置进程内共享的默认缓存（原有条目会被丢弃）"""
+    global _default_cache
+    _default_cache = LRUCache(maxsize, ttl, digits)
+    return _default_cache
+
+
+class CachedCameraCalculator(CameraCalculator):
+    """
+    带缓存的摄像头计算器
+
+    calculate_coverage_area 和 calculate_layout 的结果按量化后的参数缓存，
+    calculate_camera_count 由缓存的布局生成字典，不单独占用缓存条目；
+    calculate_optimal_height 内部的重复计算也会命中缓存。每次调用返回独立的
+    副本，调用方修改返回值不会影响缓存。
+    """
+
+    def __init__(self, cache: Optional[LRUCache] = None):
+        super().__init__()
+        self.cache = cache if cache is not None else get_default_cache()
+
+    def calculate_coverage_area(self, height: float, horizontal_fov: float,
+                                vertical_fov: float) -> Dict[str, float]:
+        key = self.cache.make_key('coverage_area', height, horizontal_fov, vertical_fov)
+        coverage = self.cache.get_or_compute(
+            key,
+            lambda: super(CachedCameraCalculator, self).calculate_coverage_area(
+                height, horizontal_fov, vertical_fov
+            )
+        )
+        return dict(coverage)
+
+    @timed('cached_calculator.calculate_camera_count')
+    def calculate_camera_count(self, sandbox_width: float, sandbox_height: float,
+                               camera_height: float, horizontal_fov: float,
+                               vertical_fov: float, overlap_ratio: float = 0.2,
+                               camera_price: float = 2000.0,
+                               lazy_positions: bool = False) -> Dict[str, Any]:
+        # 基类经由 self.calculate_layout 计算，命中布局缓存
+        return super().calculate_camera_count(
+            sandbox_width, sandbox_height, camera_height,
+            horizontal_fov, vertical_fov, overlap_ratio, camera_price,
+            lazy_positions
+        )
+
+    @timed('cached_calculator.calculate_layout')
+    def calculate_layout(self, sandbox_width: float, sandbox_height: float,
+                         camera_height: float, horizontal_fov: float,
+                         vertical_fov: float, overlap_ratio: float = 0.2,
+                         camera_price: float = 2000.0) -> LayoutResult:
+        key = self.cache.make_key(
+            'layout', sandbox_width, sandbox_height, camera_height,
+            horizontal_fov, vertical_fov, overlap_ratio, camera_price
+        )
+        layout = self.cache.get_or_compute(
+            key,
+            lambda: super(CachedCameraCalculator, self).calculate_layout(
+                sandbox_width, sandbox_height, camera_height,
+                horizontal_fov, vertical_fov, overlap_ratio, camera_price
+            )
+        ).copy()
+        self.camera_positions = layout.camera_positions
+        return layout
+
+    def cache_info(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        return self.cache.stats()
+
+    def clear_cache(self) -> None:
+        """清空缓存"""
+        self.cache.clear()
@@ -3,9 +3,21 @@
 根据摄像头视场角和安装高度计算覆盖范围，并确定所需摄像头数量
 """
 
+from __future__ import annotations
+
 import math
-import numpy as np
-from typing import Tuple, List, Dict, Any
+import operator
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Tuple, List, Dict, Any, Optional
+
+from instrumentation import timed
+
+# NumPy 只在批量计算和位置数组相关的函数中按需导入，标量计算路径不依赖它
+if TYPE_CHECKING:
+    import numpy as np
+
+# 批量计算中摄像头总数的上限（超过则无法用 int64 精确表示，视为无效）
+_MAX_BATCH_CAMERAS = 2.0 ** 53
 
 
 class CameraCalculator:
@@ -47,10 +59,12 @@ class CameraCalculator:
             'vertical_fov': vertical_fov
         }
     
+    @timed('calculator.calculate_camera_count')
     def calculate_camera_count(self, sandbox_width: float, sandbox_height: float, 
                              camera_height: float, horizontal_fov: float, 
                              vertical_fov: float, overlap_ratio: float = 0.2,
-                             camera_price: float = 2000.0) -> Dict[str, Any]:
+                             camera_price: float = 2000.0,
+                             lazy_positions: bool = False) -> Dict[str, Any]:
         """
         计算完全覆盖沙盘所需的摄像头数量
         
@@ -62,10 +76,35 @@ class CameraCalculator:
             vertical_fov: 垂直视场角（度）
             overlap_ratio: 重叠比例（默认20%）
             camera_price: 摄像头单价（元，默认2000元）
+            lazy_positions: 为 True 时 camera_positions 为按需生成的只读列表视图，
+                只需要数量和成本时可跳过位置生成
             
         Returns:
             Dict: 包含摄像头数量和布局信息的字典
         """
+        result = self.calculate_layout(
+            sandbox_width, sandbox_height, camera_height,
+            horizontal_fov, vertical_fov, overlap_ratio, camera_price
+        ).to_dict(materialize_positions=not lazy_positions)
+        
+        self.camera_positions = result['camera_positions']
+        
+        return result
+    
+    @timed('calculator.calculate_layout')
+    def calculate_layout(self, sandbox_width: float, sandbox_height: float,
+                         camera_height: float, horizontal_fov: float,
+                         vertical_fov: float, overlap_ratio: float = 0.2,
+                         camera_price: float = 2000.0) -> 'LayoutResult':
+        """
+        计算摄像头布局，返回数组存储的紧凑结果
+        
+        参数与 calculate_camera_count 相同；返回的 LayoutResult 可按字典方式
+        读取相同的键，摄像头位置保存在 (n, 3) 的 positions 数组中。
+        
+        Returns:
+            LayoutResult: 布局计算结果
+        """
         # 计算单个摄像头的覆盖范围
         coverage = self.calculate_coverage_area(camera_height, horizontal_fov, vertical_fov)
         
@@ -82,14 +121,6 @@ class CameraCalculator:
         spacing_x = sandbox_width / cameras_x if cameras_x > 1 else sandbox_width / 2
         spacing_y = sandbox_height / cameras_y if cameras_y > 1 else sandbox_height / 2
         
-        # 生成摄像头位置
-        camera_positions = []
-        for i in range(cameras_x):
-            for j in range(cameras_y):
-                x = spacing_x * (i + 0.5) if cameras_x > 1 else sandbox_width / 2
-                y = spacing_y * (j + 0.5) if cameras_y > 1 else sandbox_height / 2
-                camera_positions.append({'x': x, 'y': y, 'z': camera_height})
-        
         # 计算覆盖率
         total_coverage_area = total_cameras * coverage['area']
         sandbox_area = sandbox_width * sandbox_height
@@ -98,34 +129,181 @@ class CameraCalculator:
         # 计算成本估算
         total_cost = total_cameras * camera_price
         
-        self.camera_positions = camera_positions
+        layout = LayoutResult(
+            total_cameras=total_cameras,
+            cameras_x=cameras_x,
+            cameras_y=cameras_y,
+            positions=None,
+            spacing_x=spacing_x,
+            spacing_y=spacing_y,
+            coverage_per_camera=coverage,
+            effective_coverage={
+                'width': effective_width,
+                'height': effective_height
+            },
+            coverage_ratio=coverage_ratio,
+            overlap_ratio=overlap_ratio,
+            total_cost=total_cost,
+            camera_price=camera_price,
+            sandbox_dimensions={
+                'width': sandbox_width,
+                'height': sandbox_height,
+                'area': sandbox_area
+            },
+            # 摄像头位置在首次访问时按网格参数生成
+            grid=(cameras_x, cameras_y, spacing_x, spacing_y,
+                  sandbox_width, sandbox_height, camera_height)
+        )
         
-        return {
+        self.camera_positions = layout.camera_positions
+        
+        return layout
+    
+    @timed('calculator.calculate_camera_count_batch')
+    def calculate_camera_count_batch(self, sandbox_width, sandbox_height,
+                                     camera_height, horizontal_fov, vertical_fov,
+                                     overlap_ratio=0.2, camera_price=2000.0,
+                                     include_positions: bool = False) -> Dict[str, Any]:
+        """
+        批量计算多组参数所需的摄像头数量（向量化）
+
+        所有参数均可为标量或NumPy数组，按广播规则组合；计算结果与
+        calculate_camera_count 逐项完全一致。逐个计算会抛出异常的参数
+        （如视场角为0、重叠比例为1）对应的 valid 为 False，摄像头数量为 -1，
+        间距、覆盖率和成本为 NaN。
+
+        Args:
+            sandbox_width: 沙盘宽度（米）
+            sandbox_height: 沙盘高度（米）
+            camera_height: 摄像头安装高度（米）
+            horizontal_fov: 水平视场角（度）
+            vertical_fov: 垂直视场角（度）
+            overlap_ratio: 重叠比例（默认20%）
+            camera_price: 摄像头单价（元，默认2000元）
+            include_positions: 是否生成每组参数的摄像头位置（默认不生成）
+
+        Returns:
+            Dict: 列式结果，每个键对应一个与广播形状相同的数组
+        """
+        import numpy as np
+        
+        (sandbox_width, sandbox_height, camera_height, horizontal_fov,
+         vertical_fov, overlap_ratio, camera_price) = np.broadcast_arrays(
+            *(np.asarray(value, dtype=np.float64) for value in (
+                sandbox_width, sandbox_height, camera_height, horizontal_fov,
+                vertical_fov, overlap_ratio, camera_price))
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 单个摄像头覆盖范围（与 calculate_coverage_area 的运算顺序一致）
+            coverage_width = 2 * camera_height * _tan_half_angle(horizontal_fov)
+            coverage_height = 2 * camera_height * _tan_half_angle(vertical_fov)
+            coverage_area = coverage_width * coverage_height
+
+            # 考虑重叠后的有效覆盖范围
+            effective_width = coverage_width * (1 - overlap_ratio)
+            effective_height = coverage_height * (1 - overlap_ratio)
+
+            count_x = np.ceil(sandbox_width / effective_width)
+            count_y = np.ceil(sandbox_height / effective_height)
+            # 有效覆盖为0（除零）或结果非有限、超出整数范围的组合无法计算
+            valid = (
+                (effective_width != 0) & (effective_height != 0)
+                & np.isfinite(count_x) & np.isfinite(count_y)
+                & (np.abs(count_x * count_y) < _MAX_BATCH_CAMERAS)
+            )
+            cameras_x = np.where(valid, count_x, -1).astype(np.int64)
+            cameras_y = np.where(valid, count_y, -1).astype(np.int64)
+            total_cameras = np.where(valid, cameras_x * cameras_y, -1)
+
+            spacing_x = np.where(cameras_x > 1, sandbox_width / cameras_x, sandbox_width / 2)
+            spacing_y = np.where(cameras_y > 1, sandbox_height / cameras_y, sandbox_height / 2)
+
+            sandbox_area = sandbox_width * sandbox_height
+            coverage_ratio = np.where(
+                sandbox_area > 0,
+                np.minimum(total_cameras * coverage_area / sandbox_area, 1.0),
+                0.0
+            )
+
+        total_cost = total_cameras * camera_price
+        spacing_x = np.where(valid, spacing_x, np.nan)
+        spacing_y = np.where(valid, spacing_y, np.nan)
+        coverage_ratio = np.where(valid, coverage_ratio, np.nan)
+        total_cost = np.where(valid, total_cost, np.nan)
+
+        result = {
+            'valid': valid,
             'total_cameras': total_cameras,
             'cameras_x': cameras_x,
             'cameras_y': cameras_y,
-            'camera_positions': camera_positions,
             'spacing_x': spacing_x,
             'spacing_y': spacing_y,
-            'coverage_per_camera': coverage,
-            'effective_coverage': {
-                'width': effective_width,
-                'height': effective_height
-            },
+            'coverage_width': coverage_width,
+            'coverage_height': coverage_height,
+            'coverage_area': coverage_area,
+            'effective_width': effective_width,
+            'effective_height': effective_height,
             'coverage_ratio': coverage_ratio,
-            'overlap_ratio': overlap_ratio,
             'total_cost': total_cost,
-            'camera_price': camera_price,
-            'sandbox_dimensions': {
-                'width': sandbox_width,
-                'height': sandbox_height,
-                'area': sandbox_area
-            }
+            'sandbox_area': sandbox_area
         }
-    
+
+        if include_positions:
+            positions = np.empty(total_cameras.shape, dtype=object)
+            for index in np.ndindex(total_cameras.shape):
+                if not valid[index]:
+                    continue
+                positions[index] = _grid_positions(
+                    int(cameras_x[index]), int(cameras_y[index]),
+                    float(spacing_x[index]), float(spacing_y[index]),
+                    float(sandbox_width[index]), float(sandbox_height[index]),
+                    float(camera_height[index])
+                )
+            result['camera_positions'] = positions
+
+        return result
+
+    def calculate_camera_count_frame(self, scenarios, include_positions: bool = False):
+        """
+        以 pandas DataFrame 形式批量计算摄像头数量
+
+        Args:
+            scenarios: 包含 sandbox_width、sandbox_height、camera_height、
+                horizontal_fov、vertical_fov 列的 DataFrame，
+                可选列 overlap_ratio、camera_price
+            include_positions: 是否附加 camera_positions 列
+
+        Returns:
+            DataFrame: 输入列加上计算结果列
+        """
+        import numpy as np
+        
+        columns = {
+            name: scenarios[name].to_numpy(dtype=np.float64)
+            for name in ('sandbox_width', 'sandbox_height', 'camera_height',
+                         'horizontal_fov', 'vertical_fov')
+        }
+        for name, default in (('overlap_ratio', 0.2), ('camera_price', 2000.0)):
+            if name in scenarios:
+                columns[name] = scenarios[name].to_numpy(dtype=np.float64)
+            else:
+                columns[name] = default
+
+        batch = self.calculate_camera_count_batch(include_positions=include_positions, **columns)
+        batch.pop('sandbox_area')
+
+        output = scenarios.copy()
+        for name, values in batch.items():
+            output[name] = list(values) if name == 'camera_positions' else values
+        return output
+
+    @timed('calculator.calculate_optimal_height')
     def calculate_optimal_height(self, sandbox_width: float, sandbox_height: float,
                                horizontal_fov: float, vertical_fov: float,
-                               max_cameras: int = None, camera_price: float = 2000.0) -> Dict[str, Any]:
+                               max_cameras: int = None, camera_price: float = 2000.0,
+                               method: str = 'sweep', min_height: float = 1.0,
+                               max_height: float = 10.0, overlap_ratio: float = 0.2) -> Dict[str, Any]:
         """
         计算最优安装高度
         
@@ -136,60 +314,167 @@ class CameraCalculator:
             vertical_fov: 垂直视场角（度）
             max_cameras: 最大摄像头数量限制
             camera_price: 摄像头单价（元，默认2000元）
+            method: 'sweep' 按0.5米步长扫描；'exact' 解析枚举摄像头数量的跳变高度
+            min_height: 搜索的最低安装高度（米，默认1米）
+            max_height: 搜索的最高安装高度（米，默认10米）
+            overlap_ratio: 重叠比例（默认20%）
             
         Returns:
             Dict: 最优高度和对应的配置信息
         """
-        optimal_results = []
+        if min_height <= 0:
+            raise ValueError("最低安装高度必须大于0")
+        if max_height < min_height:
+            raise ValueError("最高安装高度不能小于最低安装高度")
         
-        # 测试不同高度（从1米到10米，步长0.5米）
-        for height in np.arange(1.0, 10.1, 0.5):
-            result = self.calculate_camera_count(
-                sandbox_width, sandbox_height, height, 
-                horizontal_fov, vertical_fov, camera_price=camera_price
+        if method == 'sweep':
+            # 测试不同高度（默认从1米到10米，步长0.5米）
+            # 与 np.arange(min_height, max_height + 0.1, 0.5) 逐位一致
+            count = max(0, math.ceil((max_height + 0.1 - min_height) / 0.5))
+            step = (min_height + 0.5) - min_height
+            heights = [min_height + i * step for i in range(count)]
+        elif method == 'exact':
+            # 只需评估最高的几个区间，枚举量与 min_height 无关
+            heights = self._camera_count_breakpoints(
+                sandbox_width, sandbox_height, horizontal_fov, vertical_fov,
+                overlap_ratio, min_height, max_height, limit=5
             )
-            
-            # 如果设置了最大摄像头数量限制
-            if max_cameras and result['total_cameras'] <= max_cameras:
-                optimal_results.append({
-                    'height': height,
-                    'cameras': result['total_cameras'],
-                    'coverage_ratio': result['coverage_ratio'],
-                    'cost': result['total_cost'],
-                    'result': result
-                })
+        else:
+            raise ValueError(f"未知的优化方法: {method}")
+        
+        # 先只计算数量、覆盖率和成本，完整配置只为最终返回的高度生成
+        candidates = []
+        for index, height in enumerate(heights):
+            candidate = self._height_candidate(
+                sandbox_width, sandbox_height, height,
+                horizontal_fov, vertical_fov, overlap_ratio, camera_price
+            )
+            if method == 'exact':
+                # 在该区间内摄像头数量保持不变
+                upper = heights[index + 1] if index + 1 < len(heights) else max_height
+                candidate['height_interval'] = (height, upper)
+            candidates.append(candidate)
+        
+        def with_result(candidate):
+            if 'result' not in candidate:
+                candidate['result'] = self.calculate_camera_count(
+                    sandbox_width, sandbox_height, candidate['height'],
+                    horizontal_fov, vertical_fov, overlap_ratio, camera_price,
+                    lazy_positions=True
+                )
+            return candidate
+        
+        # 如果设置了最大摄像头数量限制
+        optimal_results = [
+            candidate for candidate in candidates
+            if max_cameras and candidate['cameras'] <= max_cameras
+        ]
         
         # 如果没有找到满足条件的配置，返回摄像头数量最少的
         if not optimal_results:
-            min_cameras = float('inf')
-            best_height = 5.0  # 默认高度
-            best_result = None
-            
-            for height in np.arange(1.0, 10.1, 0.5):
-                result = self.calculate_camera_count(
-                    sandbox_width, sandbox_height, height, 
-                    horizontal_fov, vertical_fov, camera_price=camera_price
-                )
-                if result['total_cameras'] < min_cameras:
-                    min_cameras = result['total_cameras']
-                    best_height = height
-                    best_result = result
+            best_config = min(candidates, key=lambda x: x['cameras'], default=None)
             
             return {
-                'optimal_height': best_height,
-                'configuration': best_result,
+                'optimal_height': best_config['height'] if best_config else 5.0,
+                'configuration': with_result(best_config)['result'] if best_config else None,
                 'alternatives': []
             }
         
-        # 选择覆盖率最高的配置
-        best_config = max(optimal_results, key=lambda x: x['coverage_ratio'])
+        if method == 'exact':
+            # 依次选择摄像头最少、成本最低、高度最低的配置
+            ranked = sorted(optimal_results, key=lambda x: (x['cameras'], x['cost'], x['height']))
+            best_config = ranked[0]
+            alternatives = sorted(ranked[:5], key=lambda x: x['height'])
+        else:
+            # 选择覆盖率最高的配置
+            best_config = max(optimal_results, key=lambda x: x['coverage_ratio'])
+            alternatives = optimal_results[:5]  # 返回前5个备选方案
         
         return {
             'optimal_height': best_config['height'],
-            'configuration': best_config['result'],
-            'alternatives': optimal_results[:5]  # 返回前5个备选方案
+            'configuration': with_result(best_config)['result'],
+            'alternatives': [with_result(candidate) for candidate in alternatives]
         }
     
+    @staticmethod
+    def _height_candidate(sandbox_width: float, sandbox_height: float, height: float,
+                          horizontal_fov: float, vertical_fov: float,
+                          overlap_ratio: float, camera_price: float) -> Dict[str, Any]:
+        """按 calculate_layout 的计算顺序求单个高度的摄像头数量、覆盖率和成本"""
+        coverage_width = 2 * height * math.tan(math.radians(horizontal_fov) / 2)
+        coverage_height = 2 * height * math.tan(math.radians(vertical_fov) / 2)
+        cameras = (math.ceil(sandbox_width / (coverage_width * (1 - overlap_ratio)))
+                   * math.ceil(sandbox_height / (coverage_height * (1 - overlap_ratio))))
+        sandbox_area = sandbox_width * sandbox_height
+        coverage_ratio = (min(cameras * (coverage_width * coverage_height) / sandbox_area, 1.0)
+                          if sandbox_area > 0 else 0)
+        return {
+            'height': height,
+            'cameras': cameras,
+            'coverage_ratio': coverage_ratio,
+            'cost': cameras * camera_price
+        }
+    
+    def _camera_count_breakpoints(self, sandbox_width: float, sandbox_height: float,
+                                  horizontal_fov: float, vertical_fov: float,
+                                  overlap_ratio: float, min_height: float,
+                                  max_height: float, limit: Optional[int] = None) -> List[float]:
+        """
+        枚举 [min_height, max_height] 内摄像头数量发生变化的高度
+        
+        单方向摄像头数量 ceil(L / (2h·tan(fov/2)·(1-overlap))) 是高度的阶梯函数，
+        数量降为 k 的最低高度为 L / (2·tan(fov/2)·(1-overlap)·k)。
+        
+        Args:
+            limit: 只返回最高的 limit 个高度（None 表示全部）；
+                数量随高度单调不增，最高的几个区间就是摄像头最少的配置
+        
+        Returns:
+            List[float]: 升序排列的高度，每个高度是一个数量不变区间的起点
+        """
+        breakpoints = {float(min_height)}
+        
+        for length, fov in ((sandbox_width, horizontal_fov), (sandbox_height, vertical_fov)):
+            factor = 2 * math.tan(math.radians(fov) / 2) * (1 - overlap_ratio)
+            if length <= 0 or factor <= 0:
+                continue
+            
+            count_at_min = _axis_camera_count(length, min_height, fov, overlap_ratio)
+            count_at_max = _axis_camera_count(length, max_height, fov, overlap_ratio)
+            
+            if limit is not None:
+                # 各方向最高的 limit 个跳变高度已包含合并后最高的 limit 个
+                count_at_min = min(count_at_min, count_at_max + limit)
+            
+            for k in range(count_at_max, count_at_min):
+                height = length / (factor * k)
+                # 修正浮点误差，使 height 恰为数量降为 k 的最低高度
+                while _axis_camera_count(length, height, fov, overlap_ratio) > k:
+                    height = math.nextafter(height, math.inf)
+                while _axis_camera_count(length, math.nextafter(height, -math.inf), fov, overlap_ratio) <= k:
+                    height = math.nextafter(height, -math.inf)
+                if min_height < height <= max_height:
+                    breakpoints.add(height)
+        
+        breakpoints = sorted(breakpoints)
+        return breakpoints if limit is None else breakpoints[-limit:]
+    
+    def calculate_exact_coverage(self, calculation_result: Dict[str, Any],
+                                 k_values: Tuple[int, ...] = (1, 2)) -> Dict[str, Any]:
+        """
+        精确计算布局的覆盖情况（重叠区域只计一次）
+
+        Args:
+            calculation_result: calculate_camera_count 的计算结果
+            k_values: 需要统计的覆盖重数（至少被 k 个摄像头覆盖）
+
+        Returns:
+            Dict: 覆盖面积、未覆盖面积、覆盖率和各重数覆盖面积
+        """
+        from coverage_engine import compute_result_coverage
+
+        return compute_result_coverage(calculation_result, k_values)
+
     def get_coverage_visualization_data(self) -> List[Dict[str, Any]]:
         """
         获取可视化数据
@@ -207,6 +492,344 @@ class CameraCalculator:
         ]
 
 
+class PositionListView(Sequence):
+    """
+    摄像头位置的只读列表视图
+
+    按下标访问时才生成 {'x','y','z'} 字典，兼容原有的字典列表用法；
+    遍历时按网格参数逐个生成，不会构造完整的位置数组；
+    np.asarray(view) 得到 (n, 3) 数组。
+    """
+
+    __slots__ = ('_layout',)
+
+    def __init__(self, layout: 'LayoutResult'):
+        self._layout = layout
+
+    def __len__(self) -> int:
+        return self._layout.position_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._as_dict(row) for row in self._layout.positions[index].tolist()]
+        return self._as_dict(self._layout.position_at(index))
+
+    def __iter__(self):
+        return (self._as_dict(row) for row in self._layout.iter_positions())
+
+    def __array__(self, dtype=None, copy=None):
+        positions = self._layout.positions
+        return positions if dtype is None else positions.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"PositionListView({len(self)} positions)"
+
+    @staticmethod
+    def _as_dict(row) -> Dict[str, float]:
+        return {'x': row[0], 'y': row[1], 'z': row[2]}
+
+
+class LayoutResult(Mapping):
+    """
+    紧凑的布局计算结果
+
+    摄像头位置以连续的 (n, 3) float64 数组 positions 提供；网格布局只保存
+    行列数和间距，首次访问 positions 时才生成数组，也可以用 iter_positions /
+    iter_position_chunks 逐个或分块生成。同时实现只读 Mapping 接口，可用与
+    calculate_camera_count 返回字典相同的键访问，其中 'camera_positions'
+    返回按需生成字典的列表视图。
+    """
+
+    __slots__ = ('total_cameras', 'cameras_x', 'cameras_y', '_positions', '_grid',
+                 'spacing_x', 'spacing_y', 'coverage_per_camera', 'effective_coverage',
+                 'coverage_ratio', 'overlap_ratio', 'total_cost', 'camera_price',
+                 'sandbox_dimensions')
+
+    # 与 calculate_camera_count 返回字典的键顺序一致
+    _KEYS = ('total_cameras', 'cameras_x', 'cameras_y', 'camera_positions',
+             'spacing_x', 'spacing_y', 'coverage_per_camera', 'effective_coverage',
+             'coverage_ratio', 'overlap_ratio', 'total_cost', 'camera_price',
+             'sandbox_dimensions')
+
+    def __init__(self, total_cameras: int, cameras_x: int, cameras_y: int,
+                 positions: np.ndarray, spacing_x: float, spacing_y: float,
+                 coverage_per_camera: Dict[str, float], effective_coverage: Dict[str, float],
+                 coverage_ratio: float, overlap_ratio: float, total_cost: float,
+                 camera_price: float, sandbox_dimensions: Dict[str, float],
+                 grid: Tuple[float, ...] = None):
+        """
+        Args:
+            positions: (n, 3) 位置数组；为 None 时由 grid 按需生成
+            grid: 网格参数 (cameras_x, cameras_y, spacing_x, spacing_y,
+                sandbox_width, sandbox_height, camera_height)
+            其余参数含义同 calculate_camera_count 返回字典中的同名键
+        """
+        if positions is None and grid is None:
+            raise ValueError("positions 和 grid 至少需要提供一个")
+        if positions is not None:
+            import numpy as np
+            positions = np.ascontiguousarray(positions, dtype=np.float64).reshape(-1, 3)
+            positions.flags.writeable = False
+
+        self.total_cameras = total_cameras
+        self.cameras_x = cameras_x
+        self.cameras_y = cameras_y
+        self._positions = positions
+        self._grid = grid
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+        self.coverage_per_camera = coverage_per_camera
+        self.effective_coverage = effective_coverage
+        self.coverage_ratio = coverage_ratio
+        self.overlap_ratio = overlap_ratio
+        self.total_cost = total_cost
+        self.camera_price = camera_price
+        self.sandbox_dimensions = sandbox_dimensions
+
+    @property
+    def positions(self) -> np.ndarray:
+        """摄像头位置的 (n, 3) 只读数组，首次访问时生成"""
+        if self._positions is None:
+            positions = _grid_positions(*self._grid)
+            positions.flags.writeable = False
+            self._positions = positions
+        return self._positions
+
+    @property
+    def position_count(self) -> int:
+        """摄像头位置数量（某一方向的数量不为正时没有位置，与逐个生成的结果一致）"""
+        if self._positions is not None:
+            return len(self._positions)
+        return max(self._grid[0], 0) * max(self._grid[1], 0)
+
+    @property
+    def camera_positions(self) -> PositionListView:
+        """摄像头位置的字典列表视图"""
+        return PositionListView(self)
+
+    def position_at(self, index: int) -> Tuple[float, float, float]:
+        """
+        获取单个摄像头的位置（网格布局直接按下标计算，不生成位置数组）
+
+        Args:
+            index: 摄像头下标（支持负数）
+
+        Returns:
+            Tuple: (x, y, z) 坐标
+        """
+        index = operator.index(index)
+        if index < 0:
+            index += self.position_count
+        if not 0 <= index < self.position_count:
+            raise IndexError("摄像头下标超出范围")
+        if self._positions is not None:
+            return tuple(self._positions[index].tolist())
+
+        cameras_x, cameras_y, spacing_x, spacing_y, sandbox_width, sandbox_height, z = self._grid
+        i, j = divmod(index, cameras_y)
+        x = spacing_x * (i + 0.5) if cameras_x > 1 else sandbox_width / 2
+        y = spacing_y * (j + 0.5) if cameras_y > 1 else sandbox_height / 2
+        return (x, y, float(z))
+
+    def iter_positions(self):
+        """
+        逐个生成摄像头位置
+
+        Yields:
+            Tuple: (x, y, z) 坐标，顺序与 positions 一致
+        """
+        if self._positions is not None:
+            yield from map(tuple, self._positions.tolist())
+            return
+
+        cameras_x, cameras_y, spacing_x, spacing_y, sandbox_width, sandbox_height, z = self._grid
+        z = float(z)
+        ys = [spacing_y * (j + 0.5) if cameras_y > 1 else sandbox_height / 2
+              for j in range(cameras_y)]
+        for i in range(cameras_x):
+            x = spacing_x * (i + 0.5) if cameras_x > 1 else sandbox_width / 2
+            for y in ys:
+                yield (x, y, z)
+
+    def iter_position_chunks(self, chunk_size: int = 65536):
+        """
+        分块生成摄像头位置，适用于超大网格
+
+        Args:
+            chunk_size: 每块的摄像头数量
+
+        Yields:
+            np.ndarray: 形状为 (k, 3) 的位置数组，k <= chunk_size
+        """
+        total = self.position_count
+        if self._positions is not None:
+            for start in range(0, total, chunk_size):
+                yield self._positions[start:start + chunk_size]
+            return
+
+        import numpy as np
+        
+        cameras_x, cameras_y, spacing_x, spacing_y, sandbox_width, sandbox_height, z = self._grid
+        for start in range(0, total, chunk_size):
+            index = np.arange(start, min(start + chunk_size, total))
+            chunk = np.empty((index.size, 3), dtype=np.float64)
+            chunk[:, 0] = spacing_x * (index // cameras_y + 0.5) if cameras_x > 1 else sandbox_width / 2
+            chunk[:, 1] = spacing_y * (index % cameras_y + 0.5) if cameras_y > 1 else sandbox_height / 2
+            chunk[:, 2] = z
+            yield chunk
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return (f"LayoutResult(total_cameras={self.total_cameras}, "
+                f"grid={self.cameras_x}x{self.cameras_y}, total_cost={self.total_cost})")
+
+    def copy(self) -> 'LayoutResult':
+        """
+        复制结果：嵌套的覆盖范围、尺寸字典各自独立，只读的位置数组与原结果共享
+        """
+        return LayoutResult(
+            total_cameras=self.total_cameras,
+            cameras_x=self.cameras_x,
+            cameras_y=self.cameras_y,
+            positions=self._positions,
+            spacing_x=self.spacing_x,
+            spacing_y=self.spacing_y,
+            coverage_per_camera=dict(self.coverage_per_camera),
+            effective_coverage=dict(self.effective_coverage),
+            coverage_ratio=self.coverage_ratio,
+            overlap_ratio=self.overlap_ratio,
+            total_cost=self.total_cost,
+            camera_price=self.camera_price,
+            sandbox_dimensions=dict(self.sandbox_dimensions),
+            grid=self._grid
+        )
+
+    def to_dict(self, materialize_positions: bool = True) -> Dict[str, Any]:
+        """
+        转换为与 calculate_camera_count 相同结构的字典
+
+        Args:
+            materialize_positions: 为 True 时位置为字典列表，否则为按需生成的列表视图
+        """
+        result = {key: getattr(self, key) for key in self._KEYS}
+        if materialize_positions:
+            result['camera_positions'] = list(self.camera_positions)
+        return result
+
+
+def layout_positions(calculation_result) -> np.ndarray:
+    """
+    获取计算结果中摄像头位置的 (n, 3) 数组
+
+    Args:
+        calculation_result: LayoutResult 或 calculate_camera_count 返回的字典
+
+    Returns:
+        np.ndarray: x/y/z 坐标数组
+    """
+    import numpy as np
+    
+    if isinstance(calculation_result, LayoutResult):
+        return calculation_result.positions
+    camera_positions = calculation_result['camera_positions']
+    if hasattr(camera_positions, '__array__'):
+        return np.asarray(camera_positions)
+    return np.array([(pos['x'], pos['y'], pos['z']) for pos in camera_positions],
+                    dtype=np.float64).reshape(-1, 3)
+
+
+def iter_layout_position_chunks(calculation_result, chunk_size: int = 65536):
+    """
+    分块生成计算结果中的摄像头位置，网格布局不会构造完整的位置数组
+
+    Args:
+        calculation_result: LayoutResult 或 calculate_camera_count 返回的字典
+        chunk_size: 每块的摄像头数量
+
+    Yields:
+        np.ndarray: 形状为 (k, 3) 的位置数组，k <= chunk_size
+    """
+    import numpy as np
+    from itertools import islice
+
+    if isinstance(calculation_result, LayoutResult):
+        yield from calculation_result.iter_position_chunks(chunk_size)
+        return
+    camera_positions = calculation_result['camera_positions']
+    if isinstance(camera_positions, PositionListView):
+        yield from camera_positions._layout.iter_position_chunks(chunk_size)
+        return
+    if hasattr(camera_positions, '__array__'):
+        positions = np.asarray(camera_positions).reshape(-1, 3)
+        for start in range(0, len(positions), chunk_size):
+            yield positions[start:start + chunk_size]
+        return
+    rows = iter(camera_positions)
+    while True:
+        chunk = [(pos['x'], pos['y'], pos['z']) for pos in islice(rows, chunk_size)]
+        if not chunk:
+            return
+        yield np.array(chunk, dtype=np.float64)
+
+
+def _axis_camera_count(length: float, height: float, fov: float, overlap_ratio: float) -> int:
+    """单方向所需摄像头数量，运算顺序与 calculate_camera_count 保持一致"""
+    coverage = 2 * height * math.tan(math.radians(fov) / 2)
+    return math.ceil(length / (coverage * (1 - overlap_ratio)))
+
+
+def _tan_half_angle(angles):
+    """
+    计算 tan(角度/2)，角度单位为度
+
+    对去重后的角度逐个调用 math.tan，保证与标量路径的结果逐位一致；
+    实际批量计算中视场角取值通常很少，去重后开销可以忽略。
+    """
+    import numpy as np
+    
+    unique_angles, inverse = np.unique(angles, return_inverse=True)
+    unique_tans = np.array([math.tan(math.radians(angle) / 2) for angle in unique_angles.tolist()],
+                           dtype=np.float64)
+    return unique_tans[inverse].reshape(np.shape(angles))
+
+
+def _grid_positions(cameras_x: int, cameras_y: int, spacing_x: float, spacing_y: float,
+                    sandbox_width: float, sandbox_height: float, camera_height: float) -> np.ndarray:
+    """
+    生成网格布局的摄像头位置数组
+
+    Returns:
+        np.ndarray: 形状为 (n, 3) 的 x/y/z 坐标，顺序与 calculate_camera_count 一致
+    """
+    import numpy as np
+    
+    cameras_x, cameras_y = max(cameras_x, 0), max(cameras_y, 0)
+    if cameras_x > 1:
+        xs = spacing_x * (np.arange(cameras_x) + 0.5)
+    else:
+        xs = np.full(cameras_x, sandbox_width / 2)
+    if cameras_y > 1:
+        ys = spacing_y * (np.arange(cameras_y) + 0.5)
+    else:
+        ys = np.full(cameras_y, sandbox_height / 2)
+
+    positions = np.empty((cameras_x * cameras_y, 3), dtype=np.float64)
+    positions[:, 0] = np.repeat(xs, cameras_y)
+    positions[:, 1] = np.tile(ys, cameras_x)
+    positions[:, 2] = camera_height
+    return positions
+
+
 def calculate_viewing_angle_from_lens(focal_length: float, sensor_size: float) -> float:
     """
     根据镜头焦距和传感器尺寸计算视场角
@@ -265,6 +888,37 @@ def estimate_installation_complexity(camera_count: int, area: float) -> Dict[str
     }
 
 
+def estimate_installation_cost_batch(camera_counts) -> Dict[str, Any]:
+    """
+    批量估算安装时间和人工成本（向量化）
+
+    与 estimate_installation_complexity 使用相同的复杂度分级和费率。
+
+    Args:
+        camera_counts: 摄像头数量（标量或数组）
+
+    Returns:
+        Dict: 包含 complexity_factor、installation_time、labor_cost 数组
+    """
+    import numpy as np
+    
+    camera_counts = np.asarray(camera_counts)
+
+    complexity_factor = np.select(
+        [camera_counts <= 4, camera_counts <= 10, camera_counts <= 20],
+        [1.0, 1.2, 1.5],
+        default=2.0
+    )
+    installation_time = camera_counts * 2 * complexity_factor
+    labor_cost = installation_time * 200
+
+    return {
+        'complexity_factor': complexity_factor,
+        'installation_time': installation_time,
+        'labor_cost': labor_cost
+    }
+
+
 def _get_installation_recommendations(complexity_level: str, camera_count: int) -> List[str]:
     """获取安装建议"""
     recommendations = []
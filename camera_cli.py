@@ -0,0 +1,96 @@
+"""
+命令行批量计算工具
+从 CSV 或 JSON-lines 读取场景（文件或标准输入），逐块输出计算结果，可多进程并行并按需生成图表
+
+用法:
+    python -m camera_cli sites.csv --output results.jsonl --workers 4
+    cat sites.jsonl | python -m camera_cli - --format jsonl --charts output/charts
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+from typing import IO, List, Optional
+
+from scenario_pipeline import (
+    CHART_METHODS,
+    DEFAULT_CHUNK_SIZE,
+    INPUT_FORMATS,
+    OUTPUT_FORMATS,
+    ProgressReporter,
+    detect_format,
+    run_pipeline,
+)
+
+
+def _open_input(path: str) -> IO:
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def _open_output(path: Optional[str]) -> IO:
+    if path in (None, '-'):
+        return contextlib.nullcontext(sys.stdout)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(
+        description="沙盘摄像头批量计算（CSV/JSON-lines 输入，逐块输出结果）"
+    )
+    parser.add_argument('input', nargs='?', default='-', help="场景文件，'-' 表示标准输入（默认）")
+    parser.add_argument('--format', choices=INPUT_FORMATS, help="输入格式（默认按扩展名判断，标准输入为csv）")
+    parser.add_argument('--output', '-o', default='-', help="结果文件，'-' 表示标准输出（默认）")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                        help="输出格式（默认按扩展名判断，标准输出为jsonl）")
+    parser.add_argument('--workers', type=int, default=1, help="进程数（默认1，在当前进程计算）")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"每个向量化分块的场景数（默认{DEFAULT_CHUNK_SIZE}）")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="排队和计算中的分块上限（默认 workers×2）")
+    parser.add_argument('--progress', action='store_true', help="在标准错误输出处理进度")
+    parser.add_argument('--charts', metavar='DIR', help="生成图表并保存到该目录")
+    parser.add_argument('--chart-types', default='layout',
+                        help=f"图表类型，逗号分隔（可选 {', '.join(CHART_METHODS)}，默认 layout）")
+    args = parser.parse_args(argv)
+
+    charts = [chart.strip() for chart in args.chart_types.split(',') if chart.strip()]
+    unknown = [chart for chart in charts if chart not in CHART_METHODS]
+    if unknown:
+        parser.error(f"不支持的图表类型: {', '.join(unknown)}")
+    if args.workers < 1:
+        parser.error("--workers 必须大于等于1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size 必须大于等于1")
+
+    input_format = args.format or detect_format(args.input, 'csv')
+    output_format = args.output_format or detect_format(args.output, 'jsonl')
+
+    with _open_input(args.input) as source, _open_output(args.output) as sink:
+        try:
+            summary = run_pipeline(
+                source, sink, input_format, output_format,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                max_pending=args.max_pending,
+                charts=charts if args.charts else (),
+                chart_dir=args.charts,
+                progress=ProgressReporter() if args.progress else None
+            )
+        except ValueError as e:
+            print(f"输入错误: {e}", file=sys.stderr)
+            return 2
+
+    print(f"完成: {summary['rows'] - summary['errors']} 个场景，失败 {summary['errors']} 个，"
+          f"耗时 {summary['elapsed']:.2f} 秒", file=sys.stderr)
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+摄像头配置多目标优化模块
+在安装高度 × 镜头焦距 × 重叠比例 × 摄像头价格的组合空间中搜索帕累托最优方案
+"""
+
+import numpy as np
+from typing import Dict, Any, Sequence
+
+from camera_calculator import (
+    CameraCalculator, calculate_viewing_angle_from_lens, estimate_installation_cost_batch
+)
+
+
+def grid_coverage_ratio(cameras_x, cameras_y, coverage_width, coverage_height,
+                        sandbox_width, sandbox_height):
+    """
+    计算网格布局的真实覆盖率（重叠部分只计一次）
+
+    网格布局的覆盖区域是两个方向覆盖区间并集的笛卡尔积；单方向上
+    n 个宽度为 w、按 calculate_camera_count 规则排布的区间裁剪到 [0, L]
+    后的并集长度恰为 min(n·w, L)。
+
+    Returns:
+        与输入广播形状相同的覆盖率数组
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covered_x = np.minimum(cameras_x * coverage_width, sandbox_width)
+        covered_y = np.minimum(cameras_y * coverage_height, sandbox_height)
+        sandbox_area = sandbox_width * sandbox_height
+        return np.where(sandbox_area > 0, covered_x * covered_y / sandbox_area, 0.0)
+
+
+def pareto_front_mask(cost, camera_count, coverage) -> np.ndarray:
+    """
+    计算帕累托前沿掩码：成本越低、摄像头越少、覆盖率越高越好
+
+    按摄像头数量升序分组处理，维护已处理分组的"成本-最大覆盖率"阶梯，
+    组内再按成本做二维支配剔除，整体复杂度 O(n log n)。目标值完全相同的
+    配置只保留输入顺序中的第一个。
+
+    Args:
+        cost: 总成本数组
+        camera_count: 摄像头数量数组
+        coverage: 覆盖率数组
+
+    Returns:
+        np.ndarray: 布尔数组，True 表示该配置位于帕累托前沿
+    """
+    cost = np.asarray(cost, dtype=np.float64).ravel()
+    camera_count = np.asarray(camera_count).ravel()
+    coverage = np.asarray(coverage, dtype=np.float64).ravel()
+
+    mask = np.zeros(cost.size, dtype=bool)
+    if cost.size == 0:
+        return mask
+
+    # 主键：数量升序；次键：成本升序；再按覆盖率降序、原始顺序升序
+    order = np.lexsort((np.arange(cost.size), -coverage, cost, camera_count))
+    sorted_count = camera_count[order]
+    sorted_cost = cost[order]
+    sorted_coverage = coverage[order]
+
+    group_starts = np.flatnonzero(np.r_[True, sorted_count[1:] != sorted_count[:-1]])
+    group_ends = np.r_[group_starts[1:], cost.size]
+
+    stair_cost = np.empty(0)
+    stair_coverage = np.empty(0)
+
+    for start, end in zip(group_starts, group_ends):
+        group_cost = sorted_cost[start:end]
+        group_coverage = sorted_coverage[start:end]
+
+        # 被摄像头数量更少的方案支配
+        dominated = np.zeros(end - start, dtype=bool)
+        if stair_cost.size:
+            idx = np.searchsorted(stair_cost, group_cost, side='right') - 1
+            dominated = (idx >= 0) & (stair_coverage[np.maximum(idx, 0)] >= group_coverage)
+
+        # 组内：成本不高于且覆盖率不低于的更早方案
+        previous_best = np.maximum.accumulate(group_coverage)
+        previous_best = np.r_[-np.inf, previous_best[:-1]]
+        dominated |= previous_best >= group_coverage
+
+        survivors = ~dominated
+        mask[order[start:end][survivors]] = True
+
+        if survivors.any():
+            merged_cost = np.concatenate([stair_cost, group_cost[survivors]])
+            merged_coverage = np.concatenate([stair_coverage, group_coverage[survivors]])
+            merge_order = np.argsort(merged_cost, kind='stable')
+            stair_cost = merged_cost[merge_order]
+            stair_coverage = np.maximum.accumulate(merged_coverage[merge_order])
+
+    return mask
+
+
+def search_pareto_front(sandbox_width: float, sandbox_height: float,
+                        heights: Sequence[float], focal_lengths: Sequence[float],
+                        overlap_ratios: Sequence[float], camera_prices: Sequence[float],
+                        sensor_width: float = 6.4, sensor_height: float = 4.8,
+                        calculator: CameraCalculator = None) -> Dict[str, Any]:
+    """
+    搜索安装高度、镜头焦距、重叠比例和摄像头价格组合的帕累托前沿
+
+    优化目标：总成本（设备 + 人工）最低、摄像头数量最少、真实覆盖率最高。
+
+    Args:
+        sandbox_width: 沙盘宽度（米）
+        sandbox_height: 沙盘高度（米）
+        heights: 候选安装高度（米）
+        focal_lengths: 候选镜头焦距（mm）
+        overlap_ratios: 候选重叠比例
+        camera_prices: 候选摄像头单价（元）
+        sensor_width: 传感器宽度（mm，默认6.4mm）
+        sensor_height: 传感器高度（mm，默认4.8mm）
+        calculator: 计算器实例（默认新建）
+
+    Returns:
+        Dict: 前沿上各方案的参数和目标值数组（按总成本升序），以及评估的方案总数（含无效组合）
+    """
+    calculator = calculator or CameraCalculator()
+
+    heights = np.asarray(heights, dtype=np.float64)
+    focal_lengths = np.asarray(focal_lengths, dtype=np.float64)
+    overlap_ratios = np.asarray(overlap_ratios, dtype=np.float64)
+    camera_prices = np.asarray(camera_prices, dtype=np.float64)
+
+    horizontal_fovs = np.array([
+        calculate_viewing_angle_from_lens(focal, sensor_width) for focal in focal_lengths.tolist()
+    ])
+    vertical_fovs = np.array([
+        calculate_viewing_angle_from_lens(focal, sensor_height) for focal in focal_lengths.tolist()
+    ])
+
+    # 四个维度各占一个轴，广播得到完整组合
+    height_grid = heights[:, None, None, None]
+    focal_index = np.arange(focal_lengths.size)[None, :, None, None]
+    overlap_grid = overlap_ratios[None, None, :, None]
+    price_grid = camera_prices[None, None, None, :]
+
+    batch = calculator.calculate_camera_count_batch(
+        sandbox_width, sandbox_height, height_grid,
+        horizontal_fovs[focal_index], vertical_fovs[focal_index],
+        overlap_grid, price_grid
+    )
+
+    # 无效组合（如重叠比例为1）的摄像头数量为-1、成本为NaN，不参与前沿计算
+    shape = batch['total_cameras'].shape
+    candidates = np.flatnonzero(batch['valid'].ravel())
+    total_cameras = batch['total_cameras'].ravel()[candidates]
+    cameras_x = batch['cameras_x'].ravel()[candidates]
+    cameras_y = batch['cameras_y'].ravel()[candidates]
+    equipment_cost = batch['total_cost'].ravel()[candidates]
+    labor_cost = estimate_installation_cost_batch(total_cameras)['labor_cost']
+    total_cost = equipment_cost + labor_cost
+    coverage_ratio = grid_coverage_ratio(
+        cameras_x, cameras_y,
+        batch['coverage_width'].ravel()[candidates], batch['coverage_height'].ravel()[candidates],
+        sandbox_width, sandbox_height
+    )
+
+    front = np.flatnonzero(pareto_front_mask(total_cost, total_cameras, coverage_ratio))
+    front = front[np.argsort(total_cost[front], kind='stable')]
+    h_idx, f_idx, o_idx, p_idx = np.unravel_index(candidates[front], shape)
+
+    return {
+        'height': heights[h_idx],
+        'focal_length': focal_lengths[f_idx],
+        'horizontal_fov': horizontal_fovs[f_idx],
+        'vertical_fov': vertical_fovs[f_idx],
+        'overlap_ratio': overlap_ratios[o_idx],
+        'camera_price': camera_prices[p_idx],
+        'total_cameras': total_cameras[front],
+        'cameras_x': cameras_x[front],
+        'cameras_y': cameras_y[front],
+        'equipment_cost': equipment_cost[front],
+        'labor_cost': labor_cost[front],
+        'total_cost': total_cost[front],
+        'coverage_ratio': coverage_ratio[front],
+        'evaluated': int(np.prod(shape))
+    }
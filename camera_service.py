@@ -0,0 +1,529 @@
+"""
+摄像头计算HTTP服务
+基于 asyncio 的轻量HTTP/1.1服务（仅依赖标准库），提供摄像头数量、最优高度、覆盖率和图表接口；
+相同的并发请求合并为一次计算，计算、JSON编码和渲染放到执行器中进行，并统计各接口的延迟
+
+用法:
+    python -m camera_service --host 0.0.0.0 --port 8080
+    curl -X POST localhost:8080/v1/camera-count -d '{"sandbox_width": 10, "sandbox_height": 8,
+         "camera_height": 3, "horizontal_fov": 60, "vertical_fov": 45}'
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import instrumentation
+from calculation_cache import CachedCameraCalculator
+from camera_calculator import PositionListView, estimate_installation_complexity
+from scenario_pipeline import parse_scenario
+
+
+# 请求体大小上限（字节）
+MAX_BODY_BYTES = 1024 * 1024
+
+# 返回摄像头位置列表的摄像头数量上限（超出时请求被拒绝，避免生成过大的响应体）
+MAX_POSITION_CAMERAS = 100000
+
+# 最优高度 sweep 方法的最多扫描高度数
+MAX_SWEEP_HEIGHTS = 10000
+
+# 精确覆盖计算的摄像头数量上限和最大覆盖重数（计算量随两者增长）
+MAX_COVERAGE_CAMERAS = 200000
+MAX_COVERAGE_K = 16
+
+# 图表渲染的摄像头数量上限和最高分辨率（渲染时间和画布内存随两者增长）
+MAX_CHART_CAMERAS = 10000
+MAX_CHART_DPI = 300
+
+# 每个接口保留的最近延迟样本数（用于计算分位数）
+LATENCY_WINDOW = 2048
+
+# 图表接口支持的图表类型
+CHART_TYPES = ('layout', '3d', 'heatmap')
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+class HTTPError(Exception):
+    """返回给客户端的HTTP错误"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_default(value: Any) -> Any:
+    """JSON编码无法直接处理的值：位置列表视图、NumPy 数组和标量"""
+    if isinstance(value, PositionListView):
+        return list(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"无法序列化为JSON: {type(value).__name__}")
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+    return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def _check_camera_limit(layout, limit: int, operation: str) -> None:
+    """摄像头数量超过上限时拒绝请求（布局计算本身与数量无关，先算出数量再决定是否继续）"""
+    if layout['total_cameras'] > limit:
+        raise HTTPError(HTTPStatus.BAD_REQUEST,
+                        f"摄像头数量 {layout['total_cameras']} 超过{operation}的上限 {limit}")
+
+
+class LatencyStats:
+    """单个接口的延迟统计（总次数、错误数，以及最近样本的分位数）"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._samples = deque(maxlen=window)
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict: 请求数、错误数、平均/最大延迟和最近样本的 p50/p95/p99（毫秒）
+        """
+        samples = sorted(self._samples)
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': self.total_seconds / self.count * 1000 if self.count else 0.0,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': self.max_seconds * 1000
+        }
+
+
+class RequestCoalescer:
+    """合并相同的并发请求：同一个键在计算完成前只执行一次，其余请求等待同一结果"""
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Args:
+            key: 请求的规范化键
+            compute: 执行计算的协程函数
+
+        Returns:
+            计算结果（所有合并的请求共享同一对象）
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        # 某个客户端断开时不取消其他请求共享的计算
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 所有等待方都已断开时避免“异常未被读取”的警告
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'executed': self.executed, 'coalesced': self.coalesced,
+                'inflight': len(self._inflight)}
+
+
+class CameraService:
+    """摄像头计算HTTP服务"""
+
+    def __init__(self, calculator: Optional[CachedCameraCalculator] = None,
+                 visualizer=None, render_executor: str = 'thread', compute_workers: int = 4):
+        """
+        Args:
+            calculator: 计算器（默认使用带LRU缓存的 CachedCameraCalculator）
+            visualizer: 图表渲染器（默认在首次请求图表时创建 CameraVisualizer）
+            render_executor: 图表渲染执行器，'thread' 或 'process'（见 CameraVisualizer.render_charts）
+            compute_workers: 最优高度和覆盖率计算线程数
+        """
+        self.calculator = calculator or CachedCameraCalculator()
+        self._visualizer = visualizer
+        self.render_executor = render_executor
+        self.compute_executor = ThreadPoolExecutor(
+            max_workers=compute_workers, thread_name_prefix='camera-service'
+        )
+        self.coalescer = RequestCoalescer()
+        self.latency: Dict[str, LatencyStats] = {}
+        self.started_at = time.time()
+        self.routes: Dict[Tuple[str, str], Callable[..., Awaitable[Response]]] = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+            ('POST', '/v1/camera-count'): self.camera_count,
+            ('GET', '/v1/camera-count'): self.camera_count,
+            ('POST', '/v1/optimal-height'): self.optimal_height,
+            ('GET', '/v1/optimal-height'): self.optimal_height,
+            ('POST', '/v1/coverage'): self.coverage,
+            ('GET', '/v1/coverage'): self.coverage,
+        }
+        for chart in CHART_TYPES:
+            self.routes[('POST', f'/v1/charts/{chart}')] = self.chart
+            self.routes[('GET', f'/v1/charts/{chart}')] = self.chart
+
+    @property
+    def visualizer(self):
+        if self._visualizer is None:
+            # matplotlib 只在首次请求图表时导入
+            from camera_visualizer import CameraVisualizer
+            self._visualizer = CameraVisualizer()
+        return self._visualizer
+
+    async def _in_executor(self, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.compute_executor, func, *args)
+
+    async def _coalesce(self, endpoint: str, params: Dict[str, Any],
+                        compute: Callable[[], Awaitable[Any]]) -> Any:
+        key = endpoint + json.dumps(params, sort_keys=True, default=str)
+        return await self.coalescer.run(key, compute)
+
+    # ---- 请求分发 ----
+
+    async def handle(self, method: str, target: str, body: bytes = b'') -> Response:
+        """
+        处理一个请求（不经过网络，可直接用于测试）
+
+        Args:
+            method: HTTP方法
+            target: 请求路径（可带查询字符串）
+            body: 请求体（JSON对象）
+
+        Returns:
+            Tuple: (状态码, 响应头, 响应体)
+        """
+        start = time.perf_counter()
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        name = f"{method} {url.path}" if handler else 'unmatched'
+        try:
+            if handler is None:
+                if any(path == url.path for _, path in self.routes):
+                    raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"不支持的方法: {method}")
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"未知的接口: {url.path}")
+            params = dict(parse_qsl(url.query))
+            if body:
+                try:
+                    payload = json.loads(body)
+                except ValueError as e:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, f"请求体不是有效的JSON: {e}")
+                if not isinstance(payload, dict):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "请求体必须是JSON对象")
+                params.update(payload)
+            response = await handler(params, url.path)
+        except HTTPError as e:
+            response = _json_response({'error': e.message}, e.status)
+        except (ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+            response = _json_response({'error': str(e)}, HTTPStatus.BAD_REQUEST)
+        except Exception as e:
+            response = _json_response({'error': f"服务器内部错误: {e}"},
+                                      HTTPStatus.INTERNAL_SERVER_ERROR)
+        stats = self.latency.get(name)
+        if stats is None:
+            stats = self.latency[name] = LatencyStats()
+        stats.observe(time.perf_counter() - start, error=response[0] >= 400)
+        return response
+
+    # ---- 接口 ----
+
+    async def health(self, params: Dict[str, Any], path: str) -> Response:
+        return _json_response({'status': 'ok', 'uptime': time.time() - self.started_at})
+
+    async def metrics(self, params: Dict[str, Any], path: str) -> Response:
+        """各接口延迟、请求合并和计算缓存统计；format=prometheus 时返回埋点的Prometheus文本"""
+        if params.get('format') == 'prometheus':
+            body = instrumentation.to_prometheus().encode('utf-8')
+            return 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}, body
+        metrics = {
+            'endpoints': {name: stats.snapshot() for name, stats in sorted(self.latency.items())},
+            'coalescing': self.coalescer.stats(),
+            'calculation_cache': self.calculator.cache_info()
+        }
+        if instrumentation.is_enabled():
+            metrics['instrumentation'] = instrumentation.summary()
+        return _json_response(metrics)
+
+    async def camera_count(self, params: Dict[str, Any], path: str) -> Response:
+        """
+        摄像头数量与布局；include_positions=true 时返回摄像头位置列表
+        （摄像头数量不超过 MAX_POSITION_CAMERAS）
+        """
+        layout_params = parse_scenario(params)
+        include_positions = _flag(params.get('include_positions', False))
+        include_complexity = _flag(params.get('include_complexity', False))
+
+        def build() -> Response:
+            layout = self.calculator.calculate_layout(**layout_params)
+            if include_positions and layout['total_cameras'] > MAX_POSITION_CAMERAS:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"摄像头数量 {layout['total_cameras']} 超过返回位置列表的上限 {MAX_POSITION_CAMERAS}，"
+                    f"请设置 include_positions=false"
+                )
+            result = layout.to_dict(materialize_positions=include_positions)
+            if not include_positions:
+                del result['camera_positions']
+            if include_complexity:
+                result['installation'] = estimate_installation_complexity(
+                    result['total_cameras'], result['sandbox_dimensions']['area']
+                )
+            return _json_response(result)
+
+        async def compute():
+            # 位置列表的生成和JSON编码与摄像头数量成正比，不阻塞事件循环
+            return await self._in_executor(build)
+
+        return await self._coalesce(path, dict(layout_params, positions=include_positions,
+                                               complexity=include_complexity), compute)
+
+    async def optimal_height(self, params: Dict[str, Any], path: str) -> Response:
+        """最优安装高度分析"""
+        try:
+            arguments = {
+                'sandbox_width': float(params['sandbox_width']),
+                'sandbox_height': float(params['sandbox_height']),
+                'horizontal_fov': float(params['horizontal_fov']),
+                'vertical_fov': float(params['vertical_fov']),
+            }
+        except KeyError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"缺少参数: {e.args[0]}")
+        if params.get('max_cameras') not in (None, ''):
+            arguments['max_cameras'] = int(params['max_cameras'])
+        for name in ('camera_price', 'min_height', 'max_height', 'overlap_ratio'):
+            if params.get(name) not in (None, ''):
+                arguments[name] = float(params[name])
+        arguments['method'] = params.get('method', 'exact')
+        if arguments['method'] not in ('sweep', 'exact'):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"不支持的计算方法: {arguments['method']}")
+        if arguments['method'] == 'sweep':
+            # exact 方法只评估最高的几个跳变高度；sweep 的扫描次数随高度范围增长
+            steps = (arguments.get('max_height', 10.0) - arguments.get('min_height', 1.0)) / 0.5
+            if steps > MAX_SWEEP_HEIGHTS:
+                raise HTTPError(HTTPStatus.BAD_REQUEST,
+                                f"sweep 方法的高度范围过大（最多扫描 {MAX_SWEEP_HEIGHTS} 个高度）")
+
+        def build() -> Response:
+            result = self.calculator.calculate_optimal_height(**arguments)
+
+            def without_positions(configuration):
+                # 位置列表可由布局参数重新计算，响应中不重复返回
+                return {key: value for key, value in configuration.items() if key != 'camera_positions'}
+
+            result = dict(result, alternatives=[
+                dict(alternative, result=without_positions(alternative['result']))
+                for alternative in result['alternatives']
+            ])
+            if result['configuration'] is not None:
+                result['configuration'] = without_positions(result['configuration'])
+            return _json_response(result)
+
+        async def compute():
+            return await self._in_executor(build)
+
+        return await self._coalesce(path, arguments, compute)
+
+    async def coverage(self, params: Dict[str, Any], path: str) -> Response:
+        """
+        布局的精确覆盖面积与多重覆盖统计
+        （摄像头数量不超过 MAX_COVERAGE_CAMERAS，覆盖重数不超过 MAX_COVERAGE_K）
+        """
+        layout_params = parse_scenario(params)
+        k_values = params.get('k_values', [1, 2])
+        if isinstance(k_values, str):
+            k_values = k_values.split(',')
+        k_values = tuple(int(k) for k in k_values)
+        if any(k > MAX_COVERAGE_K for k in k_values):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"覆盖重数不能超过 {MAX_COVERAGE_K}")
+
+        async def compute():
+            layout = self.calculator.calculate_layout(**layout_params)
+            _check_camera_limit(layout, MAX_COVERAGE_CAMERAS, "精确覆盖计算")
+            result = await self._in_executor(self.calculator.calculate_exact_coverage, layout, k_values)
+            return _json_response(result)
+
+        return await self._coalesce(path, dict(layout_params, k_values=k_values), compute)
+
+    async def chart(self, params: Dict[str, Any], path: str) -> Response:
+        """
+        渲染布局图、3D视图或覆盖热力图，返回图片数据
+        （摄像头数量不超过 MAX_CHART_CAMERAS，dpi 不超过 MAX_CHART_DPI）
+        """
+        chart = path.rsplit('/', 1)[-1]
+        layout_params = parse_scenario(params)
+        options = {
+            'image_format': params.get('format', 'png'),
+            'preview': _flag(params.get('preview', False)),
+        }
+        if params.get('dpi') not in (None, ''):
+            options['dpi'] = int(params['dpi'])
+            if options['dpi'] > MAX_CHART_DPI:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"dpi 不能超过 {MAX_CHART_DPI}")
+
+        async def compute():
+            from camera_visualizer import IMAGE_FORMATS
+
+            layout = self.calculator.calculate_layout(**layout_params)
+            _check_camera_limit(layout, MAX_CHART_CAMERAS, "图表渲染")
+            # 首次创建可视化器需要导入matplotlib，不阻塞事件循环
+            visualizer = await self._in_executor(lambda: self.visualizer)
+            future = visualizer.render_charts(
+                layout, [chart], executor=self.render_executor, output='bytes', **options
+            )[chart]
+            image = await asyncio.wrap_future(future)
+            return 200, {'Content-Type': IMAGE_FORMATS[options['image_format']]}, image
+
+        return await self._coalesce(path, dict(layout_params, **options), compute)
+
+    # ---- HTTP/1.1 ----
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """处理一个连接上的请求（支持 keep-alive）"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write(writer, _json_response(
+                        {'error': "请求头过大"}, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE), False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._write(writer, _json_response(
+                        {'error': "无效的请求行"}, HTTPStatus.BAD_REQUEST), False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self._write(writer, _json_response(
+                        {'error': "无效的Content-Length"}, HTTPStatus.BAD_REQUEST), False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, _json_response(
+                        {'error': "请求体过大"}, HTTPStatus.REQUEST_ENTITY_TOO_LARGE), False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                response = await self.handle(method, target, body)
+                await self._write(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # 服务关闭时空闲的 keep-alive 连接被取消，正常结束连接处理
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, response: Response, keep_alive: bool) -> None:
+        status, headers, body = response
+        head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        """启动监听（port=0 时由系统分配端口）"""
+        return await asyncio.start_server(self._serve_connection, host, port,
+                                          limit=64 * 1024, reuse_address=True)
+
+    def close(self) -> None:
+        """关闭计算线程池和渲染执行器"""
+        self.compute_executor.shutdown(wait=False)
+        if self._visualizer is not None:
+            self._visualizer.close()
+
+
+async def serve(host: str, port: int, **options) -> None:
+    """运行服务直到被中断"""
+    service = CameraService(**options)
+    server = await service.start(host, port)
+    addresses = ', '.join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"摄像头计算服务已启动: http://{addresses}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="摄像头计算HTTP服务")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址（默认127.0.0.1）")
+    parser.add_argument('--port', type=int, default=8080, help="监听端口（默认8080）")
+    parser.add_argument('--render-executor', choices=('thread', 'process'), default='thread',
+                        help="图表渲染执行器（多核机器上 process 可并行渲染）")
+    parser.add_argument('--compute-workers', type=int, default=4, help="计算线程数（默认4）")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, render_executor=args.render_executor,
+                          compute_workers=args.compute_workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
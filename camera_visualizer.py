@@ -2,19 +2,166 @@
 摄像头布局可视化模块
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.patches as patches
-import matplotlib.font_manager as fm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, PolyCollection
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
-from typing import List, Dict, Any
+from collections.abc import Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 import io
 import base64
+import multiprocessing
 import os
 import platform
+import threading
+import time
 
+import instrumentation
+from camera_calculator import layout_positions
+from coverage_engine import compute_result_raster, footprint_vertices
+from font_resolver import apply_font, font_properties, resolve_font
+from image_cache import ImageCache, content_key
+from layout_scene import create_layout_scene, create_layout_spec
 
-def setup_chinese_font():
-    """设置中文字体，兼容不同操作系统"""
+
+# 摄像头数量超过该值时不再绘制逐个摄像头的文字标签
+LABEL_THRESHOLD = 50
+
+# 图片输出分辨率
+IMAGE_DPI = 150
+
+# 预览模式的最高分辨率
+PREVIEW_DPI = 60
+
+# 图表方法支持的返回格式
+OUTPUT_FORMATS = ('base64', 'bytes', 'memoryview')
+
+# 支持的图片编码格式及其MIME类型
+IMAGE_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp'
+}
+
+# 图表类型 -> 绘图方法（用于批量/并发渲染）
+CHART_METHODS = {
+    'layout': 'create_layout_plot',
+    '3d': 'create_3d_visualization',
+    'heatmap': 'create_coverage_heatmap'
+}
+
+ImageData = Union[str, bytes, memoryview, os.PathLike, BinaryIO]
+ImageDestination = Union[str, os.PathLike, BinaryIO]
+
+
+def export_options(image_format: str = 'png', dpi: Optional[int] = None,
+                   compress_level: Optional[int] = None, preview: bool = False) -> Dict[str, Any]:
+    """
+    解析图片导出选项
+    
+    Args:
+        image_format: 图片格式，'png'、'svg' 或 'webp'
+        dpi: 输出分辨率（默认 IMAGE_DPI）
+        compress_level: PNG压缩级别（0-9，越大文件越小、编码越慢；None为默认）
+        preview: 预览模式，分辨率不超过 PREVIEW_DPI 并使用最高PNG压缩
+        
+    Returns:
+        Dict: format、dpi、compress_level
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"不支持的图片格式: {image_format}")
+    dpi = IMAGE_DPI if dpi is None else int(dpi)
+    if dpi <= 0:
+        raise ValueError("dpi必须为正数")
+    if preview:
+        dpi = min(dpi, PREVIEW_DPI)
+        if compress_level is None and image_format == 'png':
+            compress_level = 9
+    if compress_level is not None:
+        if image_format != 'png':
+            raise ValueError("compress_level仅适用于PNG格式")
+        if not 0 <= compress_level <= 9:
+            raise ValueError("compress_level取值范围为0-9")
+    return {'format': image_format, 'dpi': dpi, 'compress_level': compress_level}
+
+
+def _savefig_kwargs(export: Dict[str, Any]) -> Dict[str, Any]:
+    """将导出选项转换为 savefig 参数"""
+    kwargs = {'format': export['format'], 'dpi': export['dpi'], 'bbox_inches': 'tight'}
+    if export['compress_level'] is not None:
+        kwargs['pil_kwargs'] = {'compress_level': export['compress_level']}
+    return kwargs
+
+
+def _deliver_image(img_buffer: io.BytesIO, output: str = 'base64',
+                   destination: Optional[ImageDestination] = None) -> ImageData:
+    """
+    按要求的格式返回缓冲区中的图片数据
+    
+    Args:
+        img_buffer: 包含图片数据的缓冲区
+        output: 'base64'、'bytes' 或 'memoryview'（内存视图直接引用缓冲区，不复制）
+        destination: 文件路径或二进制流，指定时写入后返回该对象
+        
+    Returns:
+        图片数据或 destination
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output}")
+    if destination is not None:
+        if hasattr(destination, 'write'):
+            destination.write(img_buffer.getbuffer())
+        else:
+            with open(destination, 'wb') as f:
+                f.write(img_buffer.getbuffer())
+        return destination
+    if output == 'memoryview':
+        return img_buffer.getbuffer()
+    if output == 'bytes':
+        return img_buffer.getvalue()
+    return base64.b64encode(img_buffer.getbuffer()).decode()
+
+
+def _new_figure(figsize: Tuple[float, float]) -> Figure:
+    """
+    创建不依赖 pyplot 全局状态的 Figure
+    
+    每个 Figure 拥有独立的 FigureCanvasAgg，不注册到 pyplot 的图形管理器，
+    因此无需 plt.close，不同线程可以同时绘制各自的 Figure。
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# 进程池工作进程内复用的可视化器（按图片缓存配置区分）
+_process_visualizers: Dict[Any, 'CameraVisualizer'] = {}
+
+
+def _render_chart_in_process(chart: str, calculation_result: Dict[str, Any],
+                             cache_config: Optional[Tuple[str, int]],
+                             options: Dict[str, Any]) -> ImageData:
+    """进程池工作函数：在工作进程中渲染一张图表"""
+    visualizer = _process_visualizers.get(cache_config)
+    if visualizer is None:
+        image_cache = ImageCache(*cache_config) if cache_config else None
+        visualizer = _process_visualizers[cache_config] = CameraVisualizer(image_cache=image_cache)
+    image = getattr(visualizer, CHART_METHODS[chart])(calculation_result, **options)
+    # 内存视图无法跨进程传递
+    return bytes(image) if isinstance(image, memoryview) else image
+
+
+def resolve_chinese_font() -> Optional[Dict[str, str]]:
+    """
+    解析当前系统可用的中文字体（每个进程只解析一次，结果缓存在磁盘上）
+    
+    Returns:
+        Dict: 字体名称 name 和字体文件路径 path；未找到时返回 None
+    """
     system = platform.system()
     
     # 尝试不同的中文字体
@@ -45,43 +192,48 @@ def setup_chinese_font():
             'DejaVu Sans'
         ]
     
-    # 获取系统可用字体
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
-    
-    # 查找可用的中文字体
-    selected_font = None
-    for font in font_candidates:
-        if font in available_fonts:
-            selected_font = font
-            break
-    
-    # 如果没找到合适的字体，使用备用方案
-    if selected_font is None:
-        # 尝试查找任何包含"中文"、"Chinese"、"CJK"的字体
-        for font_name in available_fonts:
-            if any(keyword in font_name.lower() for keyword in ['chinese', 'cjk', 'han', 'hei', 'song']):
-                selected_font = font_name
-                break
+    return resolve_font(font_candidates, keywords=('chinese', 'cjk', 'han', 'hei', 'song'))
+
+
+def setup_chinese_font():
+    """设置中文字体，兼容不同操作系统"""
+    font = resolve_chinese_font()
+    selected_font = font['name'] if font else None
     
     # 设置matplotlib字体参数
     if selected_font:
-        plt.rcParams['font.sans-serif'] = [selected_font, 'Arial', 'sans-serif']
-        plt.rcParams['font.family'] = 'sans-serif'
+        matplotlib.rcParams['font.sans-serif'] = [selected_font, 'Arial', 'sans-serif']
+        matplotlib.rcParams['font.family'] = 'sans-serif'
     else:
         # 如果完全找不到中文字体，使用英文并提供警告
-        plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'sans-serif']
+        matplotlib.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'sans-serif']
         print("警告: 未找到合适的中文字体，部分中文可能显示为方框")
     
-    plt.rcParams['axes.unicode_minus'] = False
+    matplotlib.rcParams['axes.unicode_minus'] = False
     return selected_font
 
 
 class CameraVisualizer:
     """摄像头布局可视化器"""
     
-    def __init__(self):
-        # 设置中文字体
+    def __init__(self, image_cache: Optional[ImageCache] = None):
+        """
+        Args:
+            image_cache: 图片磁盘缓存（None表示不缓存）
+        """
+        self.image_cache = image_cache
+        # 渲染信息按线程保存，并发渲染时各线程读取到的是自己的结果
+        self._render_local = threading.local()
+        self._last_render_info: Dict[str, Any] = {}
+        self._executors: Dict[str, Executor] = {}
+        self._executor_lock = threading.Lock()
+        # 增量渲染器（图表类型 -> 渲染器），见 get_renderer
+        self._renderers: Dict[str, Any] = {}
+        self._renderer_lock = threading.Lock()
+        
+        # 设置中文字体；图表文字直接使用解析到的字体文件，不按名称查找字体
         self.font_name = setup_chinese_font()
+        self.font_properties = font_properties(resolve_chinese_font())
         
         # 如果没有找到中文字体，显示警告但不中断运行
         if self.font_name is None:
@@ -89,6 +241,218 @@ class CameraVisualizer:
             warnings.warn("未检测到中文字体，图表将使用英文标签。如需中文显示，请安装中文字体包。", 
                          UserWarning, stacklevel=2)
         
+    @property
+    def last_render_info(self) -> Dict[str, Any]:
+        """当前线程最近一次渲染的信息（当前线程未渲染过时为任一线程最近一次的信息）"""
+        return getattr(self._render_local, 'info', self._last_render_info)
+    
+    def get_renderer(self, kind: str = 'layout'):
+        """
+        获取可复用的增量渲染器（同一可视化器实例内共享，同一渲染器的渲染串行执行）
+        
+        Args:
+            kind: 'layout' 布局图、'3d' 3D视图、'heatmap' 覆盖热力图或 'comparison' 备选方案对比图
+            
+        Returns:
+            LayoutRenderer、ThreeDRenderer、HeatmapRenderer 或 ComparisonRenderer
+        """
+        from layout_renderer import ComparisonRenderer, HeatmapRenderer, LayoutRenderer, ThreeDRenderer
+        
+        renderer_classes = {
+            'layout': LayoutRenderer,
+            '3d': ThreeDRenderer,
+            'heatmap': HeatmapRenderer,
+            'comparison': ComparisonRenderer
+        }
+        if kind not in renderer_classes:
+            raise ValueError(f"未知的渲染器类型: {kind}")
+        with self._renderer_lock:
+            if kind not in self._renderers:
+                self._renderers[kind] = renderer_classes[kind](
+                    labels=self._ensure_chinese_display(), font=self.font_properties
+                )
+            return self._renderers[kind]
+    
+    def _begin_render(self, chart: str, data: Any, export: Dict[str, Any],
+                      **options) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """
+        开始渲染一张图表并查询图片缓存
+        
+        Args:
+            chart: 图表类型
+            data: 绘图所用的计算结果
+            export: export_options 返回的导出选项
+            **options: 影响图片内容的绘图选项
+            
+        Returns:
+            Tuple: (渲染任务信息, 缓存命中时的图片数据或 None)
+        """
+        job = {'chart': chart, 'export': export, 'key': None, 'start': time.perf_counter()}
+        job['stage_start'] = job['start']
+        if self.image_cache is None:
+            return job, None
+        if isinstance(data, Mapping) and 'camera_positions' in data:
+            # 位置列表与数组视图按相同内容计算哈希
+            data = dict(data, camera_positions=layout_positions(data))
+        job['key'] = content_key(chart, data, font=self.font_name, **export, **options)
+        cached = self.image_cache.get(job['key'])
+        self._mark_stage(job, 'cache_lookup')
+        return job, cached
+    
+    @staticmethod
+    def _mark_stage(job: Dict[str, Any], stage: str) -> None:
+        """埋点：记录当前渲染任务自上一阶段结束以来的耗时（visualizer.<图表>.<阶段>）"""
+        if instrumentation.is_enabled():
+            now = time.perf_counter()
+            instrumentation.record_time(f"visualizer.{job['chart']}.{stage}", now - job['stage_start'])
+            job['stage_start'] = now
+    
+    def _finish_render(self, job: Dict[str, Any], img_buffer: io.BytesIO, cached: bool,
+                       output: str, destination: Optional[ImageDestination]) -> ImageData:
+        """记录渲染信息（编码大小、耗时、是否命中缓存）并按要求的格式返回图片"""
+        export = job['export']
+        info = {
+            'chart': job['chart'],
+            'format': export['format'],
+            'mime_type': IMAGE_FORMATS[export['format']],
+            'dpi': export['dpi'],
+            'size_bytes': img_buffer.getbuffer().nbytes,
+            'cached': cached,
+            'render_time': time.perf_counter() - job['start']
+        }
+        self._render_local.info = self._last_render_info = info
+        image = _deliver_image(img_buffer, output, destination)
+        if instrumentation.is_enabled():
+            self._mark_stage(job, 'encode')
+            instrumentation.count(f"visualizer.{job['chart']}.{'cache_hit' if cached else 'rendered'}")
+        return image
+    
+    def _encode_figure(self, fig, job: Dict[str, Any], output: str = 'base64',
+                       destination: Optional[ImageDestination] = None) -> ImageData:
+        """
+        调整布局并编码图表，启用缓存时写入图片缓存
+        
+        启用埋点时依次记录 build（构建图形）、tight_layout、savefig（含 draw 绘制
+        与图片压缩编码，其中 draw 单独计时）和 encode（写入图片缓存并转换为输出格式）各阶段耗时。
+        """
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output}")
+        self._mark_stage(job, 'build')
+        apply_font(fig, self.font_properties)
+        fig.tight_layout()
+        self._mark_stage(job, 'tight_layout')
+        if instrumentation.is_enabled():
+            # 实例属性覆盖 Figure.draw，画布在 savefig 中绘制时即被计时
+            fig.draw = instrumentation.timed(f"visualizer.{job['chart']}.draw")(fig.draw)
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, **_savefig_kwargs(job['export']))
+        self._mark_stage(job, 'savefig')
+        if job['key'] is not None:
+            self.image_cache.put(job['key'], img_buffer.getbuffer())
+        return self._finish_render(job, img_buffer, False, output, destination)
+    
+    def prewarm_cache(self, calculation_results: Iterable[Dict[str, Any]],
+                      charts: Iterable[str] = ('layout', '3d', 'heatmap')) -> Dict[str, Any]:
+        """
+        为一批场景预先渲染图表并写入图片缓存
+        
+        Args:
+            calculation_results: 计算结果列表
+            charts: 需要预渲染的图表类型（'layout'、'3d'、'heatmap'）
+            
+        Returns:
+            Dict: 图片缓存统计信息
+        """
+        if self.image_cache is None:
+            raise ValueError("未配置图片缓存")
+        for result in calculation_results:
+            # 同一场景的多张图表并发渲染
+            for future in self.render_charts(result, charts, output='bytes').values():
+                future.result()
+        return self.image_cache.stats()
+    
+    def render_charts(self, calculation_result: Dict[str, Any],
+                      charts: Iterable[str] = ('layout', '3d', 'heatmap'),
+                      executor: Union[str, Executor] = 'thread',
+                      chart_options: Optional[Dict[str, Dict[str, Any]]] = None,
+                      incremental: bool = False,
+                      **options) -> Dict[str, Future]:
+        """
+        并发渲染多张图表
+        
+        每张图表使用独立的 Figure/FigureCanvasAgg，可在线程中同时绘制，但Agg绘制
+        期间持有GIL，线程只能重叠PNG压缩等释放GIL的部分；多核机器上使用进程池
+        才能让各图表真正并行。进程池中每个工作进程各自创建可视化器并共用同一图片
+        缓存目录，此时 destination 只能是文件路径，memoryview 输出会转换为 bytes。
+        
+        Args:
+            calculation_result: 计算结果
+            charts: 图表类型（'layout'、'3d'、'heatmap'）
+            executor: 'thread'（默认，内部线程池）、'process'（内部进程池，
+                首次使用时启动工作进程）或自定义的 Executor
+            chart_options: 各图表类型的专用参数，如 {'heatmap': {'resolution': 200}}
+            incremental: 使用 get_renderer 的增量渲染器（复用 Figure，不经过图片缓存，
+                仅支持线程执行器和PNG输出）
+            **options: 所有图表共用的参数（output、image_format、dpi、preview 等）
+            
+        Returns:
+            Dict: 图表类型 -> Future，结果与对应 create_* 方法（或渲染器 render）的返回值相同
+        """
+        charts = list(dict.fromkeys(charts))
+        unknown = set(charts) - set(CHART_METHODS)
+        if unknown:
+            raise ValueError(f"未知的图表类型: {', '.join(sorted(unknown))}")
+        chart_options = chart_options or {}
+        
+        if isinstance(executor, str):
+            executor = self._get_executor(executor)
+        futures = {}
+        if incremental and isinstance(executor, ProcessPoolExecutor):
+            raise ValueError("增量渲染器不支持进程池")
+        for chart in charts:
+            kwargs = {**options, **chart_options.get(chart, {})}
+            if incremental:
+                futures[chart] = executor.submit(
+                    self.get_renderer(chart).render, calculation_result, **kwargs
+                )
+            elif isinstance(executor, ProcessPoolExecutor):
+                cache_config = None
+                if self.image_cache is not None:
+                    cache_config = (self.image_cache.directory, self.image_cache.max_bytes)
+                futures[chart] = executor.submit(
+                    _render_chart_in_process, chart, calculation_result, cache_config, kwargs
+                )
+            else:
+                futures[chart] = executor.submit(
+                    getattr(self, CHART_METHODS[chart]), calculation_result, **kwargs
+                )
+        return futures
+    
+    def _get_executor(self, kind: str) -> Executor:
+        """获取内部线程池或进程池（每种图表一个工作线程/进程）"""
+        with self._executor_lock:
+            if kind not in self._executors:
+                if kind == 'thread':
+                    self._executors[kind] = ThreadPoolExecutor(
+                        max_workers=len(CHART_METHODS), thread_name_prefix='chart-render'
+                    )
+                elif kind == 'process':
+                    # 调用方可能已有其他线程在运行，使用 spawn 避免 fork 复制线程持有的锁
+                    self._executors[kind] = ProcessPoolExecutor(
+                        max_workers=len(CHART_METHODS),
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                else:
+                    raise ValueError(f"不支持的执行器类型: {kind}")
+            return self._executors[kind]
+    
+    def close(self) -> None:
+        """关闭内部渲染线程池和进程池"""
+        with self._executor_lock:
+            for executor in self._executors.values():
+                executor.shutdown()
+            self._executors.clear()
+    
     def _ensure_chinese_display(self):
         """确保中文正常显示的辅助方法"""
         if self.font_name is None:
@@ -117,7 +481,14 @@ class CameraVisualizer:
     
     def create_layout_plot(self, calculation_result: Dict[str, Any], 
                           show_coverage: bool = True, 
-                          show_overlap: bool = True) -> str:
+                          show_overlap: bool = True,
+                          label_threshold: int = LABEL_THRESHOLD,
+                          output: str = 'base64',
+                          destination: Optional[ImageDestination] = None,
+                          image_format: str = 'png',
+                          dpi: Optional[int] = None,
+                          compress_level: Optional[int] = None,
+                          preview: bool = False) -> ImageData:
         """
         创建摄像头布局图
         
@@ -125,18 +496,37 @@ class CameraVisualizer:
             calculation_result: 计算结果
             show_coverage: 是否显示覆盖范围
             show_overlap: 是否显示重叠区域
+            label_threshold: 摄像头数量超过该值时不再绘制逐个摄像头的文字标签
+
+            output: 返回格式，'base64'（默认）、'bytes' 或 'memoryview'
+            destination: 直接写入的文件路径或二进制流（指定时返回该对象）
+            image_format: 图片格式，'png'、'svg' 或 'webp'
+            dpi: 输出分辨率（默认150）
+            compress_level: PNG压缩级别（0-9）
+            preview: 低分辨率预览模式
             
         Returns:
-            str: Base64编码的图片数据
+            Base64字符串、图片字节或内存视图（由 output 决定），
+            编码大小等渲染信息保存在 self.last_render_info 中
         """
-        fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+        job, cached = self._begin_render(
+            'layout', calculation_result,
+            export_options(image_format, dpi, compress_level, preview),
+            show_coverage=show_coverage,
+            show_overlap=show_overlap, label_threshold=label_threshold
+        )
+        if cached is not None:
+            return self._finish_render(job, io.BytesIO(cached), True, output, destination)
+        
+        fig = _new_figure((12, 8))
+        ax = fig.add_subplot(1, 1, 1)
         
         # 获取文本标签映射
         labels = self._ensure_chinese_display()
         
         sandbox_width = calculation_result['sandbox_dimensions']['width']
         sandbox_height = calculation_result['sandbox_dimensions']['height']
-        camera_positions = calculation_result['camera_positions']
+        camera_positions = layout_positions(calculation_result)
         coverage = calculation_result['coverage_per_camera']
         
         # 绘制沙盘边界
@@ -146,47 +536,43 @@ class CameraVisualizer:
         )
         ax.add_patch(sandbox_rect)
         
-        # 绘制摄像头覆盖范围
+        xy = camera_positions[:, :2]
+        show_labels = len(xy) <= label_threshold
+        
+        # 绘制摄像头覆盖范围（所有矩形合并为一个集合）
         if show_coverage:
-            for i, pos in enumerate(camera_positions):
-                # 计算覆盖范围的矩形
-                coverage_x = pos['x'] - coverage['width'] / 2
-                coverage_y = pos['y'] - coverage['height'] / 2
-                
-                # 绘制覆盖范围
-                coverage_rect = patches.Rectangle(
-                    (coverage_x, coverage_y), 
-                    coverage['width'], coverage['height'],
-                    linewidth=1, edgecolor='blue', facecolor='blue', 
-                    alpha=0.2, linestyle='--'
-                )
-                ax.add_patch(coverage_rect)
-                
-                # 添加覆盖范围标签
-                coverage_label = labels.get('覆盖范围', '覆盖范围')
-                ax.text(pos['x'], pos['y'] - coverage['height']/3, 
-                       f'{coverage_label}\n{coverage["width"]:.1f}×{coverage["height"]:.1f}m',
-                       ha='center', va='center', fontsize=8, 
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
-        
-        # 绘制摄像头位置
-        for i, pos in enumerate(camera_positions):
-            # 摄像头图标
-            camera_circle = patches.Circle(
-                (pos['x'], pos['y']), 0.3, 
-                facecolor='red', edgecolor='darkred', linewidth=2
-            )
-            ax.add_patch(camera_circle)
+            ax.add_collection(PolyCollection(
+                footprint_vertices(xy, coverage['width'], coverage['height']),
+                linewidths=1, edgecolors='blue', facecolors='blue',
+                alpha=0.2, linestyles='--'
+            ))
             
-            # 摄像头编号
-            ax.text(pos['x'], pos['y'], str(i+1), 
-                   ha='center', va='center', fontweight='bold', 
-                   color='white', fontsize=10)
-            
-            # 摄像头坐标标签
-            ax.text(pos['x'], pos['y'] + 0.6, 
-                   f'({pos["x"]:.1f}, {pos["y"]:.1f})',
-                   ha='center', va='bottom', fontsize=8)
+            # 添加覆盖范围标签
+            if show_labels:
+                coverage_label = labels.get('覆盖范围', '覆盖范围')
+                for x, y in xy.tolist():
+                    ax.text(x, y - coverage['height']/3, 
+                           f'{coverage_label}\n{coverage["width"]:.1f}×{coverage["height"]:.1f}m',
+                           ha='center', va='center', fontsize=8, 
+                           bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
+        
+        # 绘制摄像头位置（半径0.3米的圆形图标）
+        ax.add_collection(EllipseCollection(
+            0.6, 0.6, 0, units='xy', offsets=xy, offset_transform=ax.transData,
+            facecolors='red', edgecolors='darkred', linewidths=2
+        ))
+        
+        if show_labels:
+            for i, (x, y) in enumerate(xy.tolist()):
+                # 摄像头编号
+                ax.text(x, y, str(i+1), 
+                       ha='center', va='center', fontweight='bold', 
+                       color='white', fontsize=10)
+                
+                # 摄像头坐标标签
+                ax.text(x, y + 0.6, 
+                       f'({x:.1f}, {y:.1f})',
+                       ha='center', va='bottom', fontsize=8)
         
         # 设置坐标轴
         ax.set_xlim(-1, sandbox_width + 1)
@@ -242,28 +628,53 @@ class CameraVisualizer:
                verticalalignment='top', fontsize=10,
                bbox=dict(boxstyle="round,pad=0.5", facecolor='lightyellow', alpha=0.8))
         
-        plt.tight_layout()
-        
-        # 转换为base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        return img_base64
+        return self._encode_figure(fig, job, output, destination)
+    
+    def create_layout_scene(self, calculation_result: Dict[str, Any],
+                            decimals: int = 3) -> Dict[str, Any]:
+        """生成浏览器端渲染用的紧凑场景数据，见 layout_scene.create_layout_scene"""
+        return create_layout_scene(calculation_result, decimals)
     
-    def create_3d_visualization(self, calculation_result: Dict[str, Any]) -> str:
+    def create_layout_spec(self, calculation_result: Dict[str, Any],
+                           show_coverage: bool = True, width: int = 600) -> Dict[str, Any]:
+        """创建浏览器端渲染的Vega-Lite布局图规格，见 layout_scene.create_layout_spec"""
+        return create_layout_spec(calculation_result, show_coverage, width)
+    
+    def create_3d_visualization(self, calculation_result: Dict[str, Any],
+                                label_threshold: int = LABEL_THRESHOLD,
+                                output: str = 'base64',
+                                destination: Optional[ImageDestination] = None,
+                                image_format: str = 'png',
+                                dpi: Optional[int] = None,
+                                compress_level: Optional[int] = None,
+                                preview: bool = False) -> ImageData:
         """
         创建3D可视化图
         
         Args:
             calculation_result: 计算结果
+            label_threshold: 摄像头数量超过该值时不再绘制逐个摄像头的文字标签
+
+            output: 返回格式，'base64'（默认）、'bytes' 或 'memoryview'
+            destination: 直接写入的文件路径或二进制流（指定时返回该对象）
+            image_format: 图片格式，'png'、'svg' 或 'webp'
+            dpi: 输出分辨率（默认150）
+            compress_level: PNG压缩级别（0-9）
+            preview: 低分辨率预览模式
             
         Returns:
-            str: Base64编码的图片数据
+            Base64字符串、图片字节或内存视图（由 output 决定），
+            编码大小等渲染信息保存在 self.last_render_info 中
         """
-        fig = plt.figure(figsize=(12, 8))
+        job, cached = self._begin_render(
+            '3d', calculation_result,
+            export_options(image_format, dpi, compress_level, preview),
+            label_threshold=label_threshold
+        )
+        if cached is not None:
+            return self._finish_render(job, io.BytesIO(cached), True, output, destination)
+        
+        fig = _new_figure((12, 8))
         ax = fig.add_subplot(111, projection='3d')
         
         # 获取文本标签映射
@@ -271,7 +682,7 @@ class CameraVisualizer:
         
         sandbox_width = calculation_result['sandbox_dimensions']['width']
         sandbox_height = calculation_result['sandbox_dimensions']['height']
-        camera_positions = calculation_result['camera_positions']
+        camera_positions = layout_positions(calculation_result)
         coverage = calculation_result['coverage_per_camera']
         camera_height = coverage['camera_height']
         
@@ -280,44 +691,45 @@ class CameraVisualizer:
         zz = np.zeros_like(xx)
         ax.plot_surface(xx, yy, zz, alpha=0.3, color='lightgray')
         
-        # 绘制摄像头位置和覆盖锥形
-        for i, pos in enumerate(camera_positions):
-            # 摄像头位置
-            ax.scatter(pos['x'], pos['y'], pos['z'], 
-                      color='red', s=100, alpha=1.0)
-            
-            # 摄像头到地面的连线
-            ax.plot([pos['x'], pos['x']], [pos['y'], pos['y']], 
-                   [pos['z'], 0], 'r--', alpha=0.5)
-            
-            # 覆盖范围的四个角点
-            corners_x = [
-                pos['x'] - coverage['width']/2,
-                pos['x'] + coverage['width']/2,
-                pos['x'] + coverage['width']/2,
-                pos['x'] - coverage['width']/2,
-                pos['x'] - coverage['width']/2
-            ]
-            corners_y = [
-                pos['y'] - coverage['height']/2,
-                pos['y'] - coverage['height']/2,
-                pos['y'] + coverage['height']/2,
-                pos['y'] + coverage['height']/2,
-                pos['y'] - coverage['height']/2
-            ]
-            
-            # 绘制覆盖范围边界
-            ax.plot(corners_x, corners_y, [0]*5, 'b-', alpha=0.7)
-            
-            # 绘制从摄像头到覆盖区域角点的连线（视锥）
-            for cx, cy in zip(corners_x[:-1], corners_y[:-1]):
-                ax.plot([pos['x'], cx], [pos['y'], cy], [pos['z'], 0], 
-                       'b-', alpha=0.3, linewidth=0.5)
-            
-            # 摄像头标签
+        # 绘制摄像头位置和覆盖锥形（同类线段合并为一个集合）
+        xyz = camera_positions
+        ax.scatter(xyz[:, 0], xyz[:, 1], xyz[:, 2], color='red', s=100, alpha=1.0)
+        
+        # 覆盖范围的四个角点（地面）
+        corners = footprint_vertices(xyz[:, :2], coverage['width'], coverage['height'])
+        ground_corners = np.concatenate([corners, np.zeros(corners.shape[:2] + (1,))], axis=2)
+        apexes = np.repeat(xyz[:, None, :], 4, axis=1)
+        ground_points = np.concatenate([xyz[:, :2], np.zeros((len(xyz), 1))], axis=1)
+        
+        # 摄像头到地面的连线
+        ax.add_collection3d(Line3DCollection(
+            np.stack([xyz, ground_points], axis=1), colors='r', linestyles='--', alpha=0.5
+        ))
+        
+        # 绘制覆盖范围边界
+        ax.add_collection3d(Line3DCollection(
+            np.concatenate([ground_corners, ground_corners[:, :1]], axis=1),
+            colors='b', alpha=0.7
+        ))
+        
+        # 绘制从摄像头到覆盖区域角点的连线（视锥）
+        ax.add_collection3d(Line3DCollection(
+            np.stack([apexes, ground_corners], axis=2).reshape(-1, 2, 3),
+            colors='b', alpha=0.3, linewidths=0.5
+        ))
+        
+        # 集合不参与自动缩放，按覆盖范围设置坐标轴
+        if len(xyz):
+            ax.set_xlim(min(0, corners[..., 0].min()), max(sandbox_width, corners[..., 0].max()))
+            ax.set_ylim(min(0, corners[..., 1].min()), max(sandbox_height, corners[..., 1].max()))
+            ax.set_zlim(0, xyz[:, 2].max())
+        
+        # 摄像头标签
+        if len(xyz) <= label_threshold:
             camera_label = labels.get('摄像头', '摄像头')
-            ax.text(pos['x'], pos['y'], pos['z'] + 0.3, f'{camera_label}{i+1}', 
-                   fontsize=8, ha='center')
+            for i, (x, y, z) in enumerate(xyz.tolist()):
+                ax.text(x, y, z + 0.3, f'{camera_label}{i+1}', 
+                       fontsize=8, ha='center')
         
         # 设置坐标轴
         width_label = labels.get('宽度', '宽度')
@@ -335,74 +747,76 @@ class CameraVisualizer:
         # 设置视角
         ax.view_init(elev=20, azim=45)
         
-        plt.tight_layout()
-        
-        # 转换为base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        return img_base64
+        return self._encode_figure(fig, job, output, destination)
     
     def create_coverage_heatmap(self, calculation_result: Dict[str, Any], 
-                               resolution: int = 100) -> str:
+                               resolution: int = 100,
+                               label_threshold: int = LABEL_THRESHOLD,
+                               output: str = 'base64',
+                               destination: Optional[ImageDestination] = None,
+                               image_format: str = 'png',
+                               dpi: Optional[int] = None,
+                               compress_level: Optional[int] = None,
+                               preview: bool = False) -> ImageData:
         """
         创建覆盖热力图
         
         Args:
             calculation_result: 计算结果
             resolution: 热力图分辨率
+            label_threshold: 摄像头数量超过该值时不再绘制逐个摄像头的编号标签
+
+            output: 返回格式，'base64'（默认）、'bytes' 或 'memoryview'
+            destination: 直接写入的文件路径或二进制流（指定时返回该对象）
+            image_format: 图片格式，'png'、'svg' 或 'webp'
+            dpi: 输出分辨率（默认150）
+            compress_level: PNG压缩级别（0-9）
+            preview: 低分辨率预览模式
             
         Returns:
-            str: Base64编码的图片数据
+            Base64字符串、图片字节或内存视图（由 output 决定），
+            编码大小等渲染信息保存在 self.last_render_info 中
         """
-        fig, ax = plt.subplots(1, 1, figsize=(10, 8))
+        job, cached = self._begin_render(
+            'heatmap', calculation_result,
+            export_options(image_format, dpi, compress_level, preview),
+            resolution=resolution, label_threshold=label_threshold
+        )
+        if cached is not None:
+            return self._finish_render(job, io.BytesIO(cached), True, output, destination)
+        
+        fig = _new_figure((10, 8))
+        ax = fig.add_subplot(1, 1, 1)
         
         # 获取文本标签映射
         labels = self._ensure_chinese_display()
         
         sandbox_width = calculation_result['sandbox_dimensions']['width']
         sandbox_height = calculation_result['sandbox_dimensions']['height']
-        camera_positions = calculation_result['camera_positions']
-        coverage = calculation_result['coverage_per_camera']
+        camera_positions = layout_positions(calculation_result)
         
-        # 创建网格
-        x = np.linspace(0, sandbox_width, resolution)
-        y = np.linspace(0, sandbox_height, resolution)
-        X, Y = np.meshgrid(x, y)
-        
-        # 计算每个点的覆盖情况
-        coverage_count = np.zeros_like(X)
-        
-        for pos in camera_positions:
-            # 计算每个摄像头的覆盖范围
-            x_min = pos['x'] - coverage['width'] / 2
-            x_max = pos['x'] + coverage['width'] / 2
-            y_min = pos['y'] - coverage['height'] / 2
-            y_max = pos['y'] + coverage['height'] / 2
-            
-            # 在覆盖范围内的点+1
-            mask = (X >= x_min) & (X <= x_max) & (Y >= y_min) & (Y <= y_max)
-            coverage_count += mask.astype(int)
+        # 计算每个采样点的覆盖摄像头数量
+        coverage_count = compute_result_raster(calculation_result, resolution)
         
         # 绘制热力图
         im = ax.imshow(coverage_count, extent=[0, sandbox_width, 0, sandbox_height], 
                       origin='lower', cmap='YlOrRd', alpha=0.8)
         
         # 添加颜色条
-        cbar = plt.colorbar(im, ax=ax)
+        cbar = fig.colorbar(im, ax=ax)
         coverage_count_label = labels.get('覆盖摄像头数量', '覆盖摄像头数量')
         cbar.set_label(coverage_count_label, fontsize=12)
         
-        # 绘制摄像头位置
-        for i, pos in enumerate(camera_positions):
-            ax.scatter(pos['x'], pos['y'], color='blue', s=100, 
-                      marker='s', edgecolor='white', linewidth=2)
-            ax.text(pos['x'], pos['y'] + 0.3, f'{i+1}', 
-                   ha='center', va='bottom', fontweight='bold', 
-                   color='white', fontsize=10)
+        # 绘制摄像头位置（所有摄像头合并为一个散点集合）
+        ax.scatter(camera_positions[:, 0], camera_positions[:, 1], color='blue', s=100,
+                   marker='s', edgecolor='white', linewidth=2)
+        
+        # 摄像头编号
+        if len(camera_positions) <= label_threshold:
+            for i, (x, y) in enumerate(camera_positions[:, :2].tolist()):
+                ax.text(x, y + 0.3, f'{i+1}', 
+                       ha='center', va='bottom', fontweight='bold', 
+                       color='white', fontsize=10)
         
         # 设置坐标轴
         width_label = labels.get('宽度', '宽度') + ' (米)'
@@ -414,31 +828,45 @@ class CameraVisualizer:
         ax.set_title(heatmap_title, fontsize=14, fontweight='bold')
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        
-        # 转换为base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        return img_base64
+        return self._encode_figure(fig, job, output, destination)
     
-    def create_comparison_chart(self, height_analysis: List[Dict[str, Any]]) -> str:
+    def create_comparison_chart(self, height_analysis: List[Dict[str, Any]],
+                                output: str = 'base64',
+                                destination: Optional[ImageDestination] = None,
+                                image_format: str = 'png',
+                                dpi: Optional[int] = None,
+                                compress_level: Optional[int] = None,
+                                preview: bool = False) -> ImageData:
         """
         创建不同高度对比图表
         
         Args:
-            height_analysis: 不同高度的分析结果
+            height_analysis: 不同高度的分析结果（为空时不绘图，返回空的图片数据）
+
+            output: 返回格式，'base64'（默认）、'bytes' 或 'memoryview'
+            destination: 直接写入的文件路径或二进制流（指定时返回该对象）
+            image_format: 图片格式，'png'、'svg' 或 'webp'
+            dpi: 输出分辨率（默认150）
+            compress_level: PNG压缩级别（0-9）
+            preview: 低分辨率预览模式
             
         Returns:
-            str: Base64编码的图片数据
+            Base64字符串、图片字节或内存视图（由 output 决定），
+            编码大小等渲染信息保存在 self.last_render_info 中
         """
         if not height_analysis:
-            return ""
+            # 没有可对比的方案时返回空图片数据，格式与 output、destination 一致
+            return _deliver_image(io.BytesIO(), output, destination)
+        
+        job, cached = self._begin_render(
+            'comparison', height_analysis,
+            export_options(image_format, dpi, compress_level, preview)
+        )
+        if cached is not None:
+            return self._finish_render(job, io.BytesIO(cached), True, output, destination)
         
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+        fig = _new_figure((15, 10))
+        ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
         
         # 获取文本标签映射
         labels = self._ensure_chinese_display()
@@ -484,38 +912,32 @@ class CameraVisualizer:
         ax4.set_title(f'{cost_efficiency_label.split(" ")[0]} vs {install_height_label.split(" ")[0]}')
         ax4.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        
-        # 转换为base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
-        
-        return img_base64
+        return self._encode_figure(fig, job, output, destination)
 
 
-def save_plot_as_file(img_base64: str, filename: str) -> str:
+def save_plot_as_file(img_data: Union[str, bytes, memoryview], filename: str) -> str:
     """
-    将base64图片保存为文件
+    将图片保存为文件
     
     Args:
-        img_base64: base64编码的图片
+        img_data: base64编码的图片，或PNG字节/内存视图（直接写入，无需解码）
         filename: 保存的文件名
         
     Returns:
         str: 保存的文件路径
     """
-    import os
-    
     # 创建输出目录
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
     
-    # 保存文件
+    # 保存文件（内容未变化时不重复写入，便于缓存命中的报告导出）
     filepath = os.path.join(output_dir, filename)
+    data = base64.b64decode(img_data) if isinstance(img_data, str) else img_data
+    if os.path.exists(filepath) and os.path.getsize(filepath) == len(data):
+        with open(filepath, 'rb') as f:
+            if f.read() == data:
+                return filepath
     with open(filepath, 'wb') as f:
-        f.write(base64.b64decode(img_base64))
+        f.write(data)
     
-    return filepath
\ No newline at end of file
+    return filepath
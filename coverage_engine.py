@@ -0,0 +1,336 @@
+"""
+覆盖范围精确计算模块
+对摄像头覆盖矩形（裁剪到沙盘范围内）求并集面积和 k 重覆盖面积，重叠部分只计一次；
+并提供与绘图无关的覆盖计数栅格化
+"""
+
+import numpy as np
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+
+# 坐标压缩网格的最大单元数，超过后改用扫描线算法
+_MAX_GRID_CELLS = 4_000_000
+
+# 栅格化时每个分块的默认行数
+_DEFAULT_TILE_ROWS = 1024
+
+
+def positions_to_array(camera_positions) -> np.ndarray:
+    """
+    将摄像头位置转换为 (n, 2) 的 x/y 坐标数组
+
+    Args:
+        camera_positions: {'x','y','z'} 字典列表，或形状为 (n, 2)/(n, 3) 的数组（含位置列表视图）
+
+    Returns:
+        np.ndarray: 形状为 (n, 2) 的 float64 数组
+    """
+    if hasattr(camera_positions, '__array__'):
+        camera_positions = np.asarray(camera_positions)
+    if isinstance(camera_positions, np.ndarray):
+        return np.asarray(camera_positions[:, :2], dtype=np.float64).reshape(-1, 2)
+    return np.array([(pos['x'], pos['y']) for pos in camera_positions],
+                    dtype=np.float64).reshape(-1, 2)
+
+
+def footprint_rectangles(camera_positions, footprint_width: float, footprint_height: float,
+                         sandbox_width: float, sandbox_height: float) -> np.ndarray:
+    """
+    计算裁剪到沙盘范围内的摄像头覆盖矩形
+
+    Returns:
+        np.ndarray: 形状为 (n, 4) 的 [x0, y0, x1, y1] 数组，已去除空矩形
+    """
+    xy = positions_to_array(camera_positions)
+    rects = np.empty((xy.shape[0], 4), dtype=np.float64)
+    rects[:, 0] = np.clip(xy[:, 0] - footprint_width / 2, 0, sandbox_width)
+    rects[:, 1] = np.clip(xy[:, 1] - footprint_height / 2, 0, sandbox_height)
+    rects[:, 2] = np.clip(xy[:, 0] + footprint_width / 2, 0, sandbox_width)
+    rects[:, 3] = np.clip(xy[:, 1] + footprint_height / 2, 0, sandbox_height)
+    keep = (rects[:, 2] > rects[:, 0]) & (rects[:, 3] > rects[:, 1])
+    return rects[keep]
+
+
+def footprint_vertices(camera_positions, width: float, height: float) -> np.ndarray:
+    """
+    计算摄像头覆盖矩形的四个角点（不裁剪，用于绘图集合）
+
+    Args:
+        camera_positions: 摄像头位置（数组或字典列表）
+        width: 覆盖宽度（米）
+        height: 覆盖高度（米）
+
+    Returns:
+        np.ndarray: 形状为 (n, 4, 2) 的角点坐标（逆时针）
+    """
+    offsets = np.array([
+        [-width / 2, -height / 2],
+        [width / 2, -height / 2],
+        [width / 2, height / 2],
+        [-width / 2, height / 2]
+    ])
+    xy = positions_to_array(camera_positions)
+    return xy[:, None, :] + offsets[None, :, :]
+
+
+def union_areas(rects: np.ndarray, max_k: int = 1) -> np.ndarray:
+    """
+    计算矩形集合被至少 k 个矩形覆盖的面积（k = 1..max_k）
+
+    坐标压缩后的网格较小时（规则布局通常如此）使用二维差分数组一次求出；
+    否则使用带计数的线段树扫描线，复杂度 O(n log n · max_k)。
+
+    Args:
+        rects: 形状为 (n, 4) 的 [x0, y0, x1, y1] 数组
+        max_k: 需要计算的最大覆盖重数
+
+    Returns:
+        np.ndarray: 长度为 max_k 的数组，第 k-1 项为至少被 k 个矩形覆盖的面积
+    """
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    if rects.shape[0] == 0 or max_k < 1:
+        return np.zeros(max(max_k, 0))
+
+    xs = np.unique(rects[:, [0, 2]])
+    ys = np.unique(rects[:, [1, 3]])
+    if xs.size * ys.size <= _MAX_GRID_CELLS:
+        return _grid_union_areas(rects, xs, ys, max_k)
+    return _sweep_union_areas(rects, ys, max_k)
+
+
+def _grid_union_areas(rects: np.ndarray, xs: np.ndarray, ys: np.ndarray, max_k: int) -> np.ndarray:
+    """坐标压缩网格 + 二维差分数组"""
+    ix0 = np.searchsorted(xs, rects[:, 0])
+    ix1 = np.searchsorted(xs, rects[:, 2])
+    iy0 = np.searchsorted(ys, rects[:, 1])
+    iy1 = np.searchsorted(ys, rects[:, 3])
+
+    diff = np.zeros((ys.size, xs.size), dtype=np.int32)
+    np.add.at(diff, (iy0, ix0), 1)
+    np.add.at(diff, (iy0, ix1), -1)
+    np.add.at(diff, (iy1, ix0), -1)
+    np.add.at(diff, (iy1, ix1), 1)
+    counts = diff.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+
+    cell_areas = np.outer(np.diff(ys), np.diff(xs))
+    return np.array([cell_areas[counts >= k].sum() for k in range(1, max_k + 1)])
+
+
+def _sweep_union_areas(rects: np.ndarray, ys: np.ndarray, max_k: int) -> np.ndarray:
+    """沿 x 方向扫描，线段树维护当前 y 方向上至少被 k 个区间覆盖的长度"""
+    segments = ys.size - 1
+    ys_list = ys.tolist()
+    node_count = 4 * segments
+    counts = [0] * node_count
+    # cover[j][node]：仅考虑该子树内的区间时，至少被 j 个区间覆盖的长度
+    cover = [None] + [[0.0] * node_count for _ in range(max_k)]
+
+    def pull(node: int, lo: int, hi: int) -> None:
+        c = counts[node]
+        length = ys_list[hi] - ys_list[lo]
+        leaf = hi - lo == 1
+        left, right = 2 * node + 1, 2 * node + 2
+        for j in range(1, max_k + 1):
+            if c >= j:
+                cover[j][node] = length
+            elif leaf:
+                cover[j][node] = 0.0
+            else:
+                cover[j][node] = cover[j - c][left] + cover[j - c][right]
+
+    def update(node: int, lo: int, hi: int, a: int, b: int, delta: int) -> None:
+        if a <= lo and hi <= b:
+            counts[node] += delta
+        else:
+            mid = (lo + hi) // 2
+            if a < mid:
+                update(2 * node + 1, lo, mid, a, b, delta)
+            if b > mid:
+                update(2 * node + 2, mid, hi, a, b, delta)
+        pull(node, lo, hi)
+
+    iy0 = np.searchsorted(ys, rects[:, 1]).tolist()
+    iy1 = np.searchsorted(ys, rects[:, 3]).tolist()
+    events = sorted(
+        [(x0, 1, a, b) for x0, a, b in zip(rects[:, 0].tolist(), iy0, iy1)] +
+        [(x1, -1, a, b) for x1, a, b in zip(rects[:, 2].tolist(), iy0, iy1)]
+    )
+
+    areas = [0.0] * max_k
+    previous_x = events[0][0]
+    for x, delta, a, b in events:
+        if x != previous_x:
+            width = x - previous_x
+            for j in range(1, max_k + 1):
+                areas[j - 1] += cover[j][0] * width
+            previous_x = x
+        update(0, 0, segments, a, b, delta)
+
+    return np.array(areas)
+
+
+def compute_exact_coverage(camera_positions, footprint_width: float, footprint_height: float,
+                           sandbox_width: float, sandbox_height: float,
+                           k_values: Sequence[int] = (1, 2)) -> Dict[str, Any]:
+    """
+    精确计算沙盘的覆盖情况
+
+    Args:
+        camera_positions: 摄像头位置（字典列表或 (n, 2)/(n, 3) 数组）
+        footprint_width: 单个摄像头覆盖宽度（米）
+        footprint_height: 单个摄像头覆盖高度（米）
+        sandbox_width: 沙盘宽度（米）
+        sandbox_height: 沙盘高度（米）
+        k_values: 需要统计的覆盖重数
+
+    Returns:
+        Dict: 覆盖面积、未覆盖面积、覆盖率以及各重数的覆盖面积
+    """
+    k_values = sorted(set(int(k) for k in k_values) | {1})
+    rects = footprint_rectangles(camera_positions, footprint_width, footprint_height,
+                                 sandbox_width, sandbox_height)
+    areas = union_areas(rects, max(k_values))
+
+    sandbox_area = sandbox_width * sandbox_height
+    covered_area = min(float(areas[0]), sandbox_area)
+
+    return {
+        'covered_area': covered_area,
+        'uncovered_area': max(sandbox_area - covered_area, 0.0),
+        'coverage_ratio': covered_area / sandbox_area if sandbox_area > 0 else 0,
+        'sandbox_area': sandbox_area,
+        'k_coverage': {k: float(areas[k - 1]) for k in k_values}
+    }
+
+
+def compute_result_coverage(calculation_result: Dict[str, Any],
+                            k_values: Iterable[int] = (1, 2)) -> Dict[str, Any]:
+    """
+    对 calculate_camera_count 的结果精确计算覆盖情况
+
+    Args:
+        calculation_result: 计算结果
+        k_values: 需要统计的覆盖重数
+
+    Returns:
+        Dict: 同 compute_exact_coverage
+    """
+    coverage = calculation_result['coverage_per_camera']
+    sandbox = calculation_result['sandbox_dimensions']
+    return compute_exact_coverage(
+        calculation_result['camera_positions'], coverage['width'], coverage['height'],
+        sandbox['width'], sandbox['height'], tuple(k_values)
+    )
+
+
+def _raster_axes(sandbox_width: float, sandbox_height: float,
+                 resolution: Union[int, Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """栅格采样点坐标，resolution 为整数或 (列数, 行数)"""
+    if isinstance(resolution, int):
+        columns = rows = resolution
+    else:
+        columns, rows = resolution
+    return np.linspace(0, sandbox_width, columns), np.linspace(0, sandbox_height, rows)
+
+
+def _select_raster_dtype(camera_count: int, dtype) -> np.dtype:
+    """未指定类型时选择能容纳最大覆盖数的最小整数类型"""
+    if dtype is not None:
+        return np.dtype(dtype)
+    for candidate in (np.uint8, np.int16, np.int32):
+        if camera_count <= np.iinfo(candidate).max:
+            return np.dtype(candidate)
+    return np.dtype(np.int64)
+
+
+def iter_coverage_raster_tiles(camera_positions, footprint_width: float, footprint_height: float,
+                               sandbox_width: float, sandbox_height: float,
+                               resolution: Union[int, Tuple[int, int]] = 100,
+                               dtype=None, tile_rows: int = _DEFAULT_TILE_ROWS
+                               ) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    按行分块生成覆盖计数栅格
+
+    每个摄像头的覆盖范围是轴对齐矩形，在二维差分数组上只需修改四个角点，
+    再做两次前缀和即可得到计数，单块复杂度 O(摄像头数 + 像素数)。
+    采样规则与覆盖热力图一致：采样点落在覆盖矩形内（含边界）即计数。
+
+    Args:
+        camera_positions: 摄像头位置（字典列表或 (n, 2)/(n, 3) 数组）
+        footprint_width: 单个摄像头覆盖宽度（米）
+        footprint_height: 单个摄像头覆盖高度（米）
+        sandbox_width: 沙盘宽度（米）
+        sandbox_height: 沙盘高度（米）
+        resolution: 栅格分辨率，整数或 (列数, 行数)
+        dtype: 输出整数类型（默认按摄像头数量自动选择 uint8/int16/int32）
+        tile_rows: 每块的行数
+
+    Yields:
+        Tuple: (起始行号, 形状为 (块行数, 列数) 的计数数组)，第0行对应 y=0
+    """
+    xs, ys = _raster_axes(sandbox_width, sandbox_height, resolution)
+    xy = positions_to_array(camera_positions)
+    dtype = _select_raster_dtype(xy.shape[0], dtype)
+    check_overflow = np.issubdtype(dtype, np.integer) and xy.shape[0] > np.iinfo(dtype).max
+
+    # 每个摄像头覆盖的采样点下标范围 [start, stop)
+    col_start = np.searchsorted(xs, xy[:, 0] - footprint_width / 2, side='left')
+    col_stop = np.searchsorted(xs, xy[:, 0] + footprint_width / 2, side='right')
+    row_start = np.searchsorted(ys, xy[:, 1] - footprint_height / 2, side='left')
+    row_stop = np.searchsorted(ys, xy[:, 1] + footprint_height / 2, side='right')
+    has_columns = col_stop > col_start
+
+    for tile_start in range(0, ys.size, tile_rows):
+        tile_stop = min(tile_start + tile_rows, ys.size)
+        r0 = np.clip(row_start, tile_start, tile_stop) - tile_start
+        r1 = np.clip(row_stop, tile_start, tile_stop) - tile_start
+        active = has_columns & (r1 > r0)
+        c0, c1 = col_start[active], col_stop[active]
+        r0, r1 = r0[active], r1[active]
+
+        diff = np.zeros((tile_stop - tile_start + 1, xs.size + 1), dtype=np.int32)
+        np.add.at(diff, (r0, c0), 1)
+        np.add.at(diff, (r0, c1), -1)
+        np.add.at(diff, (r1, c0), -1)
+        np.add.at(diff, (r1, c1), 1)
+        counts = diff.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
+
+        if check_overflow and counts.size and counts.max() > np.iinfo(dtype).max:
+            raise OverflowError(f"覆盖计数超出 {dtype} 的取值范围")
+        yield tile_start, counts.astype(dtype, copy=False)
+
+
+def coverage_raster(camera_positions, footprint_width: float, footprint_height: float,
+                    sandbox_width: float, sandbox_height: float,
+                    resolution: Union[int, Tuple[int, int]] = 100,
+                    dtype=None, tile_rows: Optional[int] = None) -> np.ndarray:
+    """
+    生成覆盖计数栅格（每个采样点被多少个摄像头覆盖）
+
+    Args:
+        同 iter_coverage_raster_tiles；tile_rows 为 None 时使用默认分块行数
+
+    Returns:
+        np.ndarray: 形状为 (行数, 列数) 的计数数组，第0行对应 y=0
+    """
+    xs, ys = _raster_axes(sandbox_width, sandbox_height, resolution)
+    dtype = _select_raster_dtype(len(camera_positions), dtype)
+    raster = np.empty((ys.size, xs.size), dtype=dtype)
+    for row, tile in iter_coverage_raster_tiles(
+            camera_positions, footprint_width, footprint_height,
+            sandbox_width, sandbox_height, resolution, dtype,
+            tile_rows or _DEFAULT_TILE_ROWS):
+        raster[row:row + tile.shape[0]] = tile
+    return raster
+
+
+def compute_result_raster(calculation_result: Dict[str, Any],
+                          resolution: Union[int, Tuple[int, int]] = 100,
+                          dtype=None, tile_rows: Optional[int] = None) -> np.ndarray:
+    """对 calculate_camera_count 的结果生成覆盖计数栅格"""
+    coverage = calculation_result['coverage_per_camera']
+    sandbox = calculation_result['sandbox_dimensions']
+    return coverage_raster(
+        calculation_result['camera_positions'], coverage['width'], coverage['height'],
+        sandbox['width'], sandbox['height'], resolution, dtype, tile_rows
+    )
@@ -50,7 +50,8 @@ def cost_analysis_demo():
         # 计算所需摄像头数量和成本
         result = calculator.calculate_camera_count(
             sandbox_width, sandbox_height, camera_height,
-            horizontal_fov, vertical_fov, camera_price=model["price"]
+            horizontal_fov, vertical_fov, camera_price=model["price"],
+            lazy_positions=True  # 只需要数量和成本，无需生成摄像头位置
         )
         
         # 计算安装复杂度
@@ -175,7 +176,7 @@ def compare_scenarios():
     for scenario in scenarios:
         result = calculator.calculate_camera_count(
             scenario["width"], scenario["height"], scenario["camera_height"],
-            60.0, 45.0, camera_price=camera_price
+            60.0, 45.0, camera_price=camera_price, lazy_positions=True
         )
         
         complexity = estimate_installation_complexity(
@@ -112,23 +112,23 @@ def advanced_example():
         
         try:
             # 布局图
-            layout_img = visualizer.create_layout_plot(opt_config, show_coverage=True)
+            layout_img = visualizer.create_layout_plot(opt_config, show_coverage=True, output='bytes')
             layout_file = save_plot_as_file(layout_img, "camera_layout.png")
             print(f"布局图已保存: {layout_file}")
             
             # 3D视图
-            viz_3d_img = visualizer.create_3d_visualization(opt_config)
+            viz_3d_img = visualizer.create_3d_visualization(opt_config, output='bytes')
             viz_3d_file = save_plot_as_file(viz_3d_img, "camera_3d_view.png")
             print(f"3D视图已保存: {viz_3d_file}")
             
             # 覆盖热力图
-            heatmap_img = visualizer.create_coverage_heatmap(opt_config)
+            heatmap_img = visualizer.create_coverage_heatmap(opt_config, output='bytes')
             heatmap_file = save_plot_as_file(heatmap_img, "coverage_heatmap.png")
             print(f"覆盖热力图已保存: {heatmap_file}")
             
             # 对比分析图
             if optimal_result['alternatives']:
-                comparison_img = visualizer.create_comparison_chart(optimal_result['alternatives'])
+                comparison_img = visualizer.create_comparison_chart(optimal_result['alternatives'], output='bytes')
                 comparison_file = save_plot_as_file(comparison_img, "height_comparison.png")
                 print(f"高度对比图已保存: {comparison_file}")
             
@@ -0,0 +1,218 @@
+"""
+中文字体解析模块
+每个进程只解析一次字体；解析结果（字体名称和文件路径）按字体目录修改时间持久化到磁盘，
+后续启动直接使用该字体文件，无需遍历全部已安装字体。
+matplotlib.font_manager 在导入时即加载完整的字体列表（来自matplotlib自身的字体列表缓存），
+本模块在函数内部按需导入它，导入本模块本身不会加载字体列表
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
+
+import matplotlib
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.font_manager import FontProperties
+
+
+# 模糊匹配时使用的中文字体关键字
+DEFAULT_KEYWORDS = ('chinese', 'cjk', 'han', 'hei', 'song')
+
+# 缓存文件格式版本
+CACHE_VERSION = 1
+
+_resolved: Dict[Any, Optional[Dict[str, str]]] = {}
+_lock = threading.Lock()
+
+
+def default_cache_path() -> str:
+    """字体解析结果的缓存文件（位于matplotlib缓存目录）"""
+    return os.path.join(matplotlib.get_cachedir(), 'camera_calculator_font.json')
+
+
+def font_directories() -> List[str]:
+    """matplotlib 会搜索的字体目录（含 matplotlib 自带字体目录）"""
+    import matplotlib.font_manager as fm
+
+    directories = [os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf')]
+    if sys.platform == 'win32':
+        directories.append(fm.win32FontDirectory())
+        directories.extend(fm.MSUserFontDirectories)
+    else:
+        directories.extend(fm.X11FontDirectories)
+        if sys.platform == 'darwin':
+            directories.extend(fm.OSXFontDirectories)
+    return directories
+
+
+def font_directory_fingerprint(directories: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    字体目录及其各级子目录的修改时间，安装或删除字体后会发生变化
+
+    与 matplotlib 查找系统字体时一样递归遍历子目录（不跟随符号链接），
+    字体安装在多层子目录中（如 /usr/share/fonts/truetype/<厂商>/）时同样能使缓存失效。
+
+    Returns:
+        Dict: 目录路径 -> 修改时间
+    """
+    fingerprint = {}
+    for directory in directories if directories is not None else font_directories():
+        for root, _, _ in os.walk(directory):
+            try:
+                fingerprint[root] = os.stat(root).st_mtime
+            except OSError:
+                continue
+    return fingerprint
+
+
+def _scan_fonts(candidates: Sequence[str], keywords: Sequence[str],
+                prefer: Sequence[str]) -> Optional[Dict[str, str]]:
+    """在 matplotlib 字体列表中查找字体：先按候选顺序精确匹配，再按关键字模糊匹配"""
+    import matplotlib.font_manager as fm
+
+    # 同名字体优先使用常规字形的文件
+    paths, regular = {}, set()
+    for font in fm.fontManager.ttflist:
+        is_regular = font.style == 'normal' and font.weight in (400, 'normal', 'regular')
+        if font.name not in paths or (is_regular and font.name not in regular):
+            paths[font.name] = font.fname
+            if is_regular:
+                regular.add(font.name)
+
+    for name in candidates:
+        if name in paths:
+            return {'name': name, 'path': paths[name]}
+
+    fallback = None
+    for name, path in paths.items():
+        lower = name.lower()
+        if any(keyword in lower for keyword in keywords):
+            if not prefer or any(token in lower for token in prefer):
+                return {'name': name, 'path': path}
+            if fallback is None:
+                fallback = {'name': name, 'path': path}
+    return fallback
+
+
+def _load_cache(cache_path: str, key: str, fingerprint: Dict[str, float]) -> Any:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return False
+    entry = cache.get('entries', {}).get(key)
+    if cache.get('version') != CACHE_VERSION or cache.get('fingerprint') != fingerprint or entry is None:
+        return False
+    font = entry.get('font')
+    if font is not None and not os.path.isfile(font['path']):
+        return False
+    return font
+
+
+def _save_cache(cache_path: str, key: str, fingerprint: Dict[str, float],
+                font: Optional[Dict[str, str]]) -> None:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') != CACHE_VERSION or cache.get('fingerprint') != fingerprint:
+            raise ValueError
+    except (OSError, ValueError):
+        cache = {'version': CACHE_VERSION, 'fingerprint': fingerprint, 'entries': {}}
+    cache['entries'][key] = {'font': font}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # 缓存目录不可写时仅使用进程内结果
+        pass
+
+
+def _register_font(path: str) -> None:
+    """将字体文件注册到 matplotlib（已在字体列表中时不重复添加）"""
+    import matplotlib.font_manager as fm
+
+    if not any(font.fname == path for font in fm.fontManager.ttflist):
+        fm.fontManager.addfont(path)
+
+
+def resolve_font(candidates: Sequence[str], keywords: Sequence[str] = DEFAULT_KEYWORDS,
+                 prefer: Sequence[str] = (), cache_path: Optional[str] = None,
+                 use_cache: bool = True) -> Optional[Dict[str, str]]:
+    """
+    解析可用的中文字体（进程内只解析一次，结果持久化到磁盘缓存）
+
+    Args:
+        candidates: 按优先级排列的字体名称
+        keywords: 候选字体都不可用时，用于模糊匹配字体名称的关键字
+        prefer: 模糊匹配时优先选择名称中包含这些词的字体（如 'sans'）
+        cache_path: 磁盘缓存文件路径（默认位于matplotlib缓存目录）
+        use_cache: 是否读写磁盘缓存
+
+    Returns:
+        Dict: 字体名称 name 和字体文件路径 path；未找到时返回 None
+    """
+    key = json.dumps([platform.system(), list(candidates), list(keywords), list(prefer)],
+                     ensure_ascii=False)
+    with _lock:
+        if key in _resolved:
+            return _resolved[key]
+
+        cache_path = cache_path or default_cache_path()
+        fingerprint = font_directory_fingerprint() if use_cache else None
+        font = _load_cache(cache_path, key, fingerprint) if use_cache else False
+        if font is False:
+            font = _scan_fonts(candidates, keywords, prefer)
+            if use_cache:
+                _save_cache(cache_path, key, fingerprint, font)
+        elif font is not None:
+            # 只注册缓存中的这一个字体文件
+            _register_font(font['path'])
+
+        _resolved[key] = font
+        return font
+
+
+def font_properties(font: Optional[Dict[str, str]]) -> Optional["FontProperties"]:
+    """按字体文件创建 FontProperties，可直接传给 text/set_title 等的 fontproperties 参数"""
+    if font is None:
+        return None
+    import matplotlib.font_manager as fm
+
+    return fm.FontProperties(fname=font['path'])
+
+
+def apply_font(figure: "Figure", properties: Optional["FontProperties"]) -> None:
+    """
+    让图中所有文字（标题、坐标轴标签、刻度、图例、注释）使用 properties 对应的字体文件
+
+    保留各文字原有的字号和字重，绘制时直接加载该字体文件，不按字体名称在字体列表中查找
+
+    Args:
+        figure: matplotlib Figure
+        properties: font_properties 的结果（None 时不做修改）
+    """
+    if properties is None:
+        return
+    from matplotlib.text import Text
+
+    path = properties.get_file()
+    for text in figure.findobj(Text):
+        text.get_fontproperties().set_file(path)
+
+
+def clear_font_cache(cache_path: Optional[str] = None) -> None:
+    """清除进程内和磁盘上的字体解析结果"""
+    with _lock:
+        _resolved.clear()
+        try:
+            os.remove(cache_path or default_cache_path())
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,257 @@
+"""
+图表图片磁盘缓存模块
+按计算结果与渲染选项的稳定哈希存放渲染后的图片，容量超限时按最近使用时间淘汰；
+条目大小和使用时间记录在缓存目录内的 SQLite 索引中，多个进程可共用同一缓存目录
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+# 缓存键格式版本，图表绘制逻辑变化时递增使旧条目失效
+KEY_VERSION = 1
+
+
+def _canonical(value: Any) -> Any:
+    """将计算结果转换为可稳定序列化的结构，数组以内容哈希代替"""
+    if hasattr(value, '__array__') and not isinstance(value, np.ndarray):
+        value = np.asarray(value)
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest = hashlib.sha256(array.tobytes()).hexdigest()
+        return {'__array__': [str(array.dtype), list(array.shape), digest]}
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float):
+        return repr(value)
+    return value
+
+
+def content_key(chart: str, data: Any, **options: Any) -> str:
+    """
+    计算图表的内容哈希键
+
+    Args:
+        chart: 图表类型
+        data: 计算结果（字典、LayoutResult 或结果列表）
+        **options: 渲染选项（dpi、分辨率、字体等）
+
+    Returns:
+        str: 64位十六进制哈希
+    """
+    payload = {
+        'version': KEY_VERSION,
+        'chart': chart,
+        'data': _canonical(data),
+        'options': _canonical(options)
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ImageCache:
+    """
+    按内容寻址的图片磁盘缓存，总大小超过上限时淘汰最久未使用的文件
+
+    条目的大小和最近使用时间保存在目录内的索引数据库中，总大小和条目数由触发器
+    维护，写入和淘汰只查询索引；仅在启动时扫描一次目录，同步索引之外的文件。
+    写入文件、更新索引和淘汰在同一个写事务中完成，因此共用目录的多个进程
+    （如渲染进程池）合计也不会超过容量上限。
+    """
+
+    INDEX_NAME = 'index.sqlite3'
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY, size INTEGER NOT NULL, used REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+        CREATE TABLE IF NOT EXISTS totals (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            entries INTEGER NOT NULL, bytes INTEGER NOT NULL);
+        INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size; END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size; END;
+        CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+            UPDATE totals SET bytes = bytes + NEW.size - OLD.size; END;
+    """
+
+    _UPSERT = ("INSERT INTO entries VALUES (?, ?, ?) ON CONFLICT (key) "
+               "DO UPDATE SET size = excluded.size, used = excluded.used")
+
+    def __init__(self, directory: str = os.path.join('output', 'image_cache'),
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # 同一实例的访问由 _lock 串行化，可在渲染线程中共用连接
+        self._db = sqlite3.connect(os.path.join(directory, self.INDEX_NAME), timeout=60,
+                                   isolation_level=None, check_same_thread=False)
+        # WAL 模式下读写互不阻塞，索引可由启动时的目录扫描重建，无需每次提交都同步到磁盘
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(self._SCHEMA)
+        self._sync_index()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """写事务，与其他进程的写入和淘汰互斥"""
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        """读取目录中的缓存文件：键 -> (修改时间, 大小)"""
+        entries = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.img'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # 扫描期间被其他进程淘汰
+                        continue
+                    entries[entry.name[:-4]] = (stat.st_mtime, stat.st_size)
+        return entries
+
+    def _sync_index(self) -> None:
+        """启动时按目录中的实际文件修正索引（文件被外部删除或由旧版本写入），再按容量淘汰"""
+        with self._lock, self._transaction() as db:
+            files = self._scan()
+            indexed = dict(db.execute('SELECT key, size FROM entries'))
+            db.executemany('DELETE FROM entries WHERE key = ?',
+                           [(key,) for key in indexed.keys() - files.keys()])
+            db.executemany(self._UPSERT, [
+                (key, size, mtime) for key, (mtime, size) in files.items()
+                if indexed.get(key) != size
+            ])
+            self._evict(db)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.img")
+
+    def _totals(self) -> Tuple[int, int]:
+        """(条目数, 总字节数)"""
+        return self._db.execute('SELECT entries, bytes FROM totals').fetchone()
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._totals()[1]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """读取缓存的图片数据（包括其他进程写入的文件），未命中返回 None"""
+        with self._lock:
+            try:
+                with open(self.path(key), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                # 未缓存，或文件已被删除（索引中的残留条目一并删除）
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE entries SET used = ? WHERE key = ?', (time.time(), key))
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> str:
+        """原子写入缓存文件并按需淘汰旧条目"""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock, self._transaction() as db:
+            os.replace(tmp_path, path)
+            db.execute(self._UPSERT, (key, len(data), time.time()))
+            self._evict(db)
+        return path
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        entries, total = self._totals()
+        while total > self.max_bytes and entries > 1:
+            oldest, size = db.execute(
+                'SELECT key, size FROM entries ORDER BY used LIMIT 1'
+            ).fetchone()
+            db.execute('DELETE FROM entries WHERE key = ?', (oldest,))
+            try:
+                os.remove(self.path(oldest))
+            except FileNotFoundError:
+                pass
+            entries -= 1
+            total -= size
+            self.evictions += 1
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """命中则返回缓存数据，否则渲染并写入缓存"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._totals()[0]
+
+    def clear(self) -> None:
+        """删除目录中的全部缓存文件并重置统计"""
+        with self._lock, self._transaction() as db:
+            db.execute('DELETE FROM entries')
+            for key in self._scan():
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def close(self) -> None:
+        """关闭索引数据库连接"""
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息（命中统计为本进程的，条目数和大小为整个目录的）"""
+        with self._lock:
+            entries, total = self._totals()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'size_bytes': total,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,211 @@
+"""
+性能埋点模块
+为计算、绘图和报告生成的热点路径提供计时器与计数器（上下文管理器/装饰器），
+可导出为JSON摘要或Prometheus文本格式；默认关闭，关闭时每次调用只多一次标志判断
+
+启用方式:
+    环境变量 CAMERA_INSTRUMENTATION=1，或在代码中调用 instrumentation.enable()
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class _State:
+    enabled = os.environ.get('CAMERA_INSTRUMENTATION', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+_state = _State()
+_lock = threading.Lock()
+_timers: Dict[str, list] = {}  # name -> [count, total, min, max]
+_counters: Dict[str, float] = {}
+
+
+def enable() -> None:
+    """开启埋点"""
+    _state.enabled = True
+
+
+def disable() -> None:
+    """关闭埋点（已收集的数据保留）"""
+    _state.enabled = False
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+def reset() -> None:
+    """清空已收集的计时和计数"""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def record_time(name: str, seconds: float) -> None:
+    """记录一次耗时（秒）；埋点关闭时忽略"""
+    if not _state.enabled:
+        return
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            _timers[name] = [1, seconds, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds < stats[2]:
+                stats[2] = seconds
+            if seconds > stats[3]:
+                stats[3] = seconds
+
+
+def count(name: str, value: float = 1) -> None:
+    """累加计数器；埋点关闭时忽略"""
+    if not _state.enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str):
+    """
+    计时上下文管理器
+
+    Args:
+        name: 计时项名称（如 'visualizer.layout.draw'）
+
+    Returns:
+        上下文管理器；埋点关闭时返回共享的空操作对象
+    """
+    if not _state.enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    函数计时装饰器
+
+    Args:
+        name: 计时项名称（默认为 模块名.函数限定名）
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_time(label, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def summary() -> Dict[str, Any]:
+    """
+    获取埋点摘要
+
+    Returns:
+        Dict: timers（次数、总耗时、平均/最小/最大耗时，毫秒）和 counters
+    """
+    with _lock:
+        timers = {
+            name: {
+                'count': stats[0],
+                'total_ms': stats[1] * 1000,
+                'mean_ms': stats[1] / stats[0] * 1000,
+                'min_ms': stats[2] * 1000,
+                'max_ms': stats[3] * 1000
+            }
+            for name, stats in sorted(_timers.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {'enabled': _state.enabled, 'timers': timers, 'counters': counters}
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    """导出JSON格式的埋点摘要"""
+    import json
+
+    return json.dumps(summary(), ensure_ascii=False, indent=indent)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(prefix: str = 'camera_calculator') -> str:
+    """
+    导出Prometheus文本格式
+
+    计时项导出为 summary（{prefix}_duration_seconds 的 _sum/_count）和
+    最大耗时 gauge，计数器导出为 {prefix}_events_total；名称放在 name 标签中。
+
+    Args:
+        prefix: 指标名前缀
+    """
+    import re
+
+    prefix = re.sub(r'[^a-zA-Z0-9_]', '_', prefix)
+    with _lock:
+        timers = sorted(_timers.items())
+        counters = sorted(_counters.items())
+
+    lines = [
+        f"# HELP {prefix}_duration_seconds Time spent in instrumented code paths.",
+        f"# TYPE {prefix}_duration_seconds summary",
+    ]
+    for name, stats in timers:
+        label = f'{{name="{_escape_label(name)}"}}'
+        lines.append(f"{prefix}_duration_seconds_sum{label} {stats[1]!r}")
+        lines.append(f"{prefix}_duration_seconds_count{label} {stats[0]}")
+    lines.extend([
+        f"# HELP {prefix}_duration_max_seconds Slowest observed call per code path.",
+        f"# TYPE {prefix}_duration_max_seconds gauge",
+    ])
+    for name, stats in timers:
+        lines.append(f'{prefix}_duration_max_seconds{{name="{_escape_label(name)}"}} {stats[3]!r}')
+    lines.extend([
+        f"# HELP {prefix}_events_total Instrumentation counters.",
+        f"# TYPE {prefix}_events_total counter",
+    ])
+    for name, value in counters:
+        lines.append(f'{prefix}_events_total{{name="{_escape_label(name)}"}} {value!r}')
+    return '\n'.join(lines) + '\n'
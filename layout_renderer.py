@@ -0,0 +1,461 @@
+"""
+增量渲染模块
+复用 Figure 对象和静态图元（沙盘边界、坐标轴、图例、网格），每次只更新变化的图元，并记录各阶段耗时；
+覆盖布局图、3D视图、覆盖热力图和备选方案对比图，通过 CameraVisualizer.get_renderer 获取
+"""
+
+import base64
+import io
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import matplotlib.image as mpimg
+import matplotlib.patches as patches
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from camera_calculator import layout_positions
+from camera_visualizer import IMAGE_DPI, LABEL_THRESHOLD, OUTPUT_FORMATS, export_options
+from coverage_engine import compute_result_raster, footprint_vertices
+from font_resolver import apply_font
+
+
+class _FigureRenderer:
+    """持有一个 Figure/FigureCanvasAgg 的渲染器基类（不使用 pyplot 全局状态，同一渲染器的渲染串行执行）"""
+
+    # 影响静态图元的图表选项，取值变化时重建静态部分，其余选项只影响更新
+    STATIC_OPTIONS: Tuple[str, ...] = ()
+
+    def __init__(self, figsize, dpi: int = IMAGE_DPI, labels: Optional[Dict[str, str]] = None,
+                 font: Optional[FontProperties] = None):
+        self.dpi = dpi
+        self.labels = labels or {}
+        self.font = font
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.timings: Dict[str, float] = {}
+        self._static_key = None
+        self._lock = threading.Lock()
+
+    def _label(self, text: str) -> str:
+        return self.labels.get(text, text)
+
+    @contextmanager
+    def _stage(self, name: str):
+        """记录一个渲染阶段的耗时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def _finish(self, output: str, export: Dict[str, Any]) -> Union[str, bytes, memoryview]:
+        """按导出选项绘制画布并编码为PNG"""
+        with self._stage('draw'):
+            # 本次更新新建的文字同样使用指定的字体文件
+            apply_font(self.figure, self.font)
+            self.figure.set_dpi(export['dpi'])
+            self.canvas.draw()
+        with self._stage('encode'):
+            img_buffer = io.BytesIO()
+            pil_kwargs = None
+            if export['compress_level'] is not None:
+                pil_kwargs = {'compress_level': export['compress_level']}
+            mpimg.imsave(img_buffer, np.asarray(self.canvas.buffer_rgba()),
+                         format='png', dpi=export['dpi'], pil_kwargs=pil_kwargs)
+            if output == 'memoryview':
+                image = img_buffer.getbuffer()
+            elif output == 'bytes':
+                image = img_buffer.getvalue()
+            else:
+                image = base64.b64encode(img_buffer.getbuffer()).decode()
+        self.timings['total'] = sum(
+            value for name, value in self.timings.items() if name != 'total'
+        )
+        return image
+
+    def render(self, data: Any, output: str = 'base64', dpi: Optional[int] = None,
+               compress_level: Optional[int] = None, preview: bool = False,
+               **options) -> Union[str, bytes, memoryview]:
+        """
+        渲染计算结果
+
+        静态部分仅在沙盘尺寸或选项变化时重建，其余图元原地更新；
+        各阶段耗时保存在 self.timings 中。
+
+        Args:
+            data: 计算结果（对比图为不同高度的分析结果列表）
+            output: 返回格式，'base64'（默认）、'bytes' 或 'memoryview'
+            dpi: 输出分辨率（默认为创建渲染器时的分辨率）
+            compress_level: PNG压缩级别（0-9）
+            preview: 低分辨率预览模式
+            **options: 图表选项，与对应 create_* 方法相同（布局图 show_coverage、
+                label_threshold，3D视图 label_threshold，热力图 resolution、label_threshold）
+
+        Returns:
+            PNG图片的Base64字符串、字节或内存视图（由 output 决定）
+        """
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output}")
+        export = export_options('png', self.dpi if dpi is None else dpi, compress_level, preview)
+        with self._lock:
+            self.timings = {}
+            static_key = self._static_signature(data, options)
+            with self._stage('static'):
+                if static_key != self._static_key:
+                    self.figure.clear()
+                    self._build_static_for(data, **options)
+                    self._static_key = static_key
+            with self._stage('update'):
+                self._update(data, **options)
+            return self._finish(output, export)
+
+    def _static_signature(self, data: Any, options: Dict[str, Any]) -> Any:
+        """决定静态图元是否需要重建的键"""
+        sandbox = data['sandbox_dimensions']
+        return (sandbox['width'], sandbox['height'], self._static_options(options))
+
+    def _static_options(self, options: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        return tuple((name, options[name]) for name in self.STATIC_OPTIONS if name in options)
+
+    def _build_static_for(self, data: Any, **options) -> None:
+        sandbox = data['sandbox_dimensions']
+        self._build_static(sandbox['width'], sandbox['height'], **options)
+
+    def _build_static(self, sandbox_width: float, sandbox_height: float, **options) -> None:
+        raise NotImplementedError
+
+    def _update(self, calculation_result: Dict[str, Any], **options) -> None:
+        raise NotImplementedError
+
+
+class LayoutRenderer(_FigureRenderer):
+    """摄像头布局图的增量渲染器"""
+
+    STATIC_OPTIONS = ('show_coverage',)
+
+    def __init__(self, figsize=(12, 8), dpi: int = IMAGE_DPI,
+                 labels: Optional[Dict[str, str]] = None, label_threshold: int = LABEL_THRESHOLD,
+                 font: Optional[FontProperties] = None):
+        """
+        Args:
+            figsize: 图像尺寸（英寸）
+            dpi: 输出分辨率
+            labels: 文本标签映射（无中文字体时使用英文标签）
+            font: 图表文字使用的字体（font_resolver.font_properties 的结果）
+            label_threshold: 摄像头数量不超过该值时显示编号、坐标和覆盖范围标签
+        """
+        super().__init__(figsize, dpi, labels, font)
+        self.label_threshold = label_threshold
+
+    def _build_static(self, sandbox_width: float, sandbox_height: float,
+                      show_coverage: bool = True, **options) -> None:
+        ax = self.ax = self.figure.add_subplot(1, 1, 1)
+
+        # 绘制沙盘边界
+        ax.add_patch(patches.Rectangle(
+            (0, 0), sandbox_width, sandbox_height,
+            linewidth=3, edgecolor='black', facecolor='lightgray', alpha=0.3
+        ))
+
+        # 设置坐标轴
+        ax.set_xlim(-1, sandbox_width + 1)
+        ax.set_ylim(-1, sandbox_height + 1)
+        ax.set_xlabel(self._label('宽度') + ' (米)', fontsize=12)
+        ax.set_ylabel(self._label('高度') + ' (米)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.set_aspect('equal')
+
+        # 添加图例
+        legend_elements = [
+            patches.Patch(color='lightgray', alpha=0.3, label=self._label('沙盘区域')),
+            patches.Circle((0, 0), 0.1, facecolor='red', label=self._label('摄像头位置')),
+        ]
+        if show_coverage:
+            legend_elements.append(
+                patches.Patch(color='blue', alpha=0.2, label=self._label('覆盖范围'))
+            )
+        ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1))
+
+        # 动态图元，后续渲染只更新内容
+        self.footprints = PolyCollection(
+            [], linewidths=1, edgecolors='blue', facecolors='blue', alpha=0.2, linestyles='--'
+        )
+        self.footprints.set_visible(show_coverage)
+        ax.add_collection(self.footprints)
+        self.markers = EllipseCollection(
+            0.6, 0.6, 0, units='xy', offsets=np.empty((0, 2)), offset_transform=ax.transData,
+            facecolors='red', edgecolors='darkred', linewidths=2, zorder=3
+        )
+        ax.add_collection(self.markers)
+        self.stats_text = ax.text(
+            0.02, 0.98, '', transform=ax.transAxes, verticalalignment='top', fontsize=10,
+            bbox=dict(boxstyle="round,pad=0.5", facecolor='lightyellow', alpha=0.8)
+        )
+        self.camera_texts = []
+
+        # 标题为两行文本，先占位以便 tight_layout 预留空间
+        ax.set_title('\n', fontsize=14, fontweight='bold')
+        self.figure.tight_layout()
+
+    def _update(self, calculation_result: Dict[str, Any], show_coverage: bool = True,
+                show_overlap: bool = True, label_threshold: Optional[int] = None) -> None:
+        ax = self.ax
+        sandbox_width = calculation_result['sandbox_dimensions']['width']
+        sandbox_height = calculation_result['sandbox_dimensions']['height']
+        coverage = calculation_result['coverage_per_camera']
+        positions = layout_positions(calculation_result)
+        xy = positions[:, :2]
+
+        if show_coverage:
+            self.footprints.set_verts(
+                footprint_vertices(xy, coverage['width'], coverage['height'])
+            )
+        self.markers.set_offsets(xy)
+
+        # 覆盖范围、编号和坐标标签与 create_layout_plot 一致，摄像头较多时不绘制
+        for text in self.camera_texts:
+            text.remove()
+        self.camera_texts = []
+        if label_threshold is None:
+            label_threshold = self.label_threshold
+        if len(xy) <= label_threshold:
+            if show_coverage:
+                coverage_label = (f"{self._label('覆盖范围')}\n"
+                                  f"{coverage['width']:.1f}×{coverage['height']:.1f}m")
+                self.camera_texts += [
+                    ax.text(x, y - coverage['height'] / 3, coverage_label, ha='center',
+                            va='center', fontsize=8,
+                            bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
+                    for x, y in xy.tolist()
+                ]
+            for i, (x, y) in enumerate(xy.tolist()):
+                self.camera_texts.append(ax.text(x, y, str(i + 1), ha='center', va='center',
+                                                 fontweight='bold', color='white', fontsize=10,
+                                                 zorder=4))
+                self.camera_texts.append(ax.text(x, y + 0.6, f'({x:.1f}, {y:.1f})',
+                                                 ha='center', va='bottom', fontsize=8))
+
+        title_text = (
+            f'{self._label("沙盘摄像头布局图")}\n'
+            f'{self._label("沙盘尺寸")}: {sandbox_width}×{sandbox_height}m, '
+            f'{self._label("摄像头数量")}: {len(xy)}个'
+        )
+        ax.set_title(title_text, fontsize=14, fontweight='bold')
+
+        self.stats_text.set_text(
+            f"{self._label('安装高度')}: {coverage['camera_height']}m\n"
+            f"{self._label('视场角')}: {coverage['horizontal_fov']}°×{coverage['vertical_fov']}°\n"
+            f"{self._label('单摄像头覆盖')}: {coverage['width']:.1f}×{coverage['height']:.1f}m\n"
+            f"{self._label('覆盖率')}: {calculation_result['coverage_ratio']*100:.1f}%\n"
+            f"{self._label('总成本')}: ¥{calculation_result['total_cost']:,}"
+        )
+
+
+class HeatmapRenderer(_FigureRenderer):
+    """覆盖热力图的增量渲染器"""
+
+    def __init__(self, figsize=(10, 8), dpi: int = IMAGE_DPI,
+                 labels: Optional[Dict[str, str]] = None, resolution: int = 100,
+                 label_threshold: int = LABEL_THRESHOLD, font: Optional[FontProperties] = None):
+        """
+        Args:
+            figsize: 图像尺寸（英寸）
+            dpi: 输出分辨率
+            labels: 文本标签映射（无中文字体时使用英文标签）
+            font: 图表文字使用的字体（font_resolver.font_properties 的结果）
+            resolution: 热力图分辨率
+            label_threshold: 摄像头数量不超过该值时显示编号
+        """
+        super().__init__(figsize, dpi, labels, font)
+        self.resolution = resolution
+        self.label_threshold = label_threshold
+
+    def _build_static(self, sandbox_width: float, sandbox_height: float, **options) -> None:
+        ax = self.ax = self.figure.add_subplot(1, 1, 1)
+
+        self.image = ax.imshow(
+            [[0]], extent=[0, sandbox_width, 0, sandbox_height],
+            origin='lower', cmap='YlOrRd', alpha=0.8
+        )
+        self.colorbar = self.figure.colorbar(self.image, ax=ax)
+        self.colorbar.set_label(self._label('覆盖摄像头数量'), fontsize=12)
+
+        self.markers = ax.scatter([], [], color='blue', s=100, marker='s',
+                                  edgecolor='white', linewidth=2)
+        self.number_texts = []
+
+        ax.set_xlim(0, sandbox_width)
+        ax.set_ylim(0, sandbox_height)
+        ax.set_xlabel(self._label('宽度') + ' (米)', fontsize=12)
+        ax.set_ylabel(self._label('高度') + ' (米)', fontsize=12)
+        ax.set_title(self._label('摄像头覆盖热力图'), fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+
+        self.figure.tight_layout()
+
+    def _update(self, calculation_result: Dict[str, Any], resolution: Optional[int] = None,
+                label_threshold: Optional[int] = None) -> None:
+        coverage_count = compute_result_raster(
+            calculation_result, self.resolution if resolution is None else resolution
+        )
+        self.image.set_data(coverage_count)
+        self.image.set_clim(0, max(int(coverage_count.max()), 1))
+        xy = layout_positions(calculation_result)[:, :2]
+        self.markers.set_offsets(xy)
+
+        for text in self.number_texts:
+            text.remove()
+        self.number_texts = []
+        if label_threshold is None:
+            label_threshold = self.label_threshold
+        if len(xy) <= label_threshold:
+            self.number_texts = [
+                self.ax.text(x, y + 0.3, f'{i + 1}', ha='center', va='bottom', fontweight='bold',
+                             color='white', fontsize=10)
+                for i, (x, y) in enumerate(xy.tolist())
+            ]
+
+
+class ThreeDRenderer(_FigureRenderer):
+    """3D布局视图的增量渲染器"""
+
+    def __init__(self, figsize=(12, 8), dpi: int = IMAGE_DPI,
+                 labels: Optional[Dict[str, str]] = None, label_threshold: int = LABEL_THRESHOLD,
+                 font: Optional[FontProperties] = None):
+        """
+        Args:
+            figsize: 图像尺寸（英寸）
+            dpi: 输出分辨率
+            labels: 文本标签映射（无中文字体时使用英文标签）
+            font: 图表文字使用的字体（font_resolver.font_properties 的结果）
+            label_threshold: 摄像头数量不超过该值时显示摄像头标签
+        """
+        super().__init__(figsize, dpi, labels, font)
+        self.label_threshold = label_threshold
+
+    def _build_static(self, sandbox_width: float, sandbox_height: float, **options) -> None:
+        ax = self.ax = self.figure.add_subplot(111, projection='3d')
+
+        # 绘制沙盘底面
+        xx, yy = np.meshgrid([0, sandbox_width], [0, sandbox_height])
+        ax.plot_surface(xx, yy, np.zeros_like(xx), alpha=0.3, color='lightgray')
+
+        ax.set_xlabel(self._label('宽度'))
+        ax.set_ylabel(self._label('高度'))
+        ax.set_zlabel(self._label('高度'))
+        ax.view_init(elev=20, azim=45)
+
+        # 摄像头到地面的连线、覆盖范围边界和视锥在首次更新时创建，之后只更新线段
+        self.line_collections = None
+        # Axes3D 的散点集合不支持原地更新坐标，每次渲染重建
+        self.markers = None
+        self.camera_texts = []
+
+    def _update(self, calculation_result: Dict[str, Any],
+                label_threshold: Optional[int] = None) -> None:
+        ax = self.ax
+        sandbox_width = calculation_result['sandbox_dimensions']['width']
+        sandbox_height = calculation_result['sandbox_dimensions']['height']
+        coverage = calculation_result['coverage_per_camera']
+        xyz = layout_positions(calculation_result)
+
+        if self.markers is not None:
+            self.markers.remove()
+        self.markers = ax.scatter(xyz[:, 0], xyz[:, 1], xyz[:, 2], color='red', s=100, alpha=1.0)
+
+        corners = footprint_vertices(xyz[:, :2], coverage['width'], coverage['height'])
+        ground_corners = np.concatenate([corners, np.zeros(corners.shape[:2] + (1,))], axis=2)
+        apexes = np.repeat(xyz[:, None, :], 4, axis=1)
+        ground_points = np.concatenate([xyz[:, :2], np.zeros((len(xyz), 1))], axis=1)
+        segments = (
+            np.stack([xyz, ground_points], axis=1),
+            np.concatenate([ground_corners, ground_corners[:, :1]], axis=1),
+            np.stack([apexes, ground_corners], axis=2).reshape(-1, 2, 3),
+        )
+        if self.line_collections is None:
+            self.line_collections = (
+                Line3DCollection(segments[0], colors='r', linestyles='--', alpha=0.5),
+                Line3DCollection(segments[1], colors='b', alpha=0.7),
+                Line3DCollection(segments[2], colors='b', alpha=0.3, linewidths=0.5),
+            )
+            for collection in self.line_collections:
+                ax.add_collection3d(collection)
+        else:
+            for collection, lines in zip(self.line_collections, segments):
+                collection.set_segments(lines)
+
+        # 集合不参与自动缩放，按覆盖范围设置坐标轴
+        if len(xyz):
+            ax.set_xlim(min(0, corners[..., 0].min()), max(sandbox_width, corners[..., 0].max()))
+            ax.set_ylim(min(0, corners[..., 1].min()), max(sandbox_height, corners[..., 1].max()))
+            ax.set_zlim(0, xyz[:, 2].max())
+
+        for text in self.camera_texts:
+            text.remove()
+        self.camera_texts = []
+        if label_threshold is None:
+            label_threshold = self.label_threshold
+        if len(xyz) <= label_threshold:
+            camera_label = self._label('摄像头')
+            self.camera_texts = [
+                ax.text(x, y, z + 0.3, f'{camera_label}{i + 1}', fontsize=8, ha='center')
+                for i, (x, y, z) in enumerate(xyz.tolist())
+            ]
+
+        ax.set_title(f"{self._label('摄像头3D布局图')}\n"
+                     f"{self._label('安装高度')}: {coverage['camera_height']}m")
+
+
+class ComparisonRenderer(_FigureRenderer):
+    """备选方案对比图的增量渲染器（数据为 calculate_optimal_height 的 alternatives）"""
+
+    def __init__(self, figsize=(15, 10), dpi: int = IMAGE_DPI,
+                 labels: Optional[Dict[str, str]] = None, font: Optional[FontProperties] = None):
+        """
+        Args:
+            figsize: 图像尺寸（英寸）
+            dpi: 输出分辨率
+            labels: 文本标签映射（无中文字体时使用英文标签）
+            font: 图表文字使用的字体（font_resolver.font_properties 的结果）
+        """
+        super().__init__(figsize, dpi, labels, font)
+
+    def _static_signature(self, data: Any, options: Dict[str, Any]) -> Any:
+        # 坐标轴和标题与数据无关
+        return self._static_options(options)
+
+    def _build_static_for(self, data: Any, **options) -> None:
+        install_height_label = self._label('安装高度') + ' (米)'
+        axis_labels = [
+            (self._label('摄像头数量'), 'bo-'),
+            (self._label('覆盖率') + ' (%)', 'go-'),
+            (self._label('总成本') + ' (元)', 'ro-'),
+            (self._label('成本效益') + ' (覆盖率/千元)', 'mo-'),
+        ]
+        self.lines = []
+        for ax, (label, style) in zip(self.figure.subplots(2, 2).flat, axis_labels):
+            line, = ax.plot([], [], style, linewidth=2, markersize=6)
+            ax.set_xlabel(install_height_label)
+            ax.set_ylabel(label)
+            ax.set_title(f'{label.split(" ")[0]} vs {install_height_label.split(" ")[0]}')
+            ax.grid(True, alpha=0.3)
+            self.lines.append(line)
+        self.figure.tight_layout()
+
+    def _update(self, height_analysis: List[Dict[str, Any]]) -> None:
+        heights = [result['height'] for result in height_analysis]
+        coverage_ratios = [result['coverage_ratio'] * 100 for result in height_analysis]
+        costs = [result['cost'] for result in height_analysis]
+        efficiency = [ratio / (cost / 1000) for ratio, cost in zip(coverage_ratios, costs)]
+        series = ([result['cameras'] for result in height_analysis], coverage_ratios, costs, efficiency)
+        for line, values in zip(self.lines, series):
+            line.set_data(heights, values)
+            line.axes.relim()
+            line.axes.autoscale_view()
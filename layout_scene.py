@@ -0,0 +1,131 @@
+"""
+浏览器端布局视图模块
+生成紧凑的JSON场景数据和Vega-Lite规格，由浏览器渲染布局图，不依赖matplotlib
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+from camera_calculator import layout_positions
+
+
+def create_layout_scene(calculation_result: Dict[str, Any],
+                        decimals: int = 3) -> Dict[str, Any]:
+    """
+    生成浏览器端渲染用的紧凑场景数据（不使用matplotlib，可直接 json.dumps）
+
+    Args:
+        calculation_result: 计算结果
+        decimals: 坐标保留的小数位数
+
+    Returns:
+        Dict: 沙盘尺寸、单摄像头覆盖尺寸和按列存放的摄像头坐标
+    """
+    sandbox = calculation_result['sandbox_dimensions']
+    coverage = calculation_result['coverage_per_camera']
+    positions = np.round(layout_positions(calculation_result)[:, :2], decimals)
+    return {
+        'sandbox': {'width': sandbox['width'], 'height': sandbox['height']},
+        'footprint': {'width': round(coverage['width'], decimals),
+                      'height': round(coverage['height'], decimals)},
+        'camera_height': coverage['camera_height'],
+        'cameras': {'x': positions[:, 0].tolist(), 'y': positions[:, 1].tolist()},
+        'total_cameras': calculation_result['total_cameras'],
+        'coverage_ratio': calculation_result['coverage_ratio'],
+        'total_cost': calculation_result['total_cost']
+    }
+
+
+def create_layout_spec(calculation_result: Dict[str, Any],
+                       show_coverage: bool = True, width: int = 600) -> Dict[str, Any]:
+    """
+    创建摄像头布局图的Vega-Lite规格，由浏览器渲染（可缩放、平移、悬停查看坐标）
+
+    摄像头坐标按列传输，覆盖矩形在浏览器端由坐标和覆盖尺寸计算，
+    服务器只需生成场景数据。
+
+    Args:
+        calculation_result: 计算结果
+        show_coverage: 是否显示覆盖范围
+        width: 图表宽度（像素），高度按沙盘比例计算
+
+    Returns:
+        Dict: Vega-Lite v5 规格，可传给 st.vega_lite_chart
+    """
+    scene = create_layout_scene(calculation_result)
+    sandbox_width = scene['sandbox']['width']
+    sandbox_height = scene['sandbox']['height']
+    half_width = scene['footprint']['width'] / 2
+    half_height = scene['footprint']['height'] / 2
+
+    x_scale = {'domain': [-1, sandbox_width + 1], 'nice': False}
+    y_scale = {'domain': [-1, sandbox_height + 1], 'nice': False}
+    x_encoding = {'field': 'x0', 'type': 'quantitative', 'scale': x_scale, 'title': '宽度 (米)'}
+    y_encoding = {'field': 'y0', 'type': 'quantitative', 'scale': y_scale, 'title': '高度 (米)'}
+
+    # 摄像头坐标只传输一份（按列），由 flatten 展开为逐行数据并编号
+    cameras = {'name': 'cameras'}
+    expand = [
+        {'flatten': ['x', 'y']},
+        {'window': [{'op': 'row_number', 'as': 'id'}]}
+    ]
+
+    # 沙盘边界
+    layers = [{
+        'data': {'values': [{'x0': 0, 'y0': 0, 'x1': sandbox_width, 'y1': sandbox_height}]},
+        'mark': {'type': 'rect', 'fill': 'lightgray', 'fillOpacity': 0.3,
+                 'stroke': 'black', 'strokeWidth': 3},
+        'encoding': {'x': x_encoding, 'y': y_encoding,
+                     'x2': {'field': 'x1'}, 'y2': {'field': 'y1'}}
+    }]
+
+    # 覆盖范围
+    if show_coverage:
+        layers.append({
+            'data': cameras,
+            'transform': expand + [
+                {'calculate': f'datum.x - {half_width}', 'as': 'x0'},
+                {'calculate': f'datum.x + {half_width}', 'as': 'x1'},
+                {'calculate': f'datum.y - {half_height}', 'as': 'y0'},
+                {'calculate': f'datum.y + {half_height}', 'as': 'y1'}
+            ],
+            'mark': {'type': 'rect', 'fill': 'blue', 'fillOpacity': 0.2,
+                     'stroke': 'blue', 'strokeDash': [4, 4]},
+            'encoding': {'x': x_encoding, 'y': y_encoding,
+                         'x2': {'field': 'x1'}, 'y2': {'field': 'y1'}}
+        })
+
+    # 摄像头位置（悬停显示编号和坐标，拖动/滚轮平移缩放）
+    layers.append({
+        'data': cameras,
+        'params': [{'name': 'view', 'select': 'interval', 'bind': 'scales'}],
+        'transform': expand + [
+            {'calculate': 'datum.x', 'as': 'x0'},
+            {'calculate': 'datum.y', 'as': 'y0'}
+        ],
+        'mark': {'type': 'circle', 'color': 'red', 'stroke': 'darkred',
+                 'strokeWidth': 2, 'opacity': 1, 'size': 120},
+        'encoding': {
+            'x': x_encoding,
+            'y': y_encoding,
+            'tooltip': [
+                {'field': 'id', 'type': 'quantitative', 'title': '摄像头'},
+                {'field': 'x', 'type': 'quantitative', 'title': 'X (米)', 'format': '.2f'},
+                {'field': 'y', 'type': 'quantitative', 'title': 'Y (米)', 'format': '.2f'}
+            ]
+        }
+    })
+
+    return {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'title': {
+            'text': '沙盘摄像头布局图',
+            'subtitle': (f"沙盘尺寸: {sandbox_width}×{sandbox_height}m, "
+                         f"摄像头数量: {scene['total_cameras']}个")
+        },
+        'width': width,
+        'height': max(1, round(width * (sandbox_height + 2) / (sandbox_width + 2))),
+        'datasets': {'cameras': [scene['cameras']]},
+        'layer': layers
+    }
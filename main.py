@@ -2,11 +2,124 @@
 沙盘摄像头安装计算器 - 单页面Web应用
 """
 
+import logging
+from typing import TYPE_CHECKING
+
 import streamlit as st
-import pandas as pd
-from camera_calculator import CameraCalculator, estimate_installation_complexity, calculate_viewing_angle_from_lens
-from camera_visualizer import CameraVisualizer
-import numpy as np
+from camera_calculator import (
+    estimate_installation_complexity, calculate_viewing_angle_from_lens, layout_positions
+)
+from calculation_cache import CachedCameraCalculator
+import instrumentation
+from report_writer import REPORT_EXTENSIONS, REPORT_MIME_TYPES, generate_report
+
+# pandas 与 matplotlib 可视化模块在首次使用时才导入，缩短冷启动时间
+if TYPE_CHECKING:
+    import pandas as pd
+    from camera_visualizer import CameraVisualizer
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource
+def get_calculator() -> CachedCameraCalculator:
+    """进程内共享的计算器（跨会话、跨重新运行复用）"""
+    return CachedCameraCalculator()
+
+
+@st.cache_resource
+def get_visualizer() -> "CameraVisualizer":
+    """进程内共享的可视化器，字体检测只在首次创建时执行"""
+    from camera_visualizer import CameraVisualizer
+    from image_cache import ImageCache
+    
+    return CameraVisualizer(image_cache=ImageCache())
+
+
+@st.cache_data(show_spinner=False)
+def compute_layout(sandbox_width: float, sandbox_height: float, camera_height: float,
+                   horizontal_fov: float, vertical_fov: float, overlap_ratio: float,
+                   camera_price: float):
+    """按输入参数缓存的布局计算结果"""
+    return get_calculator().calculate_layout(
+        sandbox_width, sandbox_height, camera_height,
+        horizontal_fov, vertical_fov, overlap_ratio, camera_price
+    )
+
+
+@st.cache_data(show_spinner=False)
+def compute_position_table(*layout_params) -> "pd.DataFrame":
+    """按输入参数缓存的摄像头位置表"""
+    import pandas as pd
+    
+    positions = layout_positions(compute_layout(*layout_params))
+    return pd.DataFrame({
+        "摄像头编号": [f"摄像头{i+1}" for i in range(len(positions))],
+        "X坐标 (米)": [f"{x:.1f}" for x in positions[:, 0].tolist()],
+        "Y坐标 (米)": [f"{y:.1f}" for y in positions[:, 1].tolist()],
+        "Z坐标 (米)": [f"{z:.1f}" for z in positions[:, 2].tolist()]
+    })
+
+
+@st.cache_data(show_spinner=False)
+def compute_optimal_height(sandbox_width: float, sandbox_height: float,
+                           horizontal_fov: float, vertical_fov: float,
+                           max_cameras, camera_price: float, overlap_ratio: float):
+    """按输入参数缓存的最优安装高度分析"""
+    return get_calculator().calculate_optimal_height(
+        sandbox_width, sandbox_height, horizontal_fov, vertical_fov, max_cameras, camera_price,
+        method='exact', max_height=20.0, overlap_ratio=overlap_ratio
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_chart(kind: str, layout_params: tuple, preview: bool = False) -> bytes:
+    """
+    按图表类型和输入参数缓存渲染后的PNG图片
+    
+    使用复用 Figure 的增量渲染器：拖动滑块时只更新摄像头、覆盖范围等变化的图元
+    """
+    renderer = get_visualizer().get_renderer(kind)
+    return renderer.render(compute_layout(*layout_params), output='bytes', preview=preview)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_charts(kinds: tuple, layout_params: tuple, preview: bool = False) -> dict:
+    """同时显示多张静态图表时并发渲染；渲染失败的图表不返回，由 render_chart 单独报错"""
+    futures = get_visualizer().render_charts(
+        compute_layout(*layout_params), kinds, incremental=True, output='bytes', preview=preview
+    )
+    images = {}
+    for kind, future in futures.items():
+        try:
+            images[kind] = future.result()
+        except Exception:
+            logger.warning("并发渲染图表 %s 失败，改为单独渲染", kind, exc_info=True)
+    return images
+
+
+@st.cache_data(show_spinner=False)
+def compute_layout_spec(layout_params: tuple) -> dict:
+    """按输入参数缓存的浏览器端布局图规格"""
+    from layout_scene import create_layout_spec
+    
+    return create_layout_spec(compute_layout(*layout_params))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_config_report(layout_params: tuple, fmt: str) -> bytes:
+    """按输入参数和格式缓存的配置报告（UTF-8编码，CSV带BOM）"""
+    result = compute_layout(*layout_params)
+    complexity = estimate_installation_complexity(result['total_cameras'], layout_params[0] * layout_params[1])
+    encoding = 'utf-8-sig' if fmt == 'csv' else 'utf-8'
+    return generate_config_report(result, complexity, fmt).encode(encoding)
+
+
+@st.cache_data(show_spinner=False)
+def render_comparison_chart(optimal_params: tuple) -> bytes:
+    """按输入参数缓存的备选方案对比图"""
+    optimal_result = compute_optimal_height(*optimal_params)
+    return get_visualizer().get_renderer('comparison').render(optimal_result['alternatives'], output='bytes')
 
 
 def main():
@@ -20,10 +133,6 @@ def main():
     st.title("📹 沙盘摄像头安装计算器")
     st.markdown("---")
     
-    # 创建计算器和可视化器实例
-    calculator = CameraCalculator()
-    visualizer = CameraVisualizer()
-    
     # 侧边栏 - 输入参数
     with st.sidebar:
         st.header("📋 配置参数")
@@ -76,10 +185,11 @@ def main():
         
         # 执行计算
         try:
-            result = calculator.calculate_camera_count(
+            layout_params = (
                 sandbox_width, sandbox_height, camera_height,
                 horizontal_fov, vertical_fov, overlap_ratio, camera_price
             )
+            result = compute_layout(*layout_params)
             
             # 显示关键指标
             metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
@@ -118,20 +228,14 @@ def main():
                 ]
             }
             
+            import pandas as pd
             config_df = pd.DataFrame(config_data)
             st.table(config_df)
             
             # 摄像头位置信息
             st.subheader("📍 摄像头位置坐标")
             
-            position_data = {
-                "摄像头编号": [f"摄像头{i+1}" for i in range(len(result['camera_positions']))],
-                "X坐标 (米)": [f"{pos['x']:.1f}" for pos in result['camera_positions']],
-                "Y坐标 (米)": [f"{pos['y']:.1f}" for pos in result['camera_positions']],
-                "Z坐标 (米)": [f"{pos['z']:.1f}" for pos in result['camera_positions']]
-            }
-            
-            position_df = pd.DataFrame(position_data)
+            position_df = compute_position_table(*layout_params)
             st.dataframe(position_df, use_container_width=True)
             
         except Exception as e:
@@ -172,57 +276,89 @@ def main():
     with viz_col3:
         show_heatmap = st.checkbox("显示覆盖热力图", value=False)
     
+    layout_backend = st.radio(
+        "布局图渲染方式", ["交互式（浏览器端渲染）", "静态图片（服务器端渲染）"],
+        horizontal=True
+    )
+    preview_charts = st.checkbox("低分辨率预览（减小图片体积，加快加载）", value=False)
+    
+    # 多张静态图表同时显示时并发渲染
+    static_charts = tuple(kind for kind, enabled in (
+        ('layout', show_layout and not layout_backend.startswith("交互式")),
+        ('3d', show_3d),
+        ('heatmap', show_heatmap)
+    ) if enabled)
+    chart_images = {}
+    if len(static_charts) > 1:
+        chart_images = render_charts(static_charts, layout_params, preview_charts)
+    
     # 生成和显示图表
     if show_layout:
         st.subheader("🗺️ 摄像头布局图")
         try:
-            layout_img = visualizer.create_layout_plot(result)
-            st.image(f"data:image/png;base64,{layout_img}", caption="摄像头布局图")
+            if layout_backend.startswith("交互式"):
+                # 浏览器端渲染，缩放/平移/悬停不占用服务器CPU
+                st.vega_lite_chart(compute_layout_spec(layout_params), use_container_width=True)
+            else:
+                layout_img = chart_images.get('layout') or render_chart('layout', layout_params, preview_charts)
+                st.image(layout_img, caption="摄像头布局图")
+                st.caption(f"图片大小: {len(layout_img) / 1024:.0f} KB")
         except Exception as e:
             st.error(f"生成布局图失败: {str(e)}")
     
     if show_3d:
         st.subheader("🎯 3D布局视图")
         try:
-            viz_3d_img = visualizer.create_3d_visualization(result)
-            st.image(f"data:image/png;base64,{viz_3d_img}", caption="3D布局视图")
+            viz_3d_img = chart_images.get('3d') or render_chart('3d', layout_params, preview_charts)
+            st.image(viz_3d_img, caption="3D布局视图")
+            st.caption(f"图片大小: {len(viz_3d_img) / 1024:.0f} KB")
         except Exception as e:
             st.error(f"生成3D视图失败: {str(e)}")
     
     if show_heatmap:
         st.subheader("🔥 覆盖热力图")
         try:
-            heatmap_img = visualizer.create_coverage_heatmap(result)
-            st.image(f"data:image/png;base64,{heatmap_img}", caption="覆盖热力图")
+            heatmap_img = chart_images.get('heatmap') or render_chart('heatmap', layout_params, preview_charts)
+            st.image(heatmap_img, caption="覆盖热力图")
+            st.caption(f"图片大小: {len(heatmap_img) / 1024:.0f} KB")
         except Exception as e:
             st.error(f"生成热力图失败: {str(e)}")
     
     # 优化建议部分
     st.header("🎯 优化建议")
     
+    max_cams = max_cameras if max_cameras > 0 else None
+    optimal_params = (
+        sandbox_width, sandbox_height, horizontal_fov, vertical_fov,
+        max_cams, camera_price, overlap_ratio
+    )
     if st.button("🔍 分析最优安装高度"):
         with st.spinner("正在计算最优配置..."):
-            max_cams = max_cameras if max_cameras > 0 else None
-            optimal_result = calculator.calculate_optimal_height(
-                sandbox_width, sandbox_height, horizontal_fov, vertical_fov, max_cams, camera_price
-            )
-            
-            st.subheader("🏆 最优配置")
-            
-            opt_col1, opt_col2 = st.columns(2)
-            
-            with opt_col1:
-                st.metric("最优安装高度", f"{optimal_result['optimal_height']} 米")
-                opt_config = optimal_result['configuration']
-                st.metric("所需摄像头", f"{opt_config['total_cameras']} 个")
-                st.metric("预计成本", f"¥{opt_config['total_cost']:,}")
-            
-            with opt_col2:
-                if optimal_result['alternatives']:
-                    st.subheader("📊 备选方案对比")
-                    comparison_img = visualizer.create_comparison_chart(optimal_result['alternatives'])
-                    if comparison_img:
-                        st.image(f"data:image/png;base64,{comparison_img}", caption="不同高度对比分析")
+            compute_optimal_height(*optimal_params)
+        # 保存在会话状态中，调整其他控件时分析结果不会消失
+        st.session_state['optimal_params'] = optimal_params
+    
+    if st.session_state.get('optimal_params') == optimal_params:
+        optimal_result = compute_optimal_height(*optimal_params)
+        
+        st.subheader("🏆 最优配置")
+        
+        opt_col1, opt_col2 = st.columns(2)
+        
+        with opt_col1:
+            st.metric("最优安装高度", f"{optimal_result['optimal_height']:.2f} 米")
+            opt_config = optimal_result['configuration']
+            st.metric("所需摄像头", f"{opt_config['total_cameras']} 个")
+            st.metric("预计成本", f"¥{opt_config['total_cost']:,}")
+        
+        with opt_col2:
+            if optimal_result['alternatives']:
+                st.subheader("📊 备选方案对比")
+                comparison_img = render_comparison_chart(optimal_params)
+                if comparison_img:
+                    st.image(comparison_img, caption="不同高度对比分析")
+    elif 'optimal_params' in st.session_state:
+        st.info("参数已变化，请重新分析最优安装高度")
     
     # 导出功能
     st.header("💾 导出报告")
@@ -230,14 +366,18 @@ def main():
     export_col1, export_col2 = st.columns(2)
     
     with export_col1:
+        report_labels = {'text': '文本', 'markdown': 'Markdown', 'json': 'JSON', 'csv': 'CSV（位置附表）'}
+        report_format = st.selectbox("报告格式", list(report_labels), format_func=report_labels.get)
+        # 报告在点击生成后才构建，调整参数时页面重新运行不生成报告内容
+        report_key = (layout_params, report_format)
         if st.button("📄 生成配置报告"):
-            # 生成配置报告
-            report_content = generate_config_report(result, complexity)
+            st.session_state['report_key'] = report_key
+        if st.session_state.get('report_key') == report_key:
             st.download_button(
                 label="下载配置报告",
-                data=report_content,
-                file_name=f"摄像头配置报告_{sandbox_width}x{sandbox_height}m.txt",
-                mime="text/plain"
+                data=build_config_report(*report_key),
+                file_name=f"摄像头配置报告_{sandbox_width}x{sandbox_height}m{REPORT_EXTENSIONS[report_format]}",
+                mime=REPORT_MIME_TYPES[report_format]
             )
     
     with export_col2:
@@ -250,62 +390,23 @@ def main():
                 file_name=f"摄像头位置数据_{sandbox_width}x{sandbox_height}m.csv",
                 mime="text/csv"
             )
-
-
-def generate_config_report(result: dict, complexity: dict) -> str:
-    """生成配置报告"""
-    report = f"""
-沙盘摄像头安装配置报告
-========================
-
-项目概况
---------
-沙盘尺寸: {result['sandbox_dimensions']['width']} × {result['sandbox_dimensions']['height']} 米
-沙盘面积: {result['sandbox_dimensions']['area']} 平方米
-
-摄像头配置
-----------
-摄像头总数: {result['total_cameras']} 个
-布局方式: {result['cameras_x']} × {result['cameras_y']} 阵列
-安装高度: {result['coverage_per_camera']['camera_height']} 米
-视场角: {result['coverage_per_camera']['horizontal_fov']}° × {result['coverage_per_camera']['vertical_fov']}°
-摄像头单价: ¥{result['camera_price']:,.0f}
-
-覆盖范围
---------
-单摄像头覆盖: {result['coverage_per_camera']['width']:.1f} × {result['coverage_per_camera']['height']:.1f} 米
-单摄像头面积: {result['coverage_per_camera']['area']:.1f} 平方米
-总覆盖率: {result['coverage_ratio']*100:.1f}%
-重叠比例: {result['overlap_ratio']*100:.0f}%
-
-成本估算
---------
-设备成本: ¥{result['total_cost']:,}
-人工成本: ¥{complexity['labor_cost']:,.0f}
-总成本: ¥{result['total_cost'] + complexity['labor_cost']:,.0f}
-
-安装信息
---------
-复杂度等级: {complexity['complexity_level']}
-预计安装时间: {complexity['installation_time']:.1f} 小时
-
-摄像头位置坐标
---------------
-"""
     
-    for i, pos in enumerate(result['camera_positions']):
-        report += f"摄像头{i+1}: ({pos['x']:.1f}, {pos['y']:.1f}, {pos['z']:.1f})\n"
-    
-    report += f"""
-安装建议
---------
-"""
-    
-    for recommendation in complexity['recommendations']:
-        report += f"• {recommendation}\n"
-    
-    return report
+    # 性能埋点（设置环境变量 CAMERA_INSTRUMENTATION=1 启用）
+    if instrumentation.is_enabled():
+        with st.expander("⏱️ 性能埋点"):
+            st.json(instrumentation.summary())
+            st.download_button(
+                label="下载Prometheus指标",
+                data=instrumentation.to_prometheus(),
+                file_name="camera_calculator_metrics.txt",
+                mime="text/plain"
+            )
+
 
+@instrumentation.timed('report.generate_config_report')
+def generate_config_report(result: dict, complexity: dict, fmt: str = 'text') -> str:
+    """生成配置报告（'text'、'markdown'、'json' 或 'csv'），写入文件或流请使用 report_writer.write_report"""
+    return generate_report(result, complexity, fmt)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -8,6 +8,8 @@ import platform
 import os
 import warnings
 
+from font_resolver import font_properties, resolve_font
+
 
 def configure_fonts_for_production():
     """
@@ -53,33 +55,15 @@ def configure_fonts_for_production():
     # 获取当前系统的字体候选
     candidates = font_candidates.get(system, font_candidates["Linux"])
     
-    # 获取所有可用字体
-    available_fonts = set(f.name for f in fm.fontManager.ttflist)
-    
-    # 查找可用的中文字体
-    selected_font = None
-    for font in candidates:
-        if font in available_fonts:
-            selected_font = font
-            break
-    
-    # 如果主要候选都没找到，尝试模糊匹配
-    if selected_font is None:
-        chinese_keywords = [
-            'chinese', 'cjk', 'han', 'hei', 'song', 'kai', 'fangsong',
-            'yahei', 'simsun', 'simhei', 'pingfang', 'heiti', 'noto',
-            'source', 'wenquanyi', 'ar pl', 'hiragino', 'apple'
-        ]
-        
-        for font_name in available_fonts:
-            font_lower = font_name.lower()
-            if any(keyword in font_lower for keyword in chinese_keywords):
-                # 优先选择包含"sans"或"ui"的字体（通常显示效果更好）
-                if 'sans' in font_lower or 'ui' in font_lower:
-                    selected_font = font_name
-                    break
-                elif selected_font is None:
-                    selected_font = font_name
+    # 解析可用的中文字体（每个进程只解析一次，结果缓存在磁盘上）
+    # 模糊匹配时优先选择包含"sans"或"ui"的字体（通常显示效果更好）
+    chinese_keywords = [
+        'chinese', 'cjk', 'han', 'hei', 'song', 'kai', 'fangsong',
+        'yahei', 'simsun', 'simhei', 'pingfang', 'heiti', 'noto',
+        'source', 'wenquanyi', 'ar pl', 'hiragino', 'apple'
+    ]
+    font = resolve_font(candidates, keywords=chinese_keywords, prefer=('sans', 'ui'))
+    selected_font = font['name'] if font else None
     
     # 设置matplotlib参数
     if selected_font:
@@ -90,12 +74,9 @@ def configure_fonts_for_production():
             'font.size': 10
         })
         
-        # 验证字体设置
+        # 验证字体设置（只加载所选的字体文件）
         try:
-            # 创建一个临时图形来测试字体
-            fig, ax = plt.subplots(figsize=(2, 1))
-            ax.text(0.5, 0.5, '测试中文字体', fontsize=12, ha='center', va='center')
-            plt.close(fig)
+            fm.get_font(font_properties(font).get_file())
             
             print(f"✅ 字体配置成功: {selected_font}")
             return selected_font
@@ -0,0 +1,285 @@
+"""
+配置报告生成模块
+按块生成文本、Markdown、JSON 或 CSV（摄像头位置附表）格式的配置报告，可直接写入文件或流；
+摄像头位置分块格式化，十万级摄像头的网格布局也只占用固定内存
+
+用法:
+    from report_writer import write_report
+    write_report(result, complexity, 'output/report.md')   # 格式按扩展名判断
+"""
+
+import json
+import os
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from camera_calculator import LayoutResult, iter_layout_position_chunks
+from instrumentation import timed
+
+# 支持的报告格式
+REPORT_FORMATS = ('text', 'markdown', 'json', 'csv')
+
+REPORT_EXTENSIONS = {'text': '.txt', 'markdown': '.md', 'json': '.json', 'csv': '.csv'}
+
+REPORT_MIME_TYPES = {
+    'text': 'text/plain',
+    'markdown': 'text/markdown',
+    'json': 'application/json',
+    'csv': 'text/csv'
+}
+
+# 每次格式化的摄像头位置数量
+DEFAULT_CHUNK_SIZE = 4096
+
+REPORT_TITLE = '沙盘摄像头安装配置报告'
+
+# CSV 附表表头，与Web应用的位置数据导出一致
+CSV_HEADER = ('摄像头编号', 'X坐标 (米)', 'Y坐标 (米)', 'Z坐标 (米)')
+
+# 摄像头位置行模板（% 格式化比逐行 f-string 拼接更快）
+_TEXT_ROW = "摄像头%d: (%.1f, %.1f, %.1f)\n"
+_MARKDOWN_ROW = "| 摄像头%d | %.1f | %.1f | %.1f |\n"
+_CSV_ROW = "摄像头%d,%.1f,%.1f,%.1f\n"
+_JSON_ROW = '{"x": %s, "y": %s, "z": %s}'
+
+Destination = Union[str, os.PathLike, IO[str]]
+
+
+def detect_report_format(path: Union[str, os.PathLike], default: str = 'text') -> str:
+    """根据文件扩展名判断报告格式"""
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    for fmt, known in REPORT_EXTENSIONS.items():
+        if extension == known:
+            return fmt
+    return {'.markdown': 'markdown', '.text': 'text'}.get(extension, default)
+
+
+def _summary_sections(result: Dict[str, Any], complexity: Dict[str, Any]) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """报告概要的各节内容: [(节标题, [(项目, 数值文本)])]"""
+    sandbox = result['sandbox_dimensions']
+    coverage = result['coverage_per_camera']
+    return [
+        ('项目概况', [
+            ('沙盘尺寸', f"{sandbox['width']} × {sandbox['height']} 米"),
+            ('沙盘面积', f"{sandbox['area']} 平方米"),
+        ]),
+        ('摄像头配置', [
+            ('摄像头总数', f"{result['total_cameras']} 个"),
+            ('布局方式', f"{result['cameras_x']} × {result['cameras_y']} 阵列"),
+            ('安装高度', f"{coverage['camera_height']} 米"),
+            ('视场角', f"{coverage['horizontal_fov']}° × {coverage['vertical_fov']}°"),
+            ('摄像头单价', f"¥{result['camera_price']:,.0f}"),
+        ]),
+        ('覆盖范围', [
+            ('单摄像头覆盖', f"{coverage['width']:.1f} × {coverage['height']:.1f} 米"),
+            ('单摄像头面积', f"{coverage['area']:.1f} 平方米"),
+            ('总覆盖率', f"{result['coverage_ratio']*100:.1f}%"),
+            ('重叠比例', f"{result['overlap_ratio']*100:.0f}%"),
+        ]),
+        ('成本估算', [
+            ('设备成本', f"¥{result['total_cost']:,}"),
+            ('人工成本', f"¥{complexity['labor_cost']:,.0f}"),
+            ('总成本', f"¥{result['total_cost'] + complexity['labor_cost']:,.0f}"),
+        ]),
+        ('安装信息', [
+            ('复杂度等级', f"{complexity['complexity_level']}"),
+            ('预计安装时间', f"{complexity['installation_time']:.1f} 小时"),
+        ]),
+    ]
+
+
+def _iter_position_rows(result: Dict[str, Any], chunk_size: int) -> Iterator[Tuple[int, List[Tuple[float, float, float]]]]:
+    """分块生成 (起始编号, [(x, y, z), ...])，编号从1开始"""
+    positions = None if isinstance(result, LayoutResult) else result['camera_positions']
+    if isinstance(positions, list):
+        # calculate_camera_count 返回的字典列表已在内存中，直接按块取值
+        for start in range(0, len(positions), chunk_size):
+            yield start + 1, [(pos['x'], pos['y'], pos['z'])
+                              for pos in positions[start:start + chunk_size]]
+        return
+
+    # LayoutResult、列表视图和位置数组按块生成，不构造完整的位置数组
+    start = 1
+    for chunk in iter_layout_position_chunks(result, chunk_size):
+        rows = chunk.tolist()
+        yield start, rows
+        start += len(rows)
+
+
+def _iter_text(result: Dict[str, Any], complexity: Dict[str, Any], chunk_size: int) -> Iterator[str]:
+    parts = [f"\n{REPORT_TITLE}\n{'=' * 24}\n\n"]
+    for title, items in _summary_sections(result, complexity):
+        parts.append(f"{title}\n{'-' * (2 * len(title))}\n")
+        parts.extend(f"{label}: {value}\n" for label, value in items)
+        parts.append("\n")
+    parts.append("摄像头位置坐标\n--------------\n")
+    yield ''.join(parts)
+
+    for start, rows in _iter_position_rows(result, chunk_size):
+        yield ''.join([_TEXT_ROW % (i, x, y, z) for i, (x, y, z) in enumerate(rows, start)])
+
+    yield "\n安装建议\n--------\n" + ''.join(
+        f"• {recommendation}\n" for recommendation in complexity['recommendations']
+    )
+
+
+def _iter_markdown(result: Dict[str, Any], complexity: Dict[str, Any], chunk_size: int) -> Iterator[str]:
+    parts = [f"# {REPORT_TITLE}\n\n"]
+    for title, items in _summary_sections(result, complexity):
+        parts.append(f"## {title}\n\n| 项目 | 数值 |\n|------|------|\n")
+        parts.extend(f"| {label} | {value} |\n" for label, value in items)
+        parts.append("\n")
+    parts.append("## 摄像头位置坐标\n\n| 编号 | X (米) | Y (米) | Z (米) |\n|------|--------|--------|--------|\n")
+    yield ''.join(parts)
+
+    for start, rows in _iter_position_rows(result, chunk_size):
+        yield ''.join([_MARKDOWN_ROW % (i, x, y, z) for i, (x, y, z) in enumerate(rows, start)])
+
+    yield "\n## 安装建议\n\n" + ''.join(
+        f"- {recommendation}\n" for recommendation in complexity['recommendations']
+    )
+
+
+def _json_default(value: Any) -> Any:
+    # NumPy 标量与数组
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def report_data(result: Dict[str, Any], complexity: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    报告概要的结构化数据（不含摄像头位置）
+
+    Args:
+        result: 摄像头计算结果（字典或 LayoutResult）
+        complexity: estimate_installation_complexity 的结果
+
+    Returns:
+        Dict: 项目、摄像头配置、覆盖、成本、安装信息和安装建议
+    """
+    sandbox = result['sandbox_dimensions']
+    coverage = result['coverage_per_camera']
+    return {
+        'title': REPORT_TITLE,
+        'project': {
+            'sandbox_width': sandbox['width'],
+            'sandbox_height': sandbox['height'],
+            'sandbox_area': sandbox['area']
+        },
+        'cameras': {
+            'total_cameras': result['total_cameras'],
+            'cameras_x': result['cameras_x'],
+            'cameras_y': result['cameras_y'],
+            'camera_height': coverage['camera_height'],
+            'horizontal_fov': coverage['horizontal_fov'],
+            'vertical_fov': coverage['vertical_fov'],
+            'camera_price': result['camera_price']
+        },
+        'coverage': {
+            'coverage_width': coverage['width'],
+            'coverage_height': coverage['height'],
+            'coverage_area': coverage['area'],
+            'coverage_ratio': result['coverage_ratio'],
+            'overlap_ratio': result['overlap_ratio']
+        },
+        'cost': {
+            'equipment_cost': result['total_cost'],
+            'labor_cost': complexity['labor_cost'],
+            'total_cost': result['total_cost'] + complexity['labor_cost']
+        },
+        'installation': {
+            'complexity_level': complexity['complexity_level'],
+            'installation_time': complexity['installation_time']
+        },
+        'recommendations': list(complexity['recommendations'])
+    }
+
+
+def _iter_json(result: Dict[str, Any], complexity: Dict[str, Any], chunk_size: int) -> Iterator[str]:
+    header = json.dumps(report_data(result, complexity), ensure_ascii=False, default=_json_default)
+    # 去掉末尾的 '}'，摄像头位置作为最后一个字段分块输出
+    yield header[:-1] + ', "camera_positions": ['
+    separator = ''
+    for _, rows in _iter_position_rows(result, chunk_size):
+        yield separator + ', '.join([_JSON_ROW % (x, y, z) for x, y, z in rows])
+        separator = ', '
+    yield ']}\n'
+
+
+def _iter_csv(result: Dict[str, Any], complexity: Dict[str, Any], chunk_size: int) -> Iterator[str]:
+    yield ','.join(CSV_HEADER) + '\n'
+    for start, rows in _iter_position_rows(result, chunk_size):
+        yield ''.join([_CSV_ROW % (i, x, y, z) for i, (x, y, z) in enumerate(rows, start)])
+
+
+_WRITERS = {'text': _iter_text, 'markdown': _iter_markdown, 'json': _iter_json, 'csv': _iter_csv}
+
+
+def iter_report(result: Dict[str, Any], complexity: Dict[str, Any], fmt: str = 'text',
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    分块生成配置报告
+
+    Args:
+        result: 摄像头计算结果（字典或 LayoutResult）
+        complexity: estimate_installation_complexity 的结果
+        fmt: 'text'、'markdown'、'json' 或 'csv'（仅摄像头位置附表）
+        chunk_size: 每块包含的摄像头位置数量
+
+    Yields:
+        str: 报告文本片段，依次拼接即为完整报告
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的报告格式: {fmt}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size 必须大于等于1")
+    return _WRITERS[fmt](result, complexity, chunk_size)
+
+
+@timed('report.write_report')
+def write_report(result: Dict[str, Any], complexity: Dict[str, Any], destination: Destination,
+                 fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Destination:
+    """
+    将配置报告逐块写入文件或文本流
+
+    Args:
+        result: 摄像头计算结果（字典或 LayoutResult）
+        complexity: estimate_installation_complexity 的结果
+        destination: 文件路径或文本流
+        fmt: 报告格式（默认按文件扩展名判断，流默认为 'text'）
+        chunk_size: 每块包含的摄像头位置数量
+
+    Returns:
+        destination
+    """
+    if hasattr(destination, 'write'):
+        for chunk in iter_report(result, complexity, fmt or 'text', chunk_size):
+            destination.write(chunk)
+        return destination
+
+    fmt = fmt or detect_report_format(destination)
+    chunks = iter_report(result, complexity, fmt, chunk_size)
+    directory = os.path.dirname(os.fspath(destination))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # CSV 带 BOM，便于 Excel 正确识别中文
+    encoding = 'utf-8-sig' if fmt == 'csv' else 'utf-8'
+    with open(destination, 'w', encoding=encoding, newline='') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return destination
+
+
+def generate_report(result: Dict[str, Any], complexity: Dict[str, Any], fmt: str = 'text') -> str:
+    """
+    生成完整的配置报告文本
+
+    Args:
+        result: 摄像头计算结果（字典或 LayoutResult）
+        complexity: estimate_installation_complexity 的结果
+        fmt: 'text'、'markdown'、'json' 或 'csv'
+
+    Returns:
+        str: 报告内容
+    """
+    return ''.join(iter_report(result, complexity, fmt))
@@ -0,0 +1,525 @@
+"""
+场景流水线模块
+逐行读取场景（CSV / JSON-lines），按固定大小的分块向量化计算，并逐块写出结果；
+读取、计算和写出之间使用有界队列，内存占用与输入规模无关
+"""
+
+import csv
+import json
+import math
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from camera_calculator import (
+    CameraCalculator,
+    calculate_viewing_angle_from_lens,
+    estimate_installation_complexity,
+    estimate_installation_cost_batch,
+)
+
+
+# 场景参数及默认值（None 表示必填），顺序与 calculate_camera_count_batch 一致
+SCENARIO_FIELDS = (
+    ('sandbox_width', None),
+    ('sandbox_height', None),
+    ('camera_height', None),
+    ('horizontal_fov', None),
+    ('vertical_fov', None),
+    ('overlap_ratio', 0.2),
+    ('camera_price', 2000.0),
+)
+
+# 未给出视场角时，可由镜头焦距和传感器尺寸换算
+LENS_FIELDS = {
+    'horizontal_fov': 'sensor_width',
+    'vertical_fov': 'sensor_height',
+}
+
+# 输出字段（CSV 列顺序）
+OUTPUT_FIELDS = (
+    'id', 'sandbox_width', 'sandbox_height', 'camera_height', 'horizontal_fov', 'vertical_fov',
+    'overlap_ratio', 'camera_price', 'total_cameras', 'cameras_x', 'cameras_y',
+    'coverage_width', 'coverage_height', 'spacing_x', 'spacing_y', 'coverage_ratio',
+    'total_cost', 'complexity_level', 'installation_time', 'labor_cost', 'charts', 'error',
+)
+
+# 批量结果列 -> 输出字段（与 OUTPUT_FIELDS 中的顺序一致）
+BATCH_FIELDS = (
+    ('total_cameras', 'total_cameras'),
+    ('cameras_x', 'cameras_x'),
+    ('cameras_y', 'cameras_y'),
+    ('coverage_width', 'coverage_width'),
+    ('coverage_height', 'coverage_height'),
+    ('spacing_x', 'spacing_x'),
+    ('spacing_y', 'spacing_y'),
+    ('coverage_ratio', 'coverage_ratio'),
+    ('total_cost', 'total_cost'),
+)
+
+# 复杂度因子 -> 复杂度等级（与 estimate_installation_complexity 一致）
+COMPLEXITY_LEVELS = {1.0: "简单", 1.2: "中等", 1.5: "复杂", 2.0: "非常复杂"}
+
+# 支持的图表类型 -> CameraVisualizer 方法
+CHART_METHODS = {
+    'layout': 'create_layout_plot',
+    '3d': 'create_3d_visualization',
+    'heatmap': 'create_coverage_heatmap',
+}
+
+INPUT_FORMATS = ('csv', 'jsonl')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# 单个场景的参数或计算错误，记录在输出的 error 字段中而不中断批处理
+SCENARIO_ERRORS = (ValueError, ZeroDivisionError, OverflowError)
+
+# 每个工作进程复用一个计算器和可视化器
+_calculator = None
+_visualizer = None
+
+_END = object()
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def _number(value: Any, name: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"参数 {name} 不是有效数字: {value!r}")
+    if not math.isfinite(number):
+        raise ValueError(f"参数 {name} 不是有效数字: {value!r}")
+    return number
+
+
+def _positive(value: Any, name: str) -> float:
+    number = _number(value, name)
+    if number <= 0:
+        raise ValueError(f"参数 {name} 必须大于0: {value!r}")
+    return number
+
+
+def parse_scenario(record: Dict[str, Any]) -> Dict[str, float]:
+    """
+    将输入记录转换为计算参数
+
+    CSV 中的空单元格视为未提供；视场角缺失时使用 focal_length 与
+    sensor_width/sensor_height（毫米，均须大于0）换算。
+
+    Args:
+        record: 输入记录（CSV 行或 JSON 对象）
+
+    Returns:
+        Dict: calculate_camera_count 的参数
+    """
+    values = {key: value for key, value in record.items() if value not in (None, '')}
+    params = {}
+    for name, default in SCENARIO_FIELDS:
+        if name in values:
+            params[name] = _number(values[name], name)
+        elif name in LENS_FIELDS and 'focal_length' in values and LENS_FIELDS[name] in values:
+            params[name] = calculate_viewing_angle_from_lens(
+                _positive(values['focal_length'], 'focal_length'),
+                _positive(values[LENS_FIELDS[name]], LENS_FIELDS[name])
+            )
+        elif default is not None:
+            params[name] = default
+        else:
+            raise ValueError(f"场景缺少参数: {name}")
+    return params
+
+
+def detect_format(path: str, default: str) -> str:
+    """按文件扩展名判断格式"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson', 'json'):
+        return 'jsonl'
+    if extension in ('csv', 'txt'):
+        return 'csv'
+    return default
+
+
+def read_scenarios(stream: TextIO, input_format: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐行读取场景记录
+
+    Args:
+        stream: 文本输入流
+        input_format: 'csv'（首行为表头）或 'jsonl'（每行一个JSON对象）
+
+    Yields:
+        Dict: 场景记录
+    """
+    if input_format == 'csv':
+        for row in csv.DictReader(stream):
+            yield {key.strip(): value.strip() if isinstance(value, str) else value
+                   for key, value in row.items() if key}
+    else:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"第{line_number}行不是有效的JSON: {e}")
+            if not isinstance(record, dict):
+                raise ValueError(f"第{line_number}行不是JSON对象")
+            yield record
+
+
+def chunked(records: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """将记录流切分为固定大小的分块（最后一块可能较小）"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chart_filename(scenario_id: str, chart: str) -> str:
+    safe_id = re.sub(r'[^\w.-]+', '_', scenario_id).strip('._') or 'scenario'
+    return f"{safe_id}_{chart}.png"
+
+
+def compute_record(index: int, record: Dict[str, Any],
+                   charts: Iterable[str] = (), chart_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    逐个计算单个场景并生成输出记录；参数错误记录在 error 字段中而不中断批处理
+
+    Args:
+        index: 场景序号（从1开始，记录没有 id 时用作编号）
+        record: 输入记录
+        charts: 需要生成的图表类型
+        chart_dir: 图表输出目录
+
+    Returns:
+        Dict: 输出记录（字段见 OUTPUT_FIELDS）
+    """
+    global _calculator
+
+    scenario_id = str(record.get('id') or index)
+    try:
+        params = parse_scenario(record)
+        if _calculator is None:
+            _calculator = CameraCalculator()
+        # 只需要数量和成本，位置按需生成
+        result = _calculator.calculate_layout(**params)
+    except SCENARIO_ERRORS as e:
+        return {'id': scenario_id, 'error': str(e)}
+
+    complexity = estimate_installation_complexity(
+        result['total_cameras'], result['sandbox_dimensions']['area']
+    )
+    output = {'id': scenario_id, **params}
+    output.update({
+        'total_cameras': result['total_cameras'],
+        'cameras_x': result['cameras_x'],
+        'cameras_y': result['cameras_y'],
+        'coverage_width': result['coverage_per_camera']['width'],
+        'coverage_height': result['coverage_per_camera']['height'],
+        'spacing_x': result['spacing_x'],
+        'spacing_y': result['spacing_y'],
+        'coverage_ratio': result['coverage_ratio'],
+        'total_cost': result['total_cost'],
+        'complexity_level': complexity['complexity_level'],
+        'installation_time': complexity['installation_time'],
+        'labor_cost': complexity['labor_cost'],
+    })
+    if charts and chart_dir:
+        output['charts'] = _render_charts(scenario_id, result, charts, chart_dir)
+    return output
+
+
+def _render_charts(scenario_id: str, result, charts: Iterable[str], chart_dir: str) -> Dict[str, str]:
+    global _visualizer
+
+    if _visualizer is None:
+        from camera_visualizer import CameraVisualizer
+        _visualizer = CameraVisualizer()
+    paths = {}
+    for chart in charts:
+        path = os.path.join(chart_dir, _chart_filename(scenario_id, chart))
+        getattr(_visualizer, CHART_METHODS[chart])(result, output='bytes', destination=path)
+        paths[chart] = path
+    return paths
+
+
+def compute_chunk(records: List[Dict[str, Any]], start_index: int = 1,
+                  charts: Iterable[str] = (), chart_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    向量化计算一个分块的场景
+
+    有效场景一次性交给 calculate_camera_count_batch，结果与 compute_record 逐项一致；
+    参数无法解析或计算出错（如视场角为0）的场景回退到逐个计算以得到相同的错误信息。
+
+    Args:
+        records: 输入记录
+        start_index: 第一条记录的序号
+        charts: 需要生成的图表类型
+        chart_dir: 图表输出目录
+
+    Returns:
+        List[Dict]: 与输入顺序一致的输出记录
+    """
+    import numpy as np
+
+    global _calculator
+
+    outputs: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    valid, params_list = [], []
+    for offset, record in enumerate(records):
+        try:
+            params_list.append(parse_scenario(record))
+            valid.append(offset)
+        except SCENARIO_ERRORS as e:
+            outputs[offset] = {'id': str(record.get('id') or start_index + offset), 'error': str(e)}
+
+    if valid:
+        if _calculator is None:
+            _calculator = CameraCalculator()
+        columns = {
+            name: np.fromiter((params[name] for params in params_list), dtype=np.float64,
+                              count=len(params_list))
+            for name, _ in SCENARIO_FIELDS
+        }
+        batch = _calculator.calculate_camera_count_batch(**columns)
+        # 逐个计算时会抛出除零/溢出异常的场景在批量结果中标记为无效
+        ok = batch['valid']
+        installation = estimate_installation_cost_batch(batch['total_cameras'])
+
+        field_values = [(field, batch[column].tolist()) for field, column in BATCH_FIELDS]
+        factors = installation['complexity_factor'].tolist()
+        times = installation['installation_time'].tolist()
+        labor = installation['labor_cost'].tolist()
+        ok = ok.tolist()
+
+        for position, offset in enumerate(valid):
+            record = records[offset]
+            index = start_index + offset
+            if not ok[position]:
+                outputs[offset] = compute_record(index, record, charts, chart_dir)
+                continue
+            output = {'id': str(record.get('id') or index), **params_list[position]}
+            for field, values in field_values:
+                output[field] = values[position]
+            output['complexity_level'] = COMPLEXITY_LEVELS[factors[position]]
+            output['installation_time'] = times[position]
+            output['labor_cost'] = labor[position]
+            if charts and chart_dir:
+                layout = _calculator.calculate_layout(**params_list[position])
+                output['charts'] = _render_charts(output['id'], layout, charts, chart_dir)
+            outputs[offset] = output
+    return outputs
+
+
+class ResultWriter:
+    """逐条写出结果记录；flush() 在每个分块写完后调用，便于下游边读边处理"""
+
+    def __init__(self, stream: TextIO, output_format: str):
+        """
+        Args:
+            stream: 文本输出流
+            output_format: 'jsonl' 或 'csv'
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self.rows = 0
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.output_format == 'csv':
+            if 'charts' in record:
+                record = dict(record, charts=';'.join(record['charts'].values()))
+            self._csv.writerow(record)
+        else:
+            self.stream.write(_json_encoder.encode(record) + '\n')
+        self.rows += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+        self.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class ProgressReporter:
+    """按时间间隔输出处理进度（行数、失败数、吞吐量）"""
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = 2.0):
+        """
+        Args:
+            stream: 进度输出流（默认标准错误）
+            interval: 两次输出之间的最短间隔（秒）
+        """
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, stats: Dict[str, Any], final: bool = False) -> None:
+        now = time.perf_counter()
+        if not final and now - self._last < self.interval:
+            return
+        self._last = now
+        prefix = "完成" if final else "进度"
+        print(f"{prefix}: 已处理 {stats['rows']} 个场景（失败 {stats['errors']} 个），"
+              f"{stats['rows_per_second']:,.0f} 个/秒，耗时 {stats['elapsed']:.2f} 秒",
+              file=self.stream, flush=True)
+
+
+def _read_ahead(chunks: Iterator[List[Dict[str, Any]]], buffer: queue.Queue,
+                stop: threading.Event) -> None:
+    """后台读取线程：队列满时阻塞，读取速度受下游处理速度约束"""
+    try:
+        for chunk in chunks:
+            while not stop.is_set():
+                try:
+                    buffer.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+        item = _END
+    except BaseException as e:
+        item = e
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _iter_buffered(chunks: Iterator[List[Dict[str, Any]]], max_pending: int) -> Iterator[List[Dict[str, Any]]]:
+    """在后台线程中预读至多 max_pending 个分块，读取异常在消费端重新抛出"""
+    buffer: queue.Queue = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read_ahead, args=(chunks, buffer, stop), daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # 下游提前结束时通知读取线程退出（线程可能仍阻塞在输入流上，因此不等待）
+        stop.set()
+
+
+def iter_results(records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: int = 1, max_pending: Optional[int] = None,
+                 charts: Iterable[str] = (), chart_dir: Optional[str] = None,
+                 progress: Optional[Callable[..., None]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    流水线主体：按输入顺序逐块返回计算结果
+
+    读取在后台线程中进行；最多 max_pending 个分块在读取队列中等待、
+    max_pending 个分块在进程池中计算，下游消费变慢时上游自动阻塞，
+    因此内存占用只与 chunk_size × max_pending 有关。
+
+    Args:
+        records: 场景记录（可为任意长度的迭代器）
+        chunk_size: 每个向量化分块的场景数
+        workers: 进程数（1 表示在当前进程计算）
+        max_pending: 排队和计算中的分块上限（默认 workers×2）
+        charts: 需要生成的图表类型
+        chart_dir: 图表输出目录
+        progress: 进度回调，参数为统计字典和 final 标志（见 ProgressReporter）
+
+    Yields:
+        List[Dict]: 一个分块的输出记录
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size 必须大于等于1")
+    max_pending = max(1, max_pending or workers * 2)
+    charts = tuple(charts)
+    if charts and chart_dir:
+        os.makedirs(chart_dir, exist_ok=True)
+
+    stats = {'rows': 0, 'errors': 0, 'chunks': 0, 'elapsed': 0.0, 'rows_per_second': 0.0}
+    start = time.perf_counter()
+
+    def account(outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stats['chunks'] += 1
+        stats['rows'] += len(outputs)
+        stats['errors'] += sum(1 for output in outputs if 'error' in output)
+        stats['elapsed'] = time.perf_counter() - start
+        stats['rows_per_second'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+        if progress is not None:
+            progress(dict(stats))
+        return outputs
+
+    chunks = _iter_buffered(chunked(records, chunk_size), max_pending)
+    try:
+        if workers <= 1:
+            start_index = 1
+            for chunk in chunks:
+                yield account(compute_chunk(chunk, start_index, charts, chart_dir))
+                start_index += len(chunk)
+        else:
+            # 读取线程已在运行，fork 可能复制其持有的锁，因此以 spawn 方式启动工作进程
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                pending = deque()
+                start_index = 1
+                for chunk in chunks:
+                    pending.append(executor.submit(compute_chunk, chunk, start_index, charts, chart_dir))
+                    start_index += len(chunk)
+                    if len(pending) >= max_pending:
+                        yield account(pending.popleft().result())
+                while pending:
+                    yield account(pending.popleft().result())
+    finally:
+        chunks.close()
+
+    if progress is not None:
+        progress(dict(stats), final=True)
+
+
+def run_pipeline(source: TextIO, sink: TextIO, input_format: str = 'csv',
+                 output_format: str = 'jsonl', **options) -> Dict[str, Any]:
+    """
+    从输入流读取场景、计算并写出结果
+
+    Args:
+        source: 输入文本流
+        sink: 输出文本流
+        input_format: 输入格式（'csv' 或 'jsonl'）
+        output_format: 输出格式（'jsonl' 或 'csv'）
+        **options: 传给 iter_results 的参数（chunk_size、workers、max_pending、charts、chart_dir、progress）
+
+    Returns:
+        Dict: 场景总数、失败数和耗时（秒）
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"不支持的输入格式: {input_format}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+
+    start = time.perf_counter()
+    writer = ResultWriter(sink, output_format)
+    errors = 0
+    for outputs in iter_results(read_scenarios(source, input_format), **options):
+        writer.write_many(outputs)
+        errors += sum(1 for output in outputs if 'error' in output)
+    return {'rows': writer.rows, 'errors': errors, 'elapsed': time.perf_counter() - start}
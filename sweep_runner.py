@@ -0,0 +1,248 @@
+"""
+多场地参数扫描运行器
+将场景参数网格分片到多进程并行计算（大网格再按行分块，各进程只展开自己负责的行），
+结果按场景哈希写入 .npz 文件，重复运行时跳过已完成的分片
+
+用法:
+    python -m sweep_runner scenarios.json --output sweep_results --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from camera_calculator import CameraCalculator
+
+
+# 参与计算的参数及默认值，顺序与 calculate_camera_count_batch 一致
+PARAMETERS = (
+    ('sandbox_width', None),
+    ('sandbox_height', None),
+    ('camera_height', None),
+    ('horizontal_fov', None),
+    ('vertical_fov', None),
+    ('overlap_ratio', 0.2),
+    ('camera_price', 2000.0),
+)
+
+# 每个计算任务的最大行数，超过的场景网格拆分为多个任务
+DEFAULT_CHUNK_ROWS = 262144
+
+
+def scenario_key(scenario: Dict[str, Any]) -> str:
+    """
+    计算场景的稳定哈希键
+
+    按 PARAMETERS 取出参与计算的参数值（补全默认值、统一为浮点数组）后再哈希，
+    因此 2 与 2.0、标量与单元素列表、键顺序不同的同一场景得到相同的键。
+
+    Args:
+        scenario: 场景参数字典（值可为标量或列表）
+
+    Returns:
+        str: 16位十六进制哈希
+    """
+    normalized = [[name, value.tolist()]
+                  for (name, _), value in zip(PARAMETERS, scenario_values(scenario))]
+    canonical = json.dumps(normalized, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def scenario_values(scenario: Dict[str, Any]) -> List[np.ndarray]:
+    """按 PARAMETERS 顺序返回各参数的取值数组（缺省参数使用默认值）"""
+    values = []
+    for name, default in PARAMETERS:
+        value = scenario.get(name, default)
+        if value is None:
+            raise ValueError(f"场景缺少参数: {name}")
+        values.append(np.atleast_1d(np.asarray(value, dtype=np.float64)).ravel())
+    return values
+
+
+def scenario_size(scenario: Dict[str, Any]) -> int:
+    """场景网格的组合总数"""
+    return int(np.prod([len(value) for value in scenario_values(scenario)]))
+
+
+def expand_scenario(scenario: Dict[str, Any], start: int = 0,
+                    stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    将场景中的列表参数展开为笛卡尔积网格
+
+    Args:
+        scenario: 场景参数字典，列表值表示需要扫描的取值
+        start: 起始行（组合按 meshgrid(indexing='ij') 展平后的顺序编号）
+        stop: 结束行（不含，默认到最后一行）
+
+    Returns:
+        Dict: 每个参数对应一个一维数组，长度为 stop - start
+    """
+    values = scenario_values(scenario)
+    shape = tuple(len(value) for value in values)
+    stop = int(np.prod(shape)) if stop is None else stop
+    indices = np.unravel_index(np.arange(start, stop), shape)
+    return {name: value[index] for (name, _), value, index in zip(PARAMETERS, values, indices)}
+
+
+def run_scenario(scenario: Dict[str, Any], start: int = 0,
+                 stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    计算单个场景网格的全部组合（或 [start, stop) 行）
+
+    Returns:
+        Dict: 输入参数列与计算结果列
+    """
+    columns = expand_scenario(scenario, start, stop)
+    batch = CameraCalculator().calculate_camera_count_batch(**columns)
+    columns.update(batch)
+    return columns
+
+
+def _run_chunk(key: str, scenario: Dict[str, Any], start: int,
+               stop: int) -> Tuple[str, int, Dict[str, np.ndarray]]:
+    """进程池工作函数：计算场景的一段行"""
+    return key, start, run_scenario(scenario, start, stop)
+
+
+class ResultStore:
+    """按场景哈希存放 .npz 结果的目录"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def save(self, key: str, scenario: Dict[str, Any], columns: Dict[str, np.ndarray]) -> str:
+        """原子写入结果文件，避免中断时留下不完整的分片"""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, scenario=np.array(json.dumps(scenario, sort_keys=True, ensure_ascii=False)),
+                     **columns)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, key: str) -> Dict[str, np.ndarray]:
+        with np.load(self.path(key)) as data:
+            return {name: data[name] for name in data.files if name != 'scenario'}
+
+
+def run_sweep(scenarios: Iterable[Dict[str, Any]], store: ResultStore,
+              workers: Optional[int] = None,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+    """
+    并行运行场景扫描，按完成顺序逐个返回分片状态
+
+    重复的场景（哈希相同）只计算或报告一次；组合数超过 chunk_rows 的场景拆分为多个任务，
+    各进程只展开并返回自己负责的行，主进程收齐后写入结果文件。
+
+    Args:
+        scenarios: 场景列表
+        store: 结果存储
+        workers: 进程数（默认使用全部CPU核心）
+        chunk_rows: 每个计算任务的最大行数
+
+    Yields:
+        Dict: 分片键、状态（'cached' 或 'computed'）、行数和结果文件路径
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows 必须大于等于1")
+
+    seen = set()
+    pending = {}
+    for scenario in scenarios:
+        key = scenario_key(scenario)
+        if key in seen:
+            continue
+        seen.add(key)
+        if store.has(key):
+            yield {'key': key, 'status': 'cached', 'rows': None, 'path': store.path(key)}
+        else:
+            pending[key] = scenario
+
+    if not pending:
+        return
+
+    sizes = {key: scenario_size(scenario) for key, scenario in pending.items()}
+    # 各场景已收到的行数和按列预分配的结果
+    received = dict.fromkeys(pending, 0)
+    results: Dict[str, Dict[str, np.ndarray]] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_chunk, key, scenario, start, min(start + chunk_rows, sizes[key]))
+            for key, scenario in pending.items()
+            for start in range(0, max(sizes[key], 1), chunk_rows)
+        ]
+        for future in as_completed(futures):
+            key, start, chunk = future.result()
+            rows = int(chunk['total_cameras'].size)
+            if key not in results:
+                results[key] = {
+                    name: np.empty((sizes[key],) + column.shape[1:], dtype=column.dtype)
+                    for name, column in chunk.items()
+                }
+            for name, column in chunk.items():
+                results[key][name][start:start + rows] = column
+            received[key] += rows
+            if received[key] < sizes[key]:
+                continue
+
+            path = store.save(key, pending[key], results.pop(key))
+            yield {
+                'key': key,
+                'status': 'computed',
+                'rows': sizes[key],
+                'path': path
+            }
+
+
+def load_scenarios(path: str) -> List[Dict[str, Any]]:
+    """读取场景文件：JSON数组或每行一个JSON对象"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if content.startswith('['):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="摄像头参数扫描运行器")
+    parser.add_argument('scenarios', help="场景文件（JSON数组或JSON-lines）")
+    parser.add_argument('--output', default=os.path.join('output', 'sweeps'), help="结果目录")
+    parser.add_argument('--workers', type=int, default=None, help="进程数（默认全部CPU核心）")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"每个计算任务的最大行数（默认 {DEFAULT_CHUNK_ROWS}）")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    store = ResultStore(args.output)
+
+    start = time.perf_counter()
+    counts = {'cached': 0, 'computed': 0}
+    for index, shard in enumerate(run_sweep(scenarios, store, args.workers, args.chunk_rows), 1):
+        counts[shard['status']] += 1
+        rows = f"{shard['rows']}行" if shard['rows'] is not None else "已缓存"
+        print(f"[{index}] {shard['key']} {rows} -> {shard['path']}")
+
+    elapsed = time.perf_counter() - start
+    print(f"完成: 计算 {counts['computed']} 个分片，跳过 {counts['cached']} 个已缓存分片，"
+          f"耗时 {elapsed:.2f} 秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""测试配置：将项目根目录加入模块搜索路径（项目模块为顶层模块）"""
+
+import os
+import sys
+
+import matplotlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+matplotlib.use('Agg')
@@ -0,0 +1,71 @@
+"""calculation_cache 测试"""
+
+from calculation_cache import CachedCameraCalculator, LRUCache
+from camera_calculator import CameraCalculator
+
+LAYOUT = (10, 8, 3, 60, 45)
+
+
+def test_quantized_keys_hit_and_results_match_uncached():
+    cache = LRUCache(maxsize=16, digits=6)
+    calculator = CachedCameraCalculator(cache)
+
+    first = calculator.calculate_camera_count(*LAYOUT)
+    misses = cache.stats()['misses']
+    assert misses > 0 and cache.stats()['hits'] == 0
+
+    # 量化后相同的参数命中同一条目
+    second = calculator.calculate_camera_count(10.0000000001, 8, 3.0, 60, 45)
+    stats = cache.stats()
+    assert stats['misses'] == misses and stats['hits'] > 0
+    assert second == first == CameraCalculator().calculate_camera_count(*LAYOUT)
+
+    # 超出量化精度的差异视为不同参数
+    calculator.calculate_camera_count(10.001, 8, 3, 60, 45)
+    assert cache.stats()['misses'] > misses
+
+
+def test_camera_count_and_layout_share_one_entry():
+    cache = LRUCache(maxsize=16)
+    calculator = CachedCameraCalculator(cache)
+    calculator.calculate_layout(*LAYOUT)
+    size = len(cache)
+    calculator.calculate_camera_count(*LAYOUT)
+    calculator.calculate_camera_count(*LAYOUT, lazy_positions=True)
+    assert len(cache) == size
+
+
+def test_mutating_results_does_not_corrupt_cache():
+    calculator = CachedCameraCalculator(LRUCache(maxsize=16))
+    expected = CameraCalculator().calculate_camera_count(*LAYOUT)
+
+    result = calculator.calculate_camera_count(*LAYOUT)
+    result['total_cameras'] = -1
+    result['coverage_per_camera']['width'] = 0
+    result['sandbox_dimensions']['area'] = 0
+    result['camera_positions'].clear()
+
+    layout = calculator.calculate_layout(*LAYOUT)
+    layout.coverage_per_camera['height'] = 0
+    layout.total_cost = 0
+
+    assert calculator.calculate_camera_count(*LAYOUT) == expected
+    assert calculator.calculate_coverage_area(3, 60, 45) == expected['coverage_per_camera']
+    assert calculator.calculate_layout(*LAYOUT).to_dict() == expected
+
+
+def test_lru_eviction_counts_and_order():
+    cache = LRUCache(maxsize=2, digits=3)
+    calculator = CachedCameraCalculator(cache)
+    for height in (2.0, 2.5, 3.0):
+        calculator.calculate_layout(10, 8, height, 60, 45)
+    # 每次布局计算占用覆盖范围和布局两个条目
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 4
+
+    cache.put(('a',), 1)
+    cache.put(('b',), 2)
+    assert cache.get(('a',)) == 1
+    cache.put(('c',), 3)
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == 1 and cache.get(('c',)) == 3
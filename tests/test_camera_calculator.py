@@ -0,0 +1,172 @@
+"""camera_calculator 的行为测试"""
+
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+from camera_calculator import CameraCalculator, layout_positions
+
+# (sandbox_width, sandbox_height, camera_height, horizontal_fov, vertical_fov, overlap_ratio, camera_price)
+VALID_ROWS = [
+    (10, 8, 3, 60, 45, 0.2, 2000),
+    (13.5, 3.9, 3, 60, 45, 0.2, 2000),
+    (110, 49.5, 3, 60, 45, 0.1, 1999.5),
+    (2, 2, 5, 90, 90, 0.0, 100),
+    (0.5, 40, 2.2, 120, 30, 0.35, 3500),
+    (-5, 71.552, 3, 6.7, 45, 0.2, 2000.5),
+]
+
+# 逐个计算会抛出 ZeroDivisionError 的参数
+INVALID_ROWS = [
+    (10, 8, 3, 0, 45, 0.2, 2000),
+    (10, 8, 3, 60, 0, 0.2, 2000),
+    (10, 8, 3, 60, 45, 1.0, 2000),
+    (10, 8, 0, 60, 45, 0.2, 2000),
+]
+
+BATCH_COLUMNS = ('total_cameras', 'cameras_x', 'cameras_y', 'spacing_x', 'spacing_y',
+                 'coverage_ratio', 'total_cost')
+
+
+def _columns(rows):
+    return [np.array(values, dtype=np.float64) for values in zip(*rows)]
+
+
+def test_batch_matches_scalar_and_flags_invalid_rows():
+    rows = VALID_ROWS + INVALID_ROWS
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        batch = CameraCalculator().calculate_camera_count_batch(*_columns(rows))
+
+    for index, row in enumerate(rows):
+        if row in INVALID_ROWS:
+            with pytest.raises(ZeroDivisionError):
+                CameraCalculator().calculate_camera_count(*row)
+            assert not batch['valid'][index]
+            assert batch['total_cameras'][index] == -1
+            assert batch['cameras_x'][index] == -1 and batch['cameras_y'][index] == -1
+            assert math.isnan(batch['total_cost'][index])
+            assert math.isnan(batch['coverage_ratio'][index])
+            continue
+        expected = CameraCalculator().calculate_camera_count(*row)
+        assert batch['valid'][index]
+        for column in BATCH_COLUMNS:
+            assert batch[column][index].item() == expected[column], (row, column)
+
+
+def test_batch_positions_match_scalar_layout():
+    calculator = CameraCalculator()
+    heights = (2.0, 3.0, 4.0)
+    batch = calculator.calculate_camera_count_batch(10, 8, np.array(heights), 60, 45,
+                                                    include_positions=True)
+    assert batch['total_cameras'].shape == (3,)
+    for height, positions in zip(heights, batch['camera_positions']):
+        expected = calculator.calculate_camera_count(10, 8, height, 60, 45)
+        np.testing.assert_array_equal(positions, layout_positions(expected))
+
+
+def test_batch_skips_positions_for_invalid_rows():
+    batch = CameraCalculator().calculate_camera_count_batch(
+        10, 8, 3, np.array([60.0, 0.0]), 45, include_positions=True
+    )
+    assert batch['valid'].tolist() == [True, False]
+    assert batch['camera_positions'][1] is None
+
+
+def test_exact_optimal_height_minimizes_cameras_then_height():
+    calculator = CameraCalculator()
+    optimal = calculator.calculate_optimal_height(10, 8, 90, 60, max_cameras=10, method='exact')
+    assert optimal['configuration']['total_cameras'] == 1
+    assert optimal['optimal_height'] == pytest.approx(8.660254, abs=1e-6)
+    # 略低于最优高度时需要更多摄像头
+    below = calculator.calculate_camera_count(10, 8, math.nextafter(optimal['optimal_height'], 0), 90, 60)
+    assert below['total_cameras'] > 1
+
+    exact = calculator.calculate_optimal_height(40, 30, 30, 20, max_cameras=1000, method='exact')
+    sweep = calculator.calculate_optimal_height(40, 30, 30, 20, max_cameras=1000)
+    assert exact['configuration']['total_cameras'] <= sweep['configuration']['total_cameras']
+    ranks = [(alt['cameras'], alt['cost'], alt['height']) for alt in exact['alternatives']]
+    assert min(ranks) == (exact['configuration']['total_cameras'], exact['configuration']['total_cost'],
+                          exact['optimal_height'])
+
+
+def test_exact_optimal_height_matches_full_breakpoint_search():
+    calculator = CameraCalculator()
+    args = (27.5, 19.5, 60, 45)
+    heights = calculator._camera_count_breakpoints(*args, 0.2, 1.0, 10.0)
+    feasible = [(calculator.calculate_camera_count(27.5, 19.5, h, 60, 45)['total_cameras'], h)
+                for h in heights]
+    feasible = [item for item in feasible if item[0] <= 40]
+    optimal = calculator.calculate_optimal_height(*args, max_cameras=40, method='exact')
+    assert (optimal['configuration']['total_cameras'], optimal['optimal_height']) == min(feasible)
+
+
+@pytest.mark.parametrize('method', ['sweep', 'exact'])
+def test_optimal_height_rejects_non_positive_min_height(method):
+    with pytest.raises(ValueError):
+        CameraCalculator().calculate_optimal_height(10, 8, 60, 45, max_cameras=20,
+                                                    method=method, min_height=0)
+
+
+def _reference_positions(sandbox_width, sandbox_height, camera_height, cameras_x, cameras_y):
+    """原 calculate_camera_count 中逐个生成字典位置的循环"""
+    spacing_x = sandbox_width / cameras_x if cameras_x > 1 else sandbox_width / 2
+    spacing_y = sandbox_height / cameras_y if cameras_y > 1 else sandbox_height / 2
+    positions = []
+    for i in range(cameras_x):
+        for j in range(cameras_y):
+            x = spacing_x * (i + 0.5) if cameras_x > 1 else sandbox_width / 2
+            y = spacing_y * (j + 0.5) if cameras_y > 1 else sandbox_height / 2
+            positions.append({'x': x, 'y': y, 'z': camera_height})
+    return positions
+
+
+@pytest.mark.parametrize('row', VALID_ROWS)
+def test_layout_result_array_matches_dict_positions(row):
+    calculator = CameraCalculator()
+    layout = calculator.calculate_layout(*row)
+    result = calculator.calculate_camera_count(*row)
+    expected = _reference_positions(row[0], row[1], row[2], layout.cameras_x, layout.cameras_y)
+
+    assert result['camera_positions'] == expected
+    assert layout.positions.shape == (len(expected), 3)
+    assert layout.positions.dtype == np.float64 and layout.positions.flags.c_contiguous
+    with pytest.raises(ValueError):
+        layout.positions[:1] = 0
+
+    assert list(layout) == list(result)
+    assert {key: layout[key] for key in layout if key != 'camera_positions'} == \
+        {key: value for key, value in result.items() if key != 'camera_positions'}
+    view = layout['camera_positions']
+    assert len(view) == len(expected) and list(view) == expected
+    if expected:
+        assert view[-1] == expected[-1] and view[1:3] == expected[1:3]
+    np.testing.assert_array_equal(np.asarray(view), layout.positions)
+    with pytest.raises(KeyError):
+        layout['missing']
+
+
+def test_layout_positions_are_generated_lazily():
+    calculator = CameraCalculator()
+    layout = calculator.calculate_layout(110, 49.5, 3, 60, 45, 0.1)
+    assert layout._positions is None
+
+    # 逐个、分块和按下标访问都不生成完整数组
+    items = list(layout.iter_positions())
+    chunks = list(layout.iter_position_chunks(7))
+    assert layout.position_at(-1) == items[-1]
+    assert all(len(chunk) <= 7 for chunk in chunks)
+    assert layout._positions is None
+
+    positions = layout.positions
+    assert layout.positions is positions
+    np.testing.assert_array_equal(np.array(items), positions)
+    np.testing.assert_array_equal(np.concatenate(chunks), positions)
+    with pytest.raises(IndexError):
+        layout.position_at(len(items))
+
+    lazy = calculator.calculate_camera_count(110, 49.5, 3, 60, 45, 0.1, lazy_positions=True)
+    assert not isinstance(lazy['camera_positions'], list)
+    assert list(lazy['camera_positions']) == [{'x': x, 'y': y, 'z': z} for x, y, z in items]
@@ -0,0 +1,41 @@
+"""camera_cli 测试"""
+
+import json
+
+from camera_cli import main
+
+HEADER = 'id,sandbox_width,sandbox_height,camera_height,horizontal_fov,vertical_fov\n'
+
+
+def _run(tmp_path, name, content, *options):
+    source = tmp_path / name
+    source.write_text(content, encoding='utf-8')
+    output = tmp_path / 'results.jsonl'
+    code = main([str(source), '--output', str(output), *options])
+    rows = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    return code, rows
+
+
+def test_error_rows_are_reported_and_set_exit_code(tmp_path, capsys):
+    content = HEADER + 'a,10,8,3,60,45\nb,abc,8,3,60,45\nc,10,8,3,60,\n'
+    for workers in ('1', '2'):
+        code, rows = _run(tmp_path, 'sites.csv', content, '--workers', workers, '--chunk-size', '1')
+        assert code == 1
+        assert [row['id'] for row in rows] == ['a', 'b', 'c']
+        assert 'error' not in rows[0] and rows[0]['total_cameras'] == 20
+        assert 'sandbox_width' in rows[1]['error']
+        assert 'vertical_fov' in rows[2]['error']
+        assert '失败 2 个' in capsys.readouterr().err
+
+
+def test_clean_input_exits_zero(tmp_path):
+    code, rows = _run(tmp_path, 'sites.csv', HEADER + 'a,10,8,3,60,45\n')
+    assert code == 0
+    assert len(rows) == 1 and 'error' not in rows[0]
+
+
+def test_malformed_input_exits_two(tmp_path, capsys):
+    source = tmp_path / 'sites.jsonl'
+    source.write_text('{"sandbox_width": 10\n', encoding='utf-8')
+    assert main([str(source), '--output', str(tmp_path / 'out.jsonl')]) == 2
+    assert '输入错误' in capsys.readouterr().err
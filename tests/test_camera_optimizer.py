@@ -0,0 +1,48 @@
+"""camera_optimizer 测试"""
+
+import numpy as np
+
+from camera_optimizer import pareto_front_mask, search_pareto_front
+
+
+def _brute_force_front(cost, count, coverage):
+    """逐对比较的参考实现，目标值完全相同时保留先出现的配置"""
+    n = cost.size
+    mask = np.ones(n, dtype=bool)
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            no_worse = cost[j] <= cost[i] and count[j] <= count[i] and coverage[j] >= coverage[i]
+            better = cost[j] < cost[i] or count[j] < count[i] or coverage[j] > coverage[i]
+            if no_worse and (better or j < i):
+                mask[i] = False
+                break
+    return mask
+
+
+def test_pareto_front_mask_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        n = int(rng.integers(1, 60))
+        # 取值离散以产生大量并列与重复
+        cost = rng.integers(1, 8, n) * 1000.0
+        count = rng.integers(1, 6, n)
+        coverage = rng.integers(0, 5, n) / 4
+        np.testing.assert_array_equal(pareto_front_mask(cost, count, coverage),
+                                      _brute_force_front(cost, count, coverage))
+
+
+def test_pareto_front_mask_empty():
+    assert pareto_front_mask([], [], []).shape == (0,)
+
+
+def test_search_pareto_front_skips_invalid_configurations():
+    front = search_pareto_front(20, 15, heights=[2.5, 3.5], focal_lengths=[4, 6],
+                                overlap_ratios=[0.1, 0.3, 1.0], camera_prices=[1500, 2000])
+    assert front['evaluated'] == 24
+    assert front['total_cameras'].size > 0
+    assert (front['total_cameras'] > 0).all()
+    assert np.isfinite(front['total_cost']).all()
+    assert (front['labor_cost'] >= 0).all()
+    assert (front['overlap_ratio'] < 1).all()
@@ -0,0 +1,114 @@
+"""camera_service 的接口测试（不经过网络，直接调用 handle）"""
+
+import asyncio
+import json
+
+from camera_service import (MAX_CHART_CAMERAS, MAX_CHART_DPI, MAX_COVERAGE_CAMERAS,
+                            MAX_POSITION_CAMERAS, CameraService)
+
+LAYOUT = {'sandbox_width': 10, 'sandbox_height': 8, 'camera_height': 3,
+          'horizontal_fov': 60, 'vertical_fov': 45}
+
+
+def _post(service, path, body):
+    status, _, payload = asyncio.run(service.handle('POST', path, json.dumps(body).encode()))
+    return status, json.loads(payload)
+
+
+def test_camera_count_omits_positions_by_default():
+    service = CameraService()
+    status, result = _post(service, '/v1/camera-count', LAYOUT)
+    assert status == 200
+    assert 'camera_positions' not in result
+
+    status, result = _post(service, '/v1/camera-count', dict(LAYOUT, include_positions=True))
+    assert status == 200
+    assert len(result['camera_positions']) == result['total_cameras']
+
+
+def test_camera_count_rejects_positions_for_huge_layouts():
+    service = CameraService()
+    huge = dict(LAYOUT, sandbox_width=10000, sandbox_height=8000)
+    status, result = _post(service, '/v1/camera-count', dict(huge, include_positions=True))
+    assert status == 400
+    assert str(MAX_POSITION_CAMERAS) in result['error']
+
+    status, result = _post(service, '/v1/camera-count', huge)
+    assert status == 200
+    assert result['total_cameras'] > MAX_POSITION_CAMERAS
+
+
+def test_optimal_height_omits_positions_and_bounds_sweep():
+    service = CameraService()
+    request = {'sandbox_width': 40, 'sandbox_height': 30, 'horizontal_fov': 60,
+               'vertical_fov': 45, 'max_cameras': 200}
+    status, result = _post(service, '/v1/optimal-height', request)
+    assert status == 200
+    assert 'camera_positions' not in result['configuration']
+    assert all('camera_positions' not in alt['result'] for alt in result['alternatives'])
+
+    status, _ = _post(service, '/v1/optimal-height', dict(request, method='sweep', max_height=1e9))
+    assert status == 400
+    status, _ = _post(service, '/v1/optimal-height', dict(request, min_height=0))
+    assert status == 400
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    service = CameraService()
+    body = json.dumps(LAYOUT).encode()
+    other = json.dumps(dict(LAYOUT, camera_height=2.5)).encode()
+
+    async def burst():
+        requests = [service.handle('POST', '/v1/camera-count', body) for _ in range(8)]
+        requests.append(service.handle('POST', '/v1/camera-count', other))
+        return await asyncio.gather(*requests)
+
+    responses = asyncio.run(burst())
+    assert all(status == 200 for status, _, _ in responses)
+    assert len({payload for _, _, payload in responses[:8]}) == 1
+    assert responses[8][2] != responses[0][2]
+    assert service.coalescer.stats() == {'executed': 2, 'coalesced': 7, 'inflight': 0}
+
+    # 完成后再次请求重新计算
+    _post(service, '/v1/camera-count', LAYOUT)
+    assert service.coalescer.stats()['executed'] == 3
+
+
+def test_coalesced_requests_share_errors():
+    from camera_service import RequestCoalescer
+
+    coalescer = RequestCoalescer()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError('bad')
+
+    async def burst():
+        return await asyncio.gather(*(coalescer.run('k', failing) for _ in range(3)),
+                                    return_exceptions=True)
+
+    errors = asyncio.run(burst())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert coalescer.stats() == {'executed': 1, 'coalesced': 2, 'inflight': 0}
+
+
+def test_coverage_and_chart_reject_oversized_requests():
+    service = CameraService()
+    status, result = _post(service, '/v1/coverage', LAYOUT)
+    assert status == 200 and result['coverage_ratio'] == 1.0
+
+    huge = dict(LAYOUT, sandbox_width=10000, sandbox_height=8000)
+    status, result = _post(service, '/v1/coverage', huge)
+    assert status == 400 and str(MAX_COVERAGE_CAMERAS) in result['error']
+    status, _ = _post(service, '/v1/coverage', dict(LAYOUT, k_values=[1, 1000]))
+    assert status == 400
+
+    status, result = _post(service, '/v1/charts/heatmap', dict(LAYOUT, sandbox_width=1000, sandbox_height=800))
+    assert status == 400 and str(MAX_CHART_CAMERAS) in result['error']
+    status, result = _post(service, '/v1/charts/layout', dict(LAYOUT, dpi=MAX_CHART_DPI * 10))
+    assert status == 400 and str(MAX_CHART_DPI) in result['error']
+
+    status, headers, image = asyncio.run(service.handle(
+        'POST', '/v1/charts/layout', json.dumps(dict(LAYOUT, preview=True)).encode()))
+    assert status == 200 and headers['Content-Type'] == 'image/png'
+    assert image.startswith(b'\x89PNG')
@@ -0,0 +1,110 @@
+"""camera_visualizer 测试"""
+
+import io
+
+import pytest
+
+from camera_visualizer import CameraVisualizer
+
+
+@pytest.fixture(scope='module')
+def visualizer():
+    return CameraVisualizer()
+
+
+@pytest.mark.parametrize('output, image_type', [('base64', str), ('bytes', bytes),
+                                                ('memoryview', memoryview)])
+def test_empty_comparison_chart_returns_requested_type(visualizer, output, image_type):
+    image = visualizer.create_comparison_chart([], output=output)
+    assert isinstance(image, image_type)
+    assert len(image) == 0
+
+
+def test_empty_comparison_chart_honors_destination(visualizer, tmp_path):
+    stream = io.BytesIO()
+    assert visualizer.create_comparison_chart([], destination=stream) is stream
+    assert stream.getvalue() == b''
+
+    path = tmp_path / 'comparison.png'
+    assert visualizer.create_comparison_chart([], destination=str(path)) == str(path)
+    assert path.read_bytes() == b''
+
+    with pytest.raises(ValueError):
+        visualizer.create_comparison_chart([], output='text')
+
+
+def _layout():
+    from camera_calculator import CameraCalculator
+    return CameraCalculator().calculate_layout(10, 8, 3, 60, 45)
+
+
+def _png_size(data):
+    from PIL import Image
+    return Image.open(io.BytesIO(data)).size
+
+
+def test_vector_and_webp_output_formats(visualizer):
+    layout = _layout()
+    svg = visualizer.create_layout_plot(layout, output='bytes', image_format='svg')
+    assert svg.lstrip().startswith(b'<?xml') and b'<svg' in svg
+    assert visualizer.last_render_info['mime_type'] == 'image/svg+xml'
+
+    webp = visualizer.create_coverage_heatmap(layout, output='bytes', image_format='webp')
+    assert webp[:4] == b'RIFF' and webp[8:12] == b'WEBP'
+    assert visualizer.last_render_info['format'] == 'webp'
+
+    with pytest.raises(ValueError):
+        visualizer.create_layout_plot(layout, image_format='gif')
+    with pytest.raises(ValueError):
+        visualizer.create_layout_plot(layout, image_format='svg', compress_level=6)
+
+
+def test_dpi_compression_and_preview(visualizer):
+    layout = _layout()
+    low = visualizer.create_layout_plot(layout, output='bytes', dpi=50)
+    high = visualizer.create_layout_plot(layout, output='bytes', dpi=100)
+    assert visualizer.last_render_info['dpi'] == 100
+    low_size, high_size = _png_size(low), _png_size(high)
+    assert high_size[0] == pytest.approx(2 * low_size[0], abs=2)
+
+    fast = visualizer.create_layout_plot(layout, output='bytes', dpi=50, compress_level=0)
+    assert _png_size(fast) == low_size and len(fast) > len(low)
+
+    preview = visualizer.create_layout_plot(layout, output='bytes', preview=True)
+    assert visualizer.last_render_info['dpi'] == 60
+    assert _png_size(preview)[0] < high_size[0]
+
+    for options in ({'dpi': 0}, {'compress_level': 10}):
+        with pytest.raises(ValueError):
+            visualizer.create_layout_plot(layout, **options)
+
+
+def test_concurrent_render_charts_match_sequential_rendering():
+    from concurrent.futures import ThreadPoolExecutor
+
+    layout = _layout()
+    visualizer = CameraVisualizer()
+    try:
+        expected = {
+            'layout': visualizer.create_layout_plot(layout, output='bytes'),
+            '3d': visualizer.create_3d_visualization(layout, output='bytes'),
+            'heatmap': visualizer.create_coverage_heatmap(layout, resolution=40, output='bytes'),
+        }
+        futures = visualizer.render_charts(layout, output='bytes',
+                                           chart_options={'heatmap': {'resolution': 40}})
+        assert {chart: future.result() for chart, future in futures.items()} == expected
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = visualizer.render_charts(layout, ('heatmap', 'layout', 'heatmap'),
+                                               executor=executor, output='bytes',
+                                               chart_options={'heatmap': {'resolution': 40}})
+            assert list(futures) == ['heatmap', 'layout']
+            assert futures['heatmap'].result() == expected['heatmap']
+
+        futures = visualizer.render_charts(layout, ('layout',), executor='process', output='memoryview')
+        assert futures['layout'].result() == expected['layout']
+
+        with pytest.raises(ValueError):
+            visualizer.render_charts(layout, ('pie',))
+    finally:
+        visualizer.close()
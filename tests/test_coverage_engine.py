@@ -0,0 +1,47 @@
+"""coverage_engine 测试"""
+
+import numpy as np
+
+from coverage_engine import _grid_union_areas, _sweep_union_areas, coverage_raster, union_areas
+
+
+def _random_rects(rng, n):
+    corners = rng.uniform(0, 20, (n, 2))
+    sizes = rng.uniform(0.5, 6, (n, 2))
+    # 部分坐标取整，制造共边和完全重合的矩形
+    corners[: n // 3] = np.round(corners[: n // 3])
+    sizes[: n // 3] = np.round(sizes[: n // 3]) + 1
+    return np.hstack([corners, corners + sizes])
+
+
+def test_grid_and_sweep_union_areas_agree():
+    rng = np.random.default_rng(3)
+    for _ in range(30):
+        rects = _random_rects(rng, int(rng.integers(1, 40)))
+        xs = np.unique(rects[:, [0, 2]])
+        ys = np.unique(rects[:, [1, 3]])
+        np.testing.assert_allclose(_grid_union_areas(rects, xs, ys, 4),
+                                   _sweep_union_areas(rects, ys, 4), rtol=1e-12, atol=1e-9)
+
+
+def test_union_areas_counts_overlap_once():
+    rects = np.array([[0, 0, 2, 2], [1, 1, 3, 3], [1, 1, 2, 2]], dtype=float)
+    np.testing.assert_allclose(union_areas(rects, 3), [7.0, 1.0, 1.0])
+
+
+def test_coverage_raster_matches_meshgrid():
+    rng = np.random.default_rng(11)
+    positions = rng.uniform(-2, 14, (25, 2))
+    width, height, sandbox_width, sandbox_height = 3.5, 2.25, 12.0, 9.0
+    resolution = (37, 23)
+
+    xx, yy = np.meshgrid(np.linspace(0, sandbox_width, resolution[0]),
+                         np.linspace(0, sandbox_height, resolution[1]))
+    expected = np.zeros(xx.shape, dtype=np.int64)
+    for x, y in positions:
+        expected += ((np.abs(xx - x) <= width / 2) & (np.abs(yy - y) <= height / 2))
+
+    for tile_rows in (None, 1, 5):
+        raster = coverage_raster(positions, width, height, sandbox_width, sandbox_height,
+                                 resolution, tile_rows=tile_rows)
+        np.testing.assert_array_equal(raster, expected)
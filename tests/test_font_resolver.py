@@ -0,0 +1,63 @@
+"""font_resolver 测试"""
+
+import os
+
+import matplotlib
+import matplotlib.font_manager as fm
+from matplotlib.figure import Figure
+
+import font_resolver
+from font_resolver import apply_font, font_directory_fingerprint, font_properties, resolve_font
+
+DEJAVU_SERIF = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf', 'DejaVuSerif.ttf')
+
+
+def test_warm_cache_does_not_register_font_twice(tmp_path):
+    cache_path = str(tmp_path / 'font.json')
+    font = resolve_font(['DejaVu Sans'], cache_path=cache_path)
+    assert font['name'] == 'DejaVu Sans'
+    registered = sum(entry.fname == font['path'] for entry in fm.fontManager.ttflist)
+
+    # 模拟新进程：清空进程内结果后从磁盘缓存加载
+    font_resolver._resolved.clear()
+    assert resolve_font(['DejaVu Sans'], cache_path=cache_path) == font
+    assert sum(entry.fname == font['path'] for entry in fm.fontManager.ttflist) == registered
+
+
+def test_apply_font_sets_file_on_all_text():
+    fig = Figure()
+    ax = fig.add_subplot(1, 1, 1)
+    ax.plot([0, 1], [0, 1], label='line')
+    ax.set_title('title', fontsize=14, fontweight='bold')
+    ax.set_xlabel('x')
+    ax.legend()
+    apply_font(fig, font_properties({'name': 'DejaVu Serif', 'path': DEJAVU_SERIF}))
+    fig.canvas.draw()
+
+    texts = [ax.title, ax.xaxis.label, *ax.get_legend().get_texts(), *ax.get_xticklabels()]
+    assert all(text.get_fontproperties().get_file() == DEJAVU_SERIF for text in texts)
+    assert ax.title.get_fontsize() == 14
+
+
+def test_visualizer_uses_resolved_font_file():
+    from camera_visualizer import CameraVisualizer, resolve_chinese_font
+
+    font = resolve_chinese_font()
+    visualizer = CameraVisualizer()
+    if font is None:
+        assert visualizer.font_properties is None
+    else:
+        assert visualizer.font_properties.get_file() == font['path']
+        assert visualizer.get_renderer('layout').font is visualizer.font_properties
+
+
+def test_fingerprint_changes_when_fonts_are_added_to_nested_directories(tmp_path):
+    nested = tmp_path / 'truetype' / 'vendor' / 'family'
+    nested.mkdir(parents=True)
+    os.utime(nested, (1_000_000, 1_000_000))
+    before = font_directory_fingerprint([str(tmp_path)])
+    assert str(nested) in before
+
+    (nested / 'NewFont.ttf').write_bytes(b'')
+    assert font_directory_fingerprint([str(tmp_path)]) != before
+    assert font_directory_fingerprint([str(tmp_path / 'missing')]) == {}
@@ -0,0 +1,88 @@
+"""image_cache 测试"""
+
+import multiprocessing
+import os
+
+from image_cache import ImageCache
+
+MAX_BYTES = 10_000
+ENTRY_BYTES = 1_000
+
+
+def _fill(directory, prefix, count):
+    cache = ImageCache(directory, MAX_BYTES)
+    for i in range(count):
+        cache.put(f"{prefix}{i:04d}", os.urandom(ENTRY_BYTES))
+
+
+def _directory_bytes(directory):
+    return sum(os.path.getsize(os.path.join(directory, name))
+               for name in os.listdir(directory) if name.endswith('.img'))
+
+
+def test_processes_sharing_a_directory_stay_within_limit(tmp_path):
+    directory = str(tmp_path)
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_fill, args=(directory, f"p{n}-", 40)) for n in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    assert _directory_bytes(directory) <= MAX_BYTES
+
+
+def test_entries_written_by_another_instance_are_hits_and_count_towards_limit(tmp_path):
+    first = ImageCache(str(tmp_path), MAX_BYTES)
+    second = ImageCache(str(tmp_path), MAX_BYTES)
+    first.put('shared', b'x' * ENTRY_BYTES)
+    assert second.get('shared') == b'x' * ENTRY_BYTES
+    assert 'shared' in second
+
+    for i in range(9):
+        first.put(f"a{i}", b'a' * ENTRY_BYTES)
+    second.put('b', b'b' * ENTRY_BYTES)
+    assert _directory_bytes(str(tmp_path)) <= MAX_BYTES
+    assert second.stats()['size_bytes'] == _directory_bytes(str(tmp_path))
+
+
+def test_writes_do_not_rescan_the_directory(tmp_path, monkeypatch):
+    cache = ImageCache(str(tmp_path), MAX_BYTES)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("目录只应在启动时扫描")
+
+    monkeypatch.setattr(os, 'scandir', fail)
+    for i in range(30):
+        cache.put(f"k{i:02d}", os.urandom(ENTRY_BYTES))
+        assert cache.get(f"k{i:02d}") is not None
+    stats = cache.stats()
+    assert stats['entries'] == len(cache) == MAX_BYTES // ENTRY_BYTES
+    assert stats['size_bytes'] == cache.total_bytes == _directory_bytes(str(tmp_path))
+    assert stats['evictions'] == 30 - MAX_BYTES // ENTRY_BYTES
+    # 最近使用的条目保留
+    assert 'k29' in cache and 'k00' not in cache
+
+
+def test_index_is_synced_with_files_on_startup(tmp_path):
+    cache = ImageCache(str(tmp_path), MAX_BYTES)
+    for i in range(3):
+        cache.put(f"k{i}", b'x' * ENTRY_BYTES)
+    cache.close()
+
+    # 外部删除的文件移出索引，索引之外的文件补录
+    os.remove(os.path.join(tmp_path, 'k0.img'))
+    with open(os.path.join(tmp_path, 'extra.img'), 'wb') as f:
+        f.write(b'y' * 500)
+
+    reopened = ImageCache(str(tmp_path), MAX_BYTES)
+    assert len(reopened) == 3
+    assert reopened.total_bytes == 2 * ENTRY_BYTES + 500
+    assert reopened.get('extra') == b'y' * 500
+
+    os.remove(os.path.join(tmp_path, 'k1.img'))
+    assert reopened.get('k1') is None
+    assert reopened.total_bytes == _directory_bytes(str(tmp_path))
+
+    reopened.clear()
+    assert len(reopened) == 0 and _directory_bytes(str(tmp_path)) == 0
@@ -0,0 +1,99 @@
+"""instrumentation 测试"""
+
+import re
+
+import pytest
+
+import instrumentation
+from camera_calculator import CameraCalculator
+
+# Prometheus 文本格式的一行样本：指标名{标签} 数值
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*\{name="(?:[^"\\]|\\.)*"\} \S+$')
+
+
+@pytest.fixture
+def enabled():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    if not was_enabled:
+        instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_instrumentation_records_nothing():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.disable()
+    instrumentation.reset()
+    try:
+        with instrumentation.timer('disabled.timer'):
+            pass
+        instrumentation.count('disabled.counter')
+        CameraCalculator().calculate_camera_count(10, 8, 3, 60, 45)
+        summary = instrumentation.summary()
+        assert summary['timers'] == {} and summary['counters'] == {}
+    finally:
+        if was_enabled:
+            instrumentation.enable()
+
+
+def test_timers_and_counters(enabled):
+    calculator = CameraCalculator()
+    for _ in range(3):
+        calculator.calculate_camera_count(10, 8, 3, 60, 45)
+    with instrumentation.timer('custom.block'):
+        pass
+    instrumentation.count('custom.events')
+    instrumentation.count('custom.events', 2)
+
+    summary = instrumentation.summary()
+    timers = summary['timers']
+    assert timers['calculator.calculate_camera_count']['count'] == 3
+    assert timers['calculator.calculate_layout']['count'] == 3
+    stats = timers['custom.block']
+    assert stats['count'] == 1 and 0 <= stats['min_ms'] <= stats['mean_ms'] <= stats['max_ms']
+    assert summary['counters'] == {'custom.events': 3}
+
+    @instrumentation.timed()
+    def failing():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert instrumentation.summary()['timers'][f"{__name__}.{failing.__qualname__}"]['count'] == 1
+
+
+def test_visualizer_cache_counters(enabled, tmp_path):
+    from camera_visualizer import CameraVisualizer
+    from image_cache import ImageCache
+
+    layout = CameraCalculator().calculate_layout(10, 8, 3, 60, 45)
+    visualizer = CameraVisualizer(image_cache=ImageCache(str(tmp_path)))
+    visualizer.create_layout_plot(layout, output='bytes', preview=True)
+    visualizer.create_layout_plot(layout, output='bytes', preview=True)
+    summary = instrumentation.summary()
+    assert summary['counters']['visualizer.layout.rendered'] == 1
+    assert summary['counters']['visualizer.layout.cache_hit'] == 1
+    assert summary['timers']['visualizer.layout.cache_lookup']['count'] == 2
+
+
+def test_prometheus_export_format(enabled):
+    instrumentation.record_time('calc"quoted"\\path', 0.25)
+    instrumentation.record_time('calc"quoted"\\path', 0.5)
+    instrumentation.count('line\nbreak', 4)
+    text = instrumentation.to_prometheus(prefix='my-app')
+
+    assert text.endswith('\n')
+    lines = text.splitlines()
+    assert '# TYPE my_app_duration_seconds summary' in lines
+    assert '# TYPE my_app_duration_max_seconds gauge' in lines
+    assert '# TYPE my_app_events_total counter' in lines
+    samples = [line for line in lines if not line.startswith('#')]
+    assert all(SAMPLE_LINE.match(line) for line in samples), samples
+
+    label = '{name="calc\\"quoted\\"\\\\path"}'
+    assert f'my_app_duration_seconds_sum{label} 0.75' in samples
+    assert f'my_app_duration_seconds_count{label} 2' in samples
+    assert f'my_app_duration_max_seconds{label} 0.5' in samples
+    assert 'my_app_events_total{name="line\\nbreak"} 4' in samples
@@ -0,0 +1,96 @@
+"""layout_renderer 增量渲染器测试"""
+
+import pytest
+
+from camera_calculator import CameraCalculator
+from camera_visualizer import LABEL_THRESHOLD, CameraVisualizer
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.fixture(scope='module')
+def visualizer():
+    return CameraVisualizer()
+
+
+def _layouts():
+    calculator = CameraCalculator()
+    return calculator.calculate_layout(10, 8, 3, 60, 45), calculator.calculate_layout(10, 8, 2.5, 60, 45)
+
+
+def _alternatives():
+    optimal = CameraCalculator().calculate_optimal_height(27.5, 19.5, 60, 45, max_cameras=200,
+                                                          method='exact')
+    return optimal['alternatives'], optimal['alternatives'][:3]
+
+
+@pytest.mark.parametrize('kind', ['layout', '3d', 'heatmap', 'comparison'])
+def test_renderer_reuses_figure_between_renders(visualizer, kind):
+    renderer = visualizer.get_renderer(kind)
+    assert visualizer.get_renderer(kind) is renderer
+    first, second = _alternatives() if kind == 'comparison' else _layouts()
+
+    image = renderer.render(first, output='bytes')
+    axes = renderer.figure.axes[0]
+    assert image.startswith(PNG_SIGNATURE)
+
+    preview = renderer.render(second, output='bytes', preview=True)
+    assert preview.startswith(PNG_SIGNATURE)
+    assert len(preview) < len(image)
+    assert renderer.figure.axes[0] is axes
+    assert set(renderer.timings) == {'static', 'update', 'draw', 'encode', 'total'}
+
+
+def test_renderers_share_label_threshold(visualizer):
+    for kind in ('layout', '3d', 'heatmap'):
+        assert visualizer.get_renderer(kind).label_threshold == LABEL_THRESHOLD
+
+
+def test_incremental_render_charts(visualizer):
+    layout, _ = _layouts()
+    futures = visualizer.render_charts(layout, ('layout', '3d', 'heatmap'), incremental=True,
+                                       output='bytes')
+    assert all(future.result().startswith(PNG_SIGNATURE) for future in futures.values())
+    with pytest.raises(ValueError):
+        visualizer.get_renderer('pie')
+
+
+def _texts(renderer):
+    return [text.get_text() for text in renderer.ax.texts]
+
+
+@pytest.mark.parametrize('kind, options', [
+    ('layout', {'show_coverage': False, 'show_overlap': False, 'label_threshold': 0}),
+    ('3d', {'label_threshold': 0}),
+    ('heatmap', {'resolution': 50, 'label_threshold': 0}),
+])
+def test_renderer_accepts_chart_options(visualizer, kind, options):
+    layout, _ = _layouts()
+    renderer = visualizer.get_renderer(kind)
+    assert renderer.render(layout, output='bytes', **options).startswith(PNG_SIGNATURE)
+    # label_threshold=0 时不绘制逐个摄像头的文字
+    assert len(_texts(renderer)) <= 1
+    if kind == 'heatmap':
+        assert renderer.image.get_array().shape == (50, 50)
+    with pytest.raises(TypeError):
+        renderer.render(layout, output='bytes', unknown_option=True)
+
+    futures = visualizer.render_charts(layout, (kind,), incremental=True, output='bytes',
+                                       chart_options={kind: options})
+    assert futures[kind].result().startswith(PNG_SIGNATURE)
+
+
+def test_layout_renderer_draws_camera_labels_like_layout_plot(visualizer):
+    layout, _ = _layouts()
+    renderer = visualizer.get_renderer('layout')
+    renderer.render(layout, output='bytes')
+    texts = _texts(renderer)
+    x, y, _ = layout.position_at(0)
+    coverage = layout.coverage_per_camera
+    assert texts.count('1') == 1
+    assert f'({x:.1f}, {y:.1f})' in texts
+    footprint = f"{coverage['width']:.1f}×{coverage['height']:.1f}m"
+    assert sum(text.split('\n')[-1] == footprint for text in texts) == layout.total_cameras
+
+    renderer.render(layout, output='bytes', show_coverage=False)
+    assert len(_texts(renderer)) == 2 * layout.total_cameras + 1
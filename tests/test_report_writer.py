@@ -0,0 +1,84 @@
+"""report_writer 测试：文本报告与原 generate_config_report 的输出一致"""
+
+import pytest
+
+from camera_calculator import CameraCalculator, estimate_installation_complexity
+from report_writer import generate_report, iter_report
+
+SCENARIOS = [
+    (10, 8, 3, 60, 45),
+    (13.5, 3.9, 3, 60, 45),
+    (110, 49.5, 3, 60, 45, 0.1, 1999.5),
+    (2, 2, 5, 90, 90),
+]
+
+
+def _baseline_report(result: dict, complexity: dict) -> str:
+    """原 main.generate_config_report 的实现，作为文本报告的基准"""
+    report = f"""
+沙盘摄像头安装配置报告
+========================
+
+项目概况
+--------
+沙盘尺寸: {result['sandbox_dimensions']['width']} × {result['sandbox_dimensions']['height']} 米
+沙盘面积: {result['sandbox_dimensions']['area']} 平方米
+
+摄像头配置
+----------
+摄像头总数: {result['total_cameras']} 个
+布局方式: {result['cameras_x']} × {result['cameras_y']} 阵列
+安装高度: {result['coverage_per_camera']['camera_height']} 米
+视场角: {result['coverage_per_camera']['horizontal_fov']}° × {result['coverage_per_camera']['vertical_fov']}°
+摄像头单价: ¥{result['camera_price']:,.0f}
+
+覆盖范围
+--------
+单摄像头覆盖: {result['coverage_per_camera']['width']:.1f} × {result['coverage_per_camera']['height']:.1f} 米
+单摄像头面积: {result['coverage_per_camera']['area']:.1f} 平方米
+总覆盖率: {result['coverage_ratio']*100:.1f}%
+重叠比例: {result['overlap_ratio']*100:.0f}%
+
+成本估算
+--------
+设备成本: ¥{result['total_cost']:,}
+人工成本: ¥{complexity['labor_cost']:,.0f}
+总成本: ¥{result['total_cost'] + complexity['labor_cost']:,.0f}
+
+安装信息
+--------
+复杂度等级: {complexity['complexity_level']}
+预计安装时间: {complexity['installation_time']:.1f} 小时
+
+摄像头位置坐标
+--------------
+"""
+
+    for i, pos in enumerate(result['camera_positions']):
+        report += f"摄像头{i+1}: ({pos['x']:.1f}, {pos['y']:.1f}, {pos['z']:.1f})\n"
+
+    report += f"""
+安装建议
+--------
+"""
+
+    for recommendation in complexity['recommendations']:
+        report += f"• {recommendation}\n"
+
+    return report
+
+
+
+
+@pytest.mark.parametrize('args', SCENARIOS)
+def test_text_report_matches_baseline(args):
+    calculator = CameraCalculator()
+    result = calculator.calculate_camera_count(*args)
+    complexity = estimate_installation_complexity(result['total_cameras'],
+                                                  result['sandbox_dimensions']['area'])
+    expected = _baseline_report(result, complexity)
+
+    assert generate_report(result, complexity) == expected
+    assert ''.join(iter_report(result, complexity, chunk_size=3)) == expected
+    # LayoutResult 不展开位置列表也得到相同文本
+    assert generate_report(calculator.calculate_layout(*args), complexity) == expected
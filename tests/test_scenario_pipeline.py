@@ -0,0 +1,49 @@
+"""scenario_pipeline 测试"""
+
+import io
+import json
+
+import pytest
+
+from scenario_pipeline import compute_chunk, compute_record, parse_scenario, run_pipeline
+
+LENS_CSV = (
+    'id,sandbox_width,sandbox_height,camera_height,focal_length,sensor_width,sensor_height\n'
+    'ok,10,8,3,4,6.4,4.8\n'
+    'zero-focal,10,8,3,0,6.4,4.8\n'
+    'zero-sensor,10,8,3,4,0,4.8\n'
+    'negative-focal,10,8,3,-4,6.4,4.8\n'
+)
+
+
+@pytest.mark.parametrize('focal_length, sensor_width', [(0, 6.4), (4, 0), ('-1', 6.4)])
+def test_parse_scenario_rejects_non_positive_lens_values(focal_length, sensor_width):
+    record = {'sandbox_width': 10, 'sandbox_height': 8, 'camera_height': 3,
+              'focal_length': focal_length, 'sensor_width': sensor_width, 'sensor_height': 4.8}
+    with pytest.raises(ValueError):
+        parse_scenario(record)
+
+
+def test_lens_errors_become_error_rows():
+    sink = io.StringIO()
+    summary = run_pipeline(io.StringIO(LENS_CSV), sink, 'csv', 'jsonl', chunk_size=2)
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [row['id'] for row in rows] == ['ok', 'zero-focal', 'zero-sensor', 'negative-focal']
+    assert 'error' not in rows[0]
+    assert 'focal_length' in rows[1]['error'] and 'sensor_width' in rows[2]['error']
+    assert 'focal_length' in rows[3]['error']
+    assert summary['rows'] == 4 and summary['errors'] == 3
+
+
+def test_chunk_matches_per_record_computation():
+    records = [
+        {'id': 'a', 'sandbox_width': '10', 'sandbox_height': '8', 'camera_height': '3',
+         'horizontal_fov': '60', 'vertical_fov': '45'},
+        {'id': 'b', 'sandbox_width': 10, 'sandbox_height': 8, 'camera_height': 3,
+         'horizontal_fov': 0, 'vertical_fov': 45},
+        {'sandbox_width': 10, 'sandbox_height': 8, 'camera_height': 3, 'focal_length': 0,
+         'sensor_width': 6.4, 'sensor_height': 4.8},
+    ]
+    outputs = compute_chunk(records, start_index=5)
+    assert outputs == [compute_record(5 + i, record) for i, record in enumerate(records)]
+    assert outputs[2]['id'] == '7'
@@ -0,0 +1,64 @@
+"""sweep_runner 测试"""
+
+import numpy as np
+
+from sweep_runner import ResultStore, expand_scenario, run_scenario, run_sweep, scenario_key
+
+SCENARIO = {
+    'sandbox_width': [10, 20, 35.5],
+    'sandbox_height': [8, 12],
+    'camera_height': [2.5, 3, 4],
+    'horizontal_fov': [60, 90],
+    'vertical_fov': 45,
+    'overlap_ratio': [0.1, 0.2],
+}
+
+
+def test_expand_scenario_matches_meshgrid_order():
+    columns = expand_scenario(SCENARIO)
+    grids = np.meshgrid([10, 20, 35.5], [8, 12], [2.5, 3, 4], [60, 90], [45], [0.1, 0.2], [2000.0],
+                        indexing='ij')
+    for name, grid in zip(columns, grids):
+        np.testing.assert_array_equal(columns[name], grid.ravel())
+
+    part = expand_scenario(SCENARIO, 5, 17)
+    for name in columns:
+        np.testing.assert_array_equal(part[name], columns[name][5:17])
+
+
+def test_chunked_sweep_matches_single_shard_and_skips_duplicates(tmp_path):
+    other = dict(SCENARIO, vertical_fov=[30, 0])
+    store = ResultStore(str(tmp_path))
+    shards = list(run_sweep([SCENARIO, other, SCENARIO], store, workers=2, chunk_rows=7))
+    assert sorted(shard['status'] for shard in shards) == ['computed', 'computed']
+    assert sorted(shard['rows'] for shard in shards) == [72, 144]
+
+    for shard, scenario in zip(sorted(shards, key=lambda s: s['rows']), (SCENARIO, other)):
+        expected = run_scenario(scenario)
+        loaded = store.load(shard['key'])
+        assert set(loaded) == set(expected)
+        for name, column in expected.items():
+            np.testing.assert_array_equal(loaded[name], column)
+
+    # 已缓存的重复场景只报告一次
+    cached = list(run_sweep([SCENARIO, SCENARIO, other], store, workers=2))
+    assert [shard['status'] for shard in cached] == ['cached', 'cached']
+
+
+def test_scenario_key_normalizes_equal_scenarios(tmp_path):
+    rewritten = {
+        'overlap_ratio': [0.1, 0.2],
+        'vertical_fov': [45.0],
+        'horizontal_fov': [60.0, 90.0],
+        'camera_height': [2.5, 3.0, 4.0],
+        'sandbox_height': [8.0, 12.0],
+        'sandbox_width': [10.0, 20.0, 35.5],
+        'camera_price': 2000,
+    }
+    assert scenario_key(rewritten) == scenario_key(SCENARIO)
+    assert scenario_key(dict(SCENARIO, camera_price=2500)) != scenario_key(SCENARIO)
+
+    store = ResultStore(str(tmp_path))
+    shards = list(run_sweep([SCENARIO, rewritten], store, workers=1))
+    assert [shard['status'] for shard in shards] == ['computed']
+    assert [shard['status'] for shard in run_sweep([rewritten], store, workers=1)] == ['cached']